@@ -0,0 +1,79 @@
+"""Compare `draw_bounding_boxes` with the batched `BboxRenderer`.
+
+A bundled NEOCR image is covered with a grid of word boxes to get a dense
+sign, then the boxes are drawn by the per-box function, by the renderer
+on a new copy of the image and by the renderer into a reusable buffer.
+"""
+
+
+import argparse
+from pathlib import Path
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parents[1]))
+from datasets import NEOCR_dataset
+from utils.image_utils.bbox_renderer import BboxRenderer
+from utils.image_utils.image_functions import draw_bounding_boxes
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+def measure(draw: Callable[[], object], repeats: int) -> float:
+    """Get the best time of `repeats` calls."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        draw()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--boxes', type=int, default=500,
+                        help='Number of boxes on the image.')
+    parser.add_argument('--repeats', type=int, default=20,
+                        help='Number of measurements to take the best of.')
+    args = parser.parse_args()
+
+    sample = NEOCR_dataset(DATA_DIR / 'NEOCR')['train'][0]
+    image = sample.get_image(shared=True)
+    height, width = image.shape[:2]
+
+    rng = np.random.default_rng(0)
+    top_left = rng.integers(0, (width - 100, height - 30), (args.boxes, 2))
+    sizes = rng.integers((20, 10), (100, 30), (args.boxes, 2))
+    bboxes = np.concatenate((top_left, top_left + sizes), axis=1)
+    labels = rng.choice(['english', 'german', 'unlabeled'],
+                        args.boxes).tolist()
+    bboxes_list = bboxes.tolist()
+
+    renderer = BboxRenderer()
+    buffer = np.empty_like(image)
+    print(f'{args.boxes} boxes on {width}x{height} image')
+    base_time = None
+    for name, draw in (
+        ('draw_bounding_boxes',
+         lambda: draw_bounding_boxes(image, bboxes_list, labels)),
+        ('renderer', lambda: renderer.render(image, bboxes, labels)),
+        ('renderer into buffer',
+         lambda: renderer.render(image, bboxes, labels, out=buffer))
+    ):
+        elapsed = measure(draw, args.repeats)
+        base_time = base_time or elapsed
+        print(f'{name:22} {elapsed * 1000:8.2f} ms  '
+              f'x{base_time / elapsed:.2f}')
+
+    expected = draw_bounding_boxes(image, bboxes_list, labels)
+    rendered = renderer.render(image, bboxes, labels)
+    differ = (expected != rendered).any(axis=2)
+    print(f'differing pixels: {differ.mean():.4%}')
+
+
+if __name__ == '__main__':
+    main()
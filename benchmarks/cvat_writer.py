@@ -0,0 +1,87 @@
+"""Time the streaming CVAT xml writer against the `xml.dom.minidom` one.
+
+Samples of the bundled datasets are repeated to get a large set and both
+writers are timed and their peak python memory is measured.
+That both writers make equal documents is checked by
+`tests/test_cvat_functions.py`.
+"""
+
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List
+from xml.dom.minidom import Document
+
+sys.path.append(str(Path(__file__).parents[1]))
+from datasets import datasets
+from utils.cvat_utils.cvat_functions import (
+    create_cvat_meta, create_cvat_object_detection_annotations,
+    create_cvat_object_detection_xml)
+from utils.data_utils.datasets import BaseObjectDetectionSample
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+def create_dom_xml(
+    save_pth: Path,
+    set_samples: List[BaseObjectDetectionSample],
+    set_name: str,
+    set_labels: List[str]
+) -> None:
+    """Save annotations with the `xml.dom.minidom` document."""
+    xml_doc = Document()
+    create_cvat_meta(xml_doc, len(set_samples), set_labels, set_name)
+    create_cvat_object_detection_annotations(xml_doc, set_samples)
+    with open(save_pth, 'w', encoding='utf-8') as f:
+        xml_doc.writexml(f, indent='  ', addindent='  ', newl='\n',
+                         encoding='utf-8')
+    xml_doc.unlink()
+
+
+def measure(write: Callable[[], None]) -> tuple:
+    """Get time and peak traced memory of a call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    write()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--copies', type=int, default=2000,
+                        help='Number of copies of every bundled sample.')
+    args = parser.parse_args()
+
+    all_samples = []
+    for dset_name, dset_cls in datasets.items():
+        if not (DATA_DIR / dset_name).exists():
+            continue
+        dset = dset_cls(DATA_DIR / dset_name)
+        for set_name in dset.get_subsets_names():
+            all_samples.extend(dset[set_name])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stream_pth = Path(tmp_dir) / 'stream.xml'
+        dom_pth = Path(tmp_dir) / 'dom.xml'
+        big_set = all_samples * args.copies
+        print(f'{len(big_set)} images')
+        for name, write in (
+            ('stream', lambda: create_cvat_object_detection_xml(
+                stream_pth, big_set, 'train', ['unlabeled'])),
+            ('minidom', lambda: create_dom_xml(
+                dom_pth, big_set, 'train', ['unlabeled']))
+        ):
+            elapsed, peak = measure(write)
+            print(f'{name:8} {elapsed:7.2f} s  {peak / 2 ** 20:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Compare serial and parallel annotation parsing of NEOCR and MSRA TD500.
+
+The bundled samples are replicated to a temporary directory to get a dataset
+with many small annotation files, then the subsets are parsed serially,
+on threads and on processes.
+"""
+
+
+import argparse
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable
+
+sys.path.append(str(Path(__file__).parents[1]))
+from datasets import NEOCR_dataset, MSRA_TD500_dataset
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+def replicate_neocr(dst_dir: Path, copies: int) -> None:
+    """Make a NEOCR dataset with `copies` copies of the bundled files."""
+    src_dir = DATA_DIR / 'NEOCR'
+    (dst_dir / 'Annotations').mkdir(parents=True)
+    shutil.copytree(src_dir / 'Images', dst_dir / 'Images')
+    for annot_pth in (src_dir / 'Annotations').glob('*.xml'):
+        for i in range(copies):
+            shutil.copy(annot_pth, dst_dir / 'Annotations' /
+                        f'{annot_pth.stem}_{i}.xml')
+
+
+def replicate_msra(dst_dir: Path, copies: int) -> None:
+    """Make a MSRA TD500 dataset with `copies` copies of the bundled files."""
+    for set_name in ('train', 'test'):
+        (dst_dir / set_name).mkdir(parents=True)
+        for gt_pth in (DATA_DIR / 'MSRA_TD500' / set_name).glob('*.gt'):
+            img_pth = gt_pth.with_suffix('.JPG')
+            for i in range(copies):
+                name = f'{gt_pth.stem}_{i:06d}'
+                shutil.copy(gt_pth, dst_dir / set_name / f'{name}.gt')
+                # Images are only listed, so empty files are enough
+                (dst_dir / set_name / f'{name}{img_pth.suffix}').touch()
+
+
+def measure(read: Callable[[], object], repeats: int) -> float:
+    """Get the best time of `repeats` calls."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        read()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--copies', type=int, default=1000,
+                        help='Number of copies of every bundled file.')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of parallel workers.')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Number of measurements to take the best of.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        neocr_dir = Path(tmp_dir) / 'NEOCR'
+        msra_dir = Path(tmp_dir) / 'MSRA_TD500'
+        replicate_neocr(neocr_dir, args.copies)
+        replicate_msra(msra_dir, args.copies)
+
+        for dset_cls, dset_dir in ((NEOCR_dataset, neocr_dir),
+                                   (MSRA_TD500_dataset, msra_dir)):
+            modes = (('serial', {}),
+                     ('threads', {'num_workers': args.workers}),
+                     ('processes', {'num_workers': args.workers,
+                                    'use_processes': True}))
+            serial_time = None
+            for mode, kwargs in modes:
+                elapsed = measure(
+                    lambda: dset_cls(dset_dir, **kwargs)['train'],
+                    args.repeats)
+                serial_time = serial_time or elapsed
+                print(f'{dset_cls.__name__:20} {mode:10} '
+                      f'{elapsed * 1000:9.1f} ms  '
+                      f'x{serial_time / elapsed:.2f}')
+
+
+if __name__ == '__main__':
+    main()
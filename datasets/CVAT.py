@@ -0,0 +1,171 @@
+"""Classes of a dataset exported in CVAT format."""
+
+
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import xml.etree.ElementTree as ET
+
+from utils.cvat_utils.cvat_datasets import CvatObjectDetectionDataset
+from utils.xml_utils.xml_index import XmlElementsIndex
+from utils.data_utils.datasets import IndexedSubset
+from datasets import (
+    BaseTextDetectionDataset,
+    BaseTextDetectionSample,
+    BaseTextDetectionAnnotation)
+
+
+class CVAT_annotation(BaseTextDetectionAnnotation):
+    pass
+
+
+class CVAT_sample(BaseTextDetectionSample):
+    """A sample of CVAT dataset.
+
+    The image's shape is known from the annotations file,
+    so it is not read from the image.
+    """
+
+    def __init__(
+        self,
+        img_pth: Path,
+        img_annots: List[CVAT_annotation],
+        img_shape: Optional[Tuple[int, int]] = None
+    ) -> None:
+        super().__init__(img_pth, img_annots)
+        self._img_shape = img_shape
+
+
+class CVAT_dataset(BaseTextDetectionDataset):
+    """A dataset exported with `save_as_cvat`.
+
+    Every subdirectory with `annotations.xml` and `images` is a subset.
+    A directory of a single subset is opened as a dataset
+    with one subset too.
+
+    With `indexed=True` subsets are opened through a byte-offset index
+    of their annotations files and samples are parsed on access.
+    """
+
+    annotation_cls = CVAT_annotation
+    sample_cls = CVAT_sample
+
+    def __init__(
+        self,
+        dset_folder: Union[Path, str],
+        columnar: bool = False,
+        cache_dir: Optional[Union[Path, str]] = None,
+        indexed: bool = False
+    ) -> None:
+        super().__init__(dset_folder, columnar, cache_dir)
+
+        if (self.dset_folder / 'annotations.xml').exists():
+            set_dirs = [self.dset_folder]
+        else:
+            set_dirs = sorted(
+                set_dir for set_dir in self.dset_folder.iterdir()
+                if (set_dir / 'annotations.xml').exists())
+        for set_dir in set_dirs:
+            if indexed:
+                self._register_subset(
+                    set_dir.name, partial(self.index_set, set_dir))
+            else:
+                self._register_subset(
+                    set_dir.name, partial(self.iter_set, set_dir),
+                    [set_dir / 'annotations.xml'])
+
+    @staticmethod
+    def is_dataset_dir(dset_folder: Union[Path, str]) -> bool:
+        """Check whether a directory contains a dataset in CVAT format.
+
+        Parameters
+        ----------
+        dset_folder : Union[Path, str]
+            A path to the directory.
+
+        Returns
+        -------
+        bool
+            Whether the directory or its subdirectories
+            have annotations files.
+        """
+        dset_folder = Path(dset_folder)
+        return ((dset_folder / 'annotations.xml').exists() or
+                any(dset_folder.glob('*/annotations.xml')))
+
+    def iter_set(self, set_dir: Path) -> Iterator[CVAT_sample]:
+        """Iterate over samples of a set directory.
+
+        Parameters
+        ----------
+        set_dir : Path
+            The set directory path.
+
+        Yields
+        ------
+        CVAT_sample
+            The next sample of the set.
+        """
+        for image in CvatObjectDetectionDataset.iter_images(set_dir):
+            yield self.make_sample(image, set_dir)
+
+    def index_set(self, set_dir: Path) -> IndexedSubset:
+        """Open a set directory for random access to its samples.
+
+        Parameters
+        ----------
+        set_dir : Path
+            The set directory path.
+
+        Returns
+        -------
+        IndexedSubset
+            The set's samples that are parsed on access.
+        """
+        index = XmlElementsIndex(set_dir / 'annotations.xml', 'image')
+        return IndexedSubset(
+            index, partial(self.parse_image, set_dir=set_dir))
+
+    def parse_image(
+        self, image_annots: ET.Element, set_dir: Path
+    ) -> CVAT_sample:
+        """Make a sample from an `image` element of an annotations file.
+
+        Parameters
+        ----------
+        image_annots : ET.Element
+            The `image` element.
+        set_dir : Path
+            The set directory path.
+
+        Returns
+        -------
+        CVAT_sample
+            The parsed sample.
+        """
+        return self.make_sample(
+            CvatObjectDetectionDataset.parse_image(image_annots), set_dir)
+
+    def make_sample(
+        self, image: Dict[str, Any], set_dir: Path
+    ) -> CVAT_sample:
+        """Make a sample from an image dict of `CvatObjectDetectionDataset`.
+
+        Parameters
+        ----------
+        image : Dict[str, Any]
+            Dict with "name", "labels", "bboxes" and "shape" of the image.
+        set_dir : Path
+            The set directory path.
+
+        Returns
+        -------
+        CVAT_sample
+            The sample.
+        """
+        annots = [CVAT_annotation(round(x1), round(y1), round(x2), round(y2),
+                                  label)
+                  for label, (x1, y1, x2, y2)
+                  in zip(image['labels'], image['bboxes'])]
+        return CVAT_sample(
+            set_dir / 'images' / image['name'], annots, image['shape'])
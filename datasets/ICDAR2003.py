@@ -1,10 +1,14 @@
 """ICDAR 2003 dataset classes."""
 
 
+from functools import partial
 from pathlib import Path
-from typing import List, Union
+from typing import Iterator, List, Optional, Union
 import xml.etree.ElementTree as ET
 
+from utils.xml_utils.xml_functions import iter_xml_elements
+from utils.xml_utils.xml_index import XmlElementsIndex
+from utils.data_utils.datasets import IndexedSubset
 from datasets import (
     BaseTextDetectionDataset,
     BaseTextDetectionSample,
@@ -34,16 +38,38 @@ class ICDAR2003_sample(BaseTextDetectionSample):
 
 
 class ICDAR2003_dataset(BaseTextDetectionDataset):
-    def __init__(self, dset_folder: Union[Path, str]) -> None:
-        super().__init__(dset_folder)
+    """ICDAR 2003 dataset.
+
+    With `indexed=True` subsets are opened through a byte-offset index
+    of their `words.xml` files and samples are parsed on access.
+    """
+
+    annotation_cls = ICDAR2003_annotation
+    sample_cls = ICDAR2003_sample
+
+    def __init__(
+        self,
+        dset_folder: Union[Path, str],
+        columnar: bool = False,
+        cache_dir: Optional[Union[Path, str]] = None,
+        indexed: bool = False
+    ) -> None:
+        super().__init__(dset_folder, columnar, cache_dir)
 
         train_dir = self.dset_folder / 'SceneTrialTrain'
         test_dir = self.dset_folder / 'SceneTrialTest'
         sample_dir = self.dset_folder / 'SceneTrialSample'
 
-        self._subsets['sample'] = self.read_set(sample_dir)
-        self._subsets['train'] = self.read_set(train_dir)
-        self._subsets['test'] = self.read_set(test_dir)
+        for set_name, set_dir in (('sample', sample_dir),
+                                  ('train', train_dir),
+                                  ('test', test_dir)):
+            if indexed:
+                self._register_subset(
+                    set_name, partial(self.index_set, set_dir))
+            else:
+                self._register_subset(
+                    set_name, partial(self.iter_set, set_dir),
+                    [set_dir / 'words.xml'])
 
     def read_set(self, set_dir: Path) -> List[ICDAR2003_sample]:
         """Read a directory with a set, generate a list of samples.
@@ -58,22 +84,71 @@ class ICDAR2003_dataset(BaseTextDetectionDataset):
         List[ICDAR2003_sample]
             The list of set's samples.
         """
-        tree = ET.parse(set_dir / 'words.xml')
-        root = tree.getroot()
-
-        samples: List[ICDAR2003_sample] = []
-        for image_annots in root:
-            img_pth = set_dir / image_annots[0].text
-            bboxes = image_annots[2]
-
-            annots: List[ICDAR2003_annotation] = []
-            for bbox in bboxes:
-                x = int(bbox.attrib['x'].split('.')[0])
-                y = int(bbox.attrib['y'].split('.')[0])
-                w = int(bbox.attrib['width'].split('.')[0])
-                h = int(bbox.attrib['height'].split('.')[0])
-                word = bbox[0].text
-                annots.append(ICDAR2003_annotation(x, y, w, h, word))
-
-            samples.append(ICDAR2003_sample(img_pth, annots))
-        return samples
+        return list(self.iter_set(set_dir))
+
+    def iter_set(self, set_dir: Path) -> Iterator[ICDAR2003_sample]:
+        """Iterate over samples of a set directory.
+
+        The annotations file is parsed incrementally, one image at a time,
+        so the whole xml tree is never kept in memory.
+
+        Parameters
+        ----------
+        set_dir : Path
+            The set directory path.
+
+        Yields
+        ------
+        ICDAR2003_sample
+            The next sample of the set.
+        """
+        for image_annots in iter_xml_elements(
+                set_dir / 'words.xml', 'image'):
+            yield self.parse_image(image_annots, set_dir)
+
+    def index_set(self, set_dir: Path) -> IndexedSubset:
+        """Open a set directory for random access to its samples.
+
+        Parameters
+        ----------
+        set_dir : Path
+            The set directory path.
+
+        Returns
+        -------
+        IndexedSubset
+            The set's samples that are parsed on access.
+        """
+        index = XmlElementsIndex(set_dir / 'words.xml', 'image')
+        return IndexedSubset(
+            index, partial(self.parse_image, set_dir=set_dir))
+
+    def parse_image(
+        self, image_annots: ET.Element, set_dir: Path
+    ) -> ICDAR2003_sample:
+        """Make a sample from an `image` element of an annotations file.
+
+        Parameters
+        ----------
+        image_annots : ET.Element
+            The `image` element.
+        set_dir : Path
+            The set directory path.
+
+        Returns
+        -------
+        ICDAR2003_sample
+            The parsed sample.
+        """
+        img_pth = set_dir / image_annots[0].text
+        bboxes = image_annots[2]
+
+        annots: List[ICDAR2003_annotation] = []
+        for bbox in bboxes:
+            x = int(bbox.attrib['x'].split('.')[0])
+            y = int(bbox.attrib['y'].split('.')[0])
+            w = int(bbox.attrib['width'].split('.')[0])
+            h = int(bbox.attrib['height'].split('.')[0])
+            word = bbox[0].text
+            annots.append(ICDAR2003_annotation(x, y, w, h, word))
+        return ICDAR2003_sample(img_pth, annots)
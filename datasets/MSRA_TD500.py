@@ -1,9 +1,13 @@
 """MSRA TD500 dataset classes."""
 
+from functools import partial
 from pathlib import Path
-from typing import Tuple, List, Union
+from typing import Tuple, List, Optional, Union
 
-from utils.numpy_utils.numpy_functions import rotate_rectangle
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.numpy_utils.numpy_functions import rotate_rectangles
 from datasets import (
     BaseTextDetectionDataset,
     BaseTextDetectionSample,
@@ -25,6 +29,39 @@ class MSRA_TD500_annotation(BaseTextDetectionAnnotation):
         h = int(h)
         x1, y1, x2, y2 = self.normalize_bboxes(x, y, w, h, angle)
         super().__init__(x1, y1, x2, y2)
+
+    @classmethod
+    def from_bounds(
+        cls,
+        idx: int,
+        difficult: bool,
+        bounds: Tuple[int, int, int, int],
+        points: Optional[NDArray] = None
+    ) -> 'MSRA_TD500_annotation':
+        """Make an annotation from already rotated and normalized bbox.
+
+        Parameters
+        ----------
+        idx : int
+            An index of the annotation.
+        difficult : bool
+            Whether the annotation is difficult.
+        bounds : Tuple[int, int, int, int]
+            Xyxy bbox coordinates.
+        points : Optional[NDArray], optional
+            Corners of the rotated bbox with shape `(4, 2)`.
+            By default is `None`.
+
+        Returns
+        -------
+        MSRA_TD500_annotation
+            The annotation.
+        """
+        annot = cls.__new__(cls)
+        annot.difficult = difficult
+        annot.idx = idx
+        BaseTextDetectionAnnotation.__init__(annot, *bounds, points=points)
+        return annot
     
     def normalize_bboxes(
         self, x: int, y: int, w: int, h: int, angle: float
@@ -49,22 +86,8 @@ class MSRA_TD500_annotation(BaseTextDetectionAnnotation):
         Tuple[int, int, int, int]
             Xyxy bbox coordinates.
         """
-        xlu = int(x)
-        ylu = int(y)
-        xrd = xlu + int(w)
-        yrd = ylu + int(h)
-        xld = xlu
-        yld = yrd
-        xru = xrd
-        yru = ylu
-        angle = float(angle)
-
-        points = [(xlu, ylu), (xld, yld), (xrd, yrd), (xru, yru)]
-        points = rotate_rectangle(points, angle)
-        x1 = min(points, key=lambda point: point[0])[0]
-        x2 = max(points, key=lambda point: point[0])[0]
-        y1 = min(points, key=lambda point: point[1])[1]
-        y2 = max(points, key=lambda point: point[1])[1]
+        _, bounds = rotate_rectangles([[x, y, w, h, float(angle)]])
+        x1, y1, x2, y2 = bounds[0].tolist()
         return x1, y1, x2, y2
 
 
@@ -73,13 +96,28 @@ class MSRA_TD500_sample(BaseTextDetectionSample):
 
 
 class MSRA_TD500_dataset(BaseTextDetectionDataset):
-    def __init__(self, dset_folder: Union[Path, str]) -> None:
-        super().__init__(dset_folder)
+    annotation_cls = MSRA_TD500_annotation
+    sample_cls = MSRA_TD500_sample
+
+    def __init__(
+        self,
+        dset_folder: Union[Path, str],
+        columnar: bool = False,
+        cache_dir: Optional[Union[Path, str]] = None,
+        num_workers: int = 0,
+        use_processes: bool = False,
+        oriented: bool = False
+    ) -> None:
+        super().__init__(dset_folder, columnar, cache_dir,
+                         num_workers, use_processes, oriented)
 
         train_dir = self.dset_folder / 'train'
         test_dir = self.dset_folder / 'test'
-        self._subsets['train'] = self.read_set(train_dir)
-        self._subsets['test'] = self.read_set(test_dir)
+        for set_name, set_dir in (('train', train_dir), ('test', test_dir)):
+            # The directory's mtime changes when files are added or removed
+            sources = [set_dir, *sorted(set_dir.glob('*.gt'))]
+            self._register_subset(
+                set_name, partial(self.read_set, set_dir), sources)
 
     def read_set(self, set_dir: Path) -> List[MSRA_TD500_sample]:
         """Read a directory with a set, generate a list of samples.
@@ -100,13 +138,16 @@ class MSRA_TD500_dataset(BaseTextDetectionDataset):
         img_pths.sort()
 
         samples = []
-        for annot_file, img_pth in zip(annots_files, img_pths):
-            annots = self.read_annotation_file(annot_file)
+        annots_lists = self._map_files(
+            partial(self.read_annotation_file, oriented=self._oriented),
+            annots_files)
+        for annots, img_pth in zip(annots_lists, img_pths):
             samples.append(MSRA_TD500_sample(img_pth, annots))
         return samples
 
+    @staticmethod
     def read_annotation_file(
-        self, annot_pth: Path
+        annot_pth: Path, oriented: bool = False
     ) -> List[MSRA_TD500_annotation]:
         """Read annotation file of MSRA TD500 dataset and get annotations list.
 
@@ -114,16 +155,41 @@ class MSRA_TD500_dataset(BaseTextDetectionDataset):
         ----------
         annot_pth : Path
             A path to file.
+        oriented : bool, optional
+            Whether to keep corners of rotated bboxes in annotations.
+            By default is `False`.
 
         Returns
         -------
         List[MSRA_TD500_annotation]
             The list of annotations.
         """
+        annots_arr = MSRA_TD500_dataset.read_annotation_array(annot_pth)
+        corners, bounds = rotate_rectangles(annots_arr[:, 2:])
+        idxs = annots_arr[:, 0].astype(np.int64).tolist()
+        difficults = (annots_arr[:, 1] == 1).tolist()
+        if not oriented:
+            corners = [None] * len(idxs)
+        return [
+            MSRA_TD500_annotation.from_bounds(idx, difficult, bbox, points)
+            for idx, difficult, bbox, points
+            in zip(idxs, difficults, bounds.tolist(), corners)]
+
+    @staticmethod
+    def read_annotation_array(annot_pth: Path) -> NDArray:
+        """Read annotation file of MSRA TD500 dataset to an array.
+
+        Parameters
+        ----------
+        annot_pth : Path
+            A path to file.
+
+        Returns
+        -------
+        NDArray
+            The annotations with shape `(N, 7)`. Each row is
+            `idx, difficult, x, y, w, h, angle`.
+        """
         with open(annot_pth, 'r') as f:
-            lines = f.readlines()
-        annots = []
-        for annot_str in lines:
-            annot = MSRA_TD500_annotation(annot_str)
-            annots.append(annot)
-        return annots
+            rows = [line.split() for line in f if line.strip()]
+        return np.array(rows, dtype=np.float64).reshape(-1, 7)
@@ -2,9 +2,12 @@
 
 
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 import xml.etree.ElementTree as ET
 
+import numpy as np
+
+from utils.numpy_utils.numpy_functions import quads_bounds
 from datasets import (
     BaseTextDetectionDataset,
     BaseTextDetectionSample,
@@ -20,19 +23,36 @@ class NEOCR_sample(BaseTextDetectionSample):
 
 
 class NEOCR_dataset(BaseTextDetectionDataset):
-    def __init__(self, dset_folder: Union[Path, str]) -> None:
-        super().__init__(dset_folder)
+    annotation_cls = NEOCR_annotation
+    sample_cls = NEOCR_sample
+
+    def __init__(
+        self,
+        dset_folder: Union[Path, str],
+        columnar: bool = False,
+        cache_dir: Optional[Union[Path, str]] = None,
+        num_workers: int = 0,
+        use_processes: bool = False,
+        oriented: bool = False
+    ) -> None:
+        super().__init__(dset_folder, columnar, cache_dir,
+                         num_workers, use_processes, oriented)
 
         annots_dir = self.dset_folder / 'Annotations'
         img_dir = self.dset_folder / 'Images'
-        annots_files = annots_dir.glob('*.xml')
+        annots_files = sorted(annots_dir.glob('*.xml'))
 
-        self._subsets['train'] = [
-            self.read_annotation_file(annots_file, img_dir)
-            for annots_file in annots_files]
+        self._register_subset(
+            'train',
+            lambda: self._map_files(self.read_annotation_file,
+                                    annots_files,
+                                    [img_dir] * len(annots_files),
+                                    [oriented] * len(annots_files)),
+            [annots_dir, *annots_files])
 
+    @staticmethod
     def read_annotation_file(
-        self, annot_pth: Path, img_dir: Path
+        annot_pth: Path, img_dir: Path, oriented: bool = False
     ) -> NEOCR_sample:
         """Read an annotation file of NEOCR dataset.
 
@@ -44,6 +64,10 @@ class NEOCR_dataset(BaseTextDetectionDataset):
             A path to the file.
         img_dir : Path
             A path to an image directory.
+        oriented : bool, optional
+            Whether to keep all four points of bboxes in annotations.
+            Then bboxes' `xyxy` are the points' bounds.
+            By default is `False`.
 
         Returns
         -------
@@ -61,10 +85,18 @@ class NEOCR_dataset(BaseTextDetectionDataset):
             language = image_annot[7][1].text
             bbox = image_annot[9]
 
-            x1 = int(bbox[1][0].text)
-            y1 = int(bbox[1][1].text)
-            x2 = int(bbox[3][0].text)
-            y2 = int(bbox[3][1].text)
-
-            annots.append(NEOCR_annotation(x1, y1, x2, y2, language, word))
+            if oriented:
+                points = np.array(
+                    [(int(pt[0].text), int(pt[1].text))
+                     for pt in bbox.findall('pt')], dtype=np.int32)
+                x1, y1, x2, y2 = quads_bounds(points)[0].tolist()
+            else:
+                points = None
+                x1 = int(bbox[1][0].text)
+                y1 = int(bbox[1][1].text)
+                x2 = int(bbox[3][0].text)
+                y2 = int(bbox[3][1].text)
+
+            annots.append(NEOCR_annotation(
+                x1, y1, x2, y2, language, word, points))
         return NEOCR_sample(img_pth, annots)
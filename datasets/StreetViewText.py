@@ -1,10 +1,14 @@
 """Street view text dataset classes."""
 
 
+from functools import partial
 from pathlib import Path
-from typing import List, Union
+from typing import Iterator, List, Optional, Union
 import xml.etree.ElementTree as ET
 
+from utils.xml_utils.xml_functions import iter_xml_elements
+from utils.xml_utils.xml_index import XmlElementsIndex
+from utils.data_utils.datasets import IndexedSubset
 from datasets import (
     BaseTextDetectionAnnotation,
     BaseTextDetectionSample,
@@ -34,13 +38,35 @@ class SVT_sample(BaseTextDetectionSample):
 
 
 class SVT_dataset(BaseTextDetectionDataset):
-    def __init__(self, dset_folder: Union[Path, str]) -> None:
-        super().__init__(dset_folder)
+    """Street view text dataset.
+
+    With `indexed=True` subsets are opened through a byte-offset index
+    of their annotations files and samples are parsed on access.
+    """
+
+    annotation_cls = SVT_annotation
+    sample_cls = SVT_sample
+
+    def __init__(
+        self,
+        dset_folder: Union[Path, str],
+        columnar: bool = False,
+        cache_dir: Optional[Union[Path, str]] = None,
+        indexed: bool = False
+    ) -> None:
+        super().__init__(dset_folder, columnar, cache_dir)
 
         train_annots = self.dset_folder / 'train.xml'
         test_annots = self.dset_folder / 'test.xml'
-        self._subsets['train'] = self.read_set(train_annots, dset_folder)
-        self._subsets['test'] = self.read_set(test_annots, dset_folder)
+        for set_name, set_annots in (('train', train_annots),
+                                     ('test', test_annots)):
+            if indexed:
+                self._register_subset(set_name, partial(
+                    self.index_set, set_annots, self.dset_folder))
+            else:
+                self._register_subset(set_name, partial(
+                    self.iter_set, set_annots, self.dset_folder),
+                    [set_annots])
 
     def read_set(
         self, set_annots: Path, dset_folder: Path
@@ -59,22 +85,78 @@ class SVT_dataset(BaseTextDetectionDataset):
         List[SVT_sample]
             The list of set's samples.
         """
-        tree = ET.parse(set_annots)
-        root = tree.getroot()
-
-        samples: List[SVT_sample] = []
-        for image_annots in root:
-            img_pth = dset_folder / image_annots[0].text
-            bboxes = image_annots[4]
-
-            annots: List[SVT_annotation] = []
-            for bbox in bboxes:
-                x = int(bbox.attrib['x'])
-                y = int(bbox.attrib['y'])
-                w = int(bbox.attrib['width'])
-                h = int(bbox.attrib['height'])
-                word = bbox[0].text
-                annots.append(SVT_annotation(x, y, w, h, word))
-
-            samples.append(SVT_sample(img_pth, annots))
-        return samples
+        return list(self.iter_set(set_annots, dset_folder))
+
+    def iter_set(
+        self, set_annots: Path, dset_folder: Path
+    ) -> Iterator[SVT_sample]:
+        """Iterate over samples of an annotations file of a set.
+
+        The annotations file is parsed incrementally, one image at a time,
+        so the whole xml tree is never kept in memory.
+
+        Parameters
+        ----------
+        set_annots : Path
+            The set annotations file path.
+        dset_folder : Path
+            A dataset folder path.
+
+        Yields
+        ------
+        SVT_sample
+            The next sample of the set.
+        """
+        for image_annots in iter_xml_elements(set_annots, 'image'):
+            yield self.parse_image(image_annots, dset_folder)
+
+    def index_set(
+        self, set_annots: Path, dset_folder: Path
+    ) -> IndexedSubset:
+        """Open an annotations file of a set for random access to samples.
+
+        Parameters
+        ----------
+        set_annots : Path
+            The set annotations file path.
+        dset_folder : Path
+            A dataset folder path.
+
+        Returns
+        -------
+        IndexedSubset
+            The set's samples that are parsed on access.
+        """
+        index = XmlElementsIndex(set_annots, 'image')
+        return IndexedSubset(
+            index, partial(self.parse_image, dset_folder=dset_folder))
+
+    def parse_image(
+        self, image_annots: ET.Element, dset_folder: Path
+    ) -> SVT_sample:
+        """Make a sample from an `image` element of an annotations file.
+
+        Parameters
+        ----------
+        image_annots : ET.Element
+            The `image` element.
+        dset_folder : Path
+            A dataset folder path.
+
+        Returns
+        -------
+        SVT_sample
+            The parsed sample.
+        """
+        img_pth = dset_folder / image_annots[0].text
+        bboxes = image_annots[4]
+
+        annots: List[SVT_annotation] = []
+        for bbox in bboxes:
+            x = int(bbox.attrib['x'])
+            y = int(bbox.attrib['y'])
+            w = int(bbox.attrib['width'])
+            h = int(bbox.attrib['height'])
+            word = bbox[0].text
+            annots.append(SVT_annotation(x, y, w, h, word))
+        return SVT_sample(img_pth, annots)
@@ -4,13 +4,26 @@ Each dataset consists of a dataset, a sample and an annotation classes.
 """
 
 
+from typing import Any, Dict, Optional
+
+from numpy.typing import NDArray
+
 from utils.data_utils.datasets import (
     BaseObjectDetectionDataset,
     BaseObjectDetectionSample,
-    BaseObjectDetectionAnnotation)
+    BaseObjectDetectionAnnotation,
+    Vocabulary)
 
 
 class BaseTextDetectionAnnotation(BaseObjectDetectionAnnotation):
+    """The base annotation class for text detection.
+
+    Besides a bounding box and a language label it contains a word.
+    The word is kept as a code in the shared `texts_vocab`.
+    """
+
+    texts_vocab: Vocabulary = Vocabulary()
+
     def __init__(
         self,
         x1: int,
@@ -18,10 +31,29 @@ class BaseTextDetectionAnnotation(BaseObjectDetectionAnnotation):
         x2: int,
         y2: int,
         language: str = 'unlabeled',
-        text: str = ''
+        text: str = '',
+        points: Optional[NDArray] = None
     ) -> None:
-        super().__init__(x1, y1, x2, y2, language)
-        self.text = text
+        super().__init__(x1, y1, x2, y2, language, points)
+        self.text_code = self.texts_vocab.encode(text)
+
+    @property
+    def text(self) -> str:
+        return self.texts_vocab.decode(self.text_code)
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self.text_code = self.texts_vocab.encode(text)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state['text'] = self.texts_vocab.decode(state.pop('text_code'))
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state = state.copy()
+        self.text_code = self.texts_vocab.encode(state.pop('text'))
+        super().__setstate__(state)
 
 
 class BaseTextDetectionSample(BaseObjectDetectionSample):
@@ -29,4 +61,5 @@ class BaseTextDetectionSample(BaseObjectDetectionSample):
 
 
 class BaseTextDetectionDataset(BaseObjectDetectionDataset):
-    pass
+    annotation_cls = BaseTextDetectionAnnotation
+    sample_cls = BaseTextDetectionSample
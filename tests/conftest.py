@@ -0,0 +1,7 @@
+"""Make the project's packages importable in tests."""
+
+
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parents[1]))
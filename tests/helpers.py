@@ -0,0 +1,35 @@
+"""Helpers that are shared by tests."""
+
+
+from typing import Iterable
+
+import numpy as np
+
+from utils.data_utils.datasets import BaseObjectDetectionSample
+
+
+def assert_same_samples(
+    samples: Iterable[BaseObjectDetectionSample],
+    expected_samples: Iterable[BaseObjectDetectionSample]
+) -> None:
+    """Check that samples and their annotations are equal field by field."""
+    samples = list(samples)
+    expected_samples = list(expected_samples)
+    assert len(samples) == len(expected_samples)
+    for sample, expected_sample in zip(samples, expected_samples):
+        assert type(sample) is type(expected_sample)
+        assert sample.get_image_path() == expected_sample.get_image_path()
+        annots = list(sample.get_annotations())
+        expected_annots = list(expected_sample.get_annotations())
+        assert len(annots) == len(expected_annots)
+        for annot, expected in zip(annots, expected_annots):
+            assert type(annot) is type(expected)
+            fields = vars(annot)
+            expected_fields = vars(expected)
+            assert fields.keys() == expected_fields.keys()
+            for name, value in expected_fields.items():
+                if name == 'points' and value is not None:
+                    assert np.array_equal(fields[name], value)
+                else:
+                    assert fields[name] == value
+                    assert type(fields[name]) is type(value)
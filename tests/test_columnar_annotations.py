@@ -0,0 +1,87 @@
+"""Tests of columnar subsets against eagerly parsed ones."""
+
+
+import copy
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from datasets import ICDAR2003_dataset, MSRA_TD500_dataset, SVT_dataset
+from datasets import datasets
+from helpers import assert_same_samples
+from utils.data_utils.datasets import ColumnarSubset
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+BUNDLED_DATASETS = [name for name in datasets
+                    if (DATA_DIR / name).exists()]
+
+
+def test_all_datasets_are_bundled():
+    assert len(BUNDLED_DATASETS) == 4
+
+
+@pytest.mark.parametrize('dset_name', BUNDLED_DATASETS)
+def test_columnar_matches_eager(dset_name: str):
+    eager = datasets[dset_name](DATA_DIR / dset_name)
+    columnar = datasets[dset_name](DATA_DIR / dset_name, columnar=True)
+    assert columnar.get_subsets_names() == eager.get_subsets_names()
+    for set_name in eager.get_subsets_names():
+        subset = columnar[set_name]
+        assert isinstance(subset, ColumnarSubset)
+        assert_same_samples(subset, eager[set_name])
+        assert_same_samples(subset.to_samples(), eager[set_name])
+    assert columnar.get_labels_names() == eager.get_labels_names()
+
+
+def test_oriented_columnar_matches_eager():
+    dset_pth = DATA_DIR / 'MSRA_TD500'
+    eager = MSRA_TD500_dataset(dset_pth, oriented=True)
+    columnar = MSRA_TD500_dataset(dset_pth, columnar=True, oriented=True)
+    for set_name in eager.get_subsets_names():
+        assert columnar[set_name].quads is not None
+        assert_same_samples(columnar[set_name], eager[set_name])
+
+
+def test_edited_annotation_is_written_back():
+    columnar = MSRA_TD500_dataset(DATA_DIR / 'MSRA_TD500', columnar=True)
+    annots = columnar['test'][0].get_annotations()
+    annot = copy.copy(annots[0])
+    annot.x2 += 5
+    annot.label = 'edited'
+    annot.text = 'word'
+    annot.difficult = not annot.difficult
+    annots[0] = annot
+
+    stored = columnar['test'][0].get_annotations()[0]
+    assert (stored.x2, stored.label, stored.text, stored.difficult) == (
+        annot.x2, 'edited', 'word', annot.difficult)
+
+
+def test_icdar2003_streaming_matches_tree_parsing():
+    dset = ICDAR2003_dataset(DATA_DIR / 'ICDAR2003')
+    indexed = ICDAR2003_dataset(DATA_DIR / 'ICDAR2003', indexed=True)
+    for set_name in dset.get_subsets_names():
+        set_dir = dset.dset_folder / {
+            'sample': 'SceneTrialSample',
+            'train': 'SceneTrialTrain',
+            'test': 'SceneTrialTest'}[set_name]
+        root = ET.parse(set_dir / 'words.xml').getroot()
+        expected = [dset.parse_image(image_annots, set_dir)
+                    for image_annots in root]
+        assert_same_samples(dset.iter_set(set_dir), expected)
+        assert_same_samples(indexed[set_name], expected)
+
+
+def test_svt_streaming_matches_tree_parsing():
+    dset = SVT_dataset(DATA_DIR / 'StreetViewText')
+    indexed = SVT_dataset(DATA_DIR / 'StreetViewText', indexed=True)
+    for set_name in dset.get_subsets_names():
+        set_annots = dset.dset_folder / f'{set_name}.xml'
+        root = ET.parse(set_annots).getroot()
+        expected = [dset.parse_image(image_annots, dset.dset_folder)
+                    for image_annots in root]
+        assert_same_samples(
+            dset.iter_set(set_annots, dset.dset_folder), expected)
+        assert_same_samples(indexed[set_name], expected)
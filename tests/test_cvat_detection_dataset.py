@@ -0,0 +1,37 @@
+"""Tests of `CvatObjectDetectionDataset`."""
+
+
+from pathlib import Path
+
+import pytest
+
+from datasets import SVT_dataset
+from utils.cvat_utils.cvat_datasets import CvatObjectDetectionDataset
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+@pytest.fixture
+def subset_dir(tmp_path: Path) -> Path:
+    SVT_dataset(DATA_DIR / 'StreetViewText').save_as_cvat(tmp_path)
+    return next(subset_dir for subset_dir in sorted(tmp_path.iterdir())
+                if (subset_dir / 'annotations.xml').exists())
+
+
+def test_indexed_matches_eager(subset_dir: Path):
+    eager = CvatObjectDetectionDataset(subset_dir)
+    indexed = CvatObjectDetectionDataset(subset_dir, indexed=True)
+    assert len(indexed) == len(eager)
+    assert list(indexed) == list(eager)
+    assert list(indexed.names) == eager.names
+    assert indexed.names[-1] == eager.names[-1]
+    assert set(eager.labels_table) <= set(indexed.labels_table)
+    assert indexed.get_labels() == eager.get_labels()
+    assert indexed.get_labels_colors() == eager.get_labels_colors()
+
+
+def test_indexed_indexes_only_images(subset_dir: Path):
+    CvatObjectDetectionDataset(subset_dir, indexed=True)
+    assert [pth.name for pth in subset_dir.glob('*.idx.npz')] == [
+        'annotations.xml.image.idx.npz']
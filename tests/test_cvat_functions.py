@@ -0,0 +1,60 @@
+"""Tests of `utils.cvat_utils.cvat_functions`."""
+
+
+from pathlib import Path
+import re
+from typing import List
+from xml.dom.minidom import Document
+
+import pytest
+
+from datasets import datasets
+from utils.cvat_utils.cvat_functions import (
+    create_cvat_meta, create_cvat_object_detection_annotations,
+    create_cvat_object_detection_xml)
+from utils.data_utils.datasets import BaseObjectDetectionSample
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+DATE_RE = re.compile(r'<(created|updated|dumped)>[^<]*</\1>')
+BUNDLED_DATASETS = [name for name in datasets
+                    if (DATA_DIR / name).exists()]
+
+
+def create_dom_xml(
+    save_pth: Path,
+    set_samples: List[BaseObjectDetectionSample],
+    set_name: str,
+    set_labels: List[str]
+) -> None:
+    """Save annotations with the `xml.dom.minidom` document."""
+    xml_doc = Document()
+    create_cvat_meta(xml_doc, len(set_samples), set_labels, set_name)
+    create_cvat_object_detection_annotations(xml_doc, set_samples)
+    with open(save_pth, 'w', encoding='utf-8') as f:
+        xml_doc.writexml(f, indent='  ', addindent='  ', newl='\n',
+                         encoding='utf-8')
+    xml_doc.unlink()
+
+
+def read_without_dates(xml_pth: Path) -> str:
+    """Read a document and drop its dump dates."""
+    return DATE_RE.sub(r'<\1/>', xml_pth.read_text(encoding='utf-8'))
+
+
+def test_bundled_datasets_exist():
+    assert BUNDLED_DATASETS
+
+
+@pytest.mark.parametrize('dset_name', BUNDLED_DATASETS)
+def test_stream_writer_matches_minidom(tmp_path: Path, dset_name: str):
+    dset = datasets[dset_name](DATA_DIR / dset_name)
+    labels = dset.get_labels_names()
+    for set_name in dset.get_subsets_names():
+        samples = dset[set_name]
+        stream_pth = tmp_path / f'{set_name}_stream.xml'
+        dom_pth = tmp_path / f'{set_name}_dom.xml'
+        create_cvat_object_detection_xml(
+            stream_pth, samples, set_name, labels)
+        create_dom_xml(dom_pth, samples, set_name, labels)
+        assert read_without_dates(stream_pth) == read_without_dates(dom_pth)
@@ -0,0 +1,57 @@
+"""Tests of `utils.file_utils.file_functions`."""
+
+
+import os
+from pathlib import Path
+
+import pytest
+
+from utils.file_utils.file_functions import (
+    MATERIALIZE_MODES, materialize_file)
+
+
+@pytest.fixture
+def src_pth(tmp_path: Path) -> Path:
+    src_pth = tmp_path / 'src.jpg'
+    src_pth.write_bytes(b'source')
+    return src_pth
+
+
+@pytest.mark.parametrize('mode', MATERIALIZE_MODES)
+def test_materialize_over_hardlink(tmp_path: Path, src_pth: Path, mode: str):
+    dst_pth = tmp_path / 'dst.jpg'
+    os.link(src_pth, dst_pth)
+    materialize_file(src_pth, dst_pth, mode)
+    assert dst_pth.read_bytes() == b'source'
+    assert src_pth.read_bytes() == b'source'
+
+
+@pytest.mark.parametrize('mode', MATERIALIZE_MODES)
+def test_materialize_over_symlink(tmp_path: Path, src_pth: Path, mode: str):
+    dst_pth = tmp_path / 'dst.jpg'
+    os.symlink(src_pth, dst_pth)
+    materialize_file(src_pth, dst_pth, mode)
+    assert dst_pth.read_bytes() == b'source'
+    assert dst_pth.is_symlink() == (mode == 'symlink')
+
+
+def test_copy_over_hardlink_is_independent(tmp_path: Path, src_pth: Path):
+    dst_pth = tmp_path / 'dst.jpg'
+    os.link(src_pth, dst_pth)
+    materialize_file(src_pth, dst_pth, 'copy')
+    assert not os.path.samefile(src_pth, dst_pth)
+    dst_pth.write_bytes(b'changed')
+    assert src_pth.read_bytes() == b'source'
+
+
+def test_copy_over_symlink_keeps_source(tmp_path: Path, src_pth: Path):
+    dst_pth = tmp_path / 'dst.jpg'
+    os.symlink(src_pth, dst_pth)
+    materialize_file(src_pth, dst_pth, 'copy')
+    dst_pth.write_bytes(b'changed')
+    assert src_pth.read_bytes() == b'source'
+
+
+def test_unknown_mode(tmp_path: Path, src_pth: Path):
+    with pytest.raises(ValueError):
+        materialize_file(src_pth, tmp_path / 'dst.jpg', 'move')
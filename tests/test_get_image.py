@@ -0,0 +1,32 @@
+"""Tests of reading images of samples."""
+
+
+from pathlib import Path
+
+import pytest
+
+from datasets import SVT_dataset
+from datasets import BaseTextDetectionSample
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+@pytest.fixture
+def sample() -> BaseTextDetectionSample:
+    dset = SVT_dataset(DATA_DIR / 'StreetViewText')
+    return dset[dset.get_subsets_names()[0]][0]
+
+
+def test_image_is_writable_copy(sample: BaseTextDetectionSample):
+    image = sample.get_image()
+    assert image.flags.writeable
+    image[:] = 0
+    assert sample.get_image().any()
+
+
+def test_shared_image_is_cached_view(sample: BaseTextDetectionSample):
+    shared = sample.get_image(shared=True)
+    assert not shared.flags.writeable
+    assert sample.get_image(shared=True) is shared
+    assert sample.get_image() is not shared
@@ -0,0 +1,53 @@
+"""Tests of `utils.numpy_utils.numpy_functions`."""
+
+
+import numpy as np
+import pytest
+
+from utils.numpy_utils.numpy_functions import (
+    clip_quads, quads_area, quads_iou, rectangles_to_quads,
+    rotate_rectangle, rotate_rectangles)
+
+
+SQUARE = rectangles_to_quads(np.array([[0, 0, 2, 2]]))
+
+
+def test_quads_iou_of_known_areas():
+    shifted = rectangles_to_quads(np.array([[1, 0, 3, 2]]))
+    disjoint = rectangles_to_quads(np.array([[5, 5, 7, 7]]))
+    iou = quads_iou(SQUARE, np.concatenate((SQUARE, disjoint, shifted)))
+    assert iou.shape == (1, 3)
+    assert iou[0] == pytest.approx([1.0, 0.0, 1 / 3])
+
+
+def test_quads_iou_of_rotated_quads():
+    diamond = np.array([[[1, 0], [0, 1], [1, 2], [2, 1]]])
+    # The diamond is inscribed into the square and has half its area
+    assert quads_area(diamond) == pytest.approx([2.0])
+    assert quads_iou(diamond, SQUARE)[0, 0] == pytest.approx(0.5)
+    # The order of corners does not matter
+    assert quads_iou(diamond[:, ::-1], diamond)[0, 0] == pytest.approx(1.0)
+
+
+def test_clip_quads():
+    quads = np.array([[[-5, 3], [2, 20], [12, 9], [4, -1]]])
+    assert clip_quads(quads, 10, 10).tolist() == [
+        [[0, 3], [2, 9], [9, 9], [4, 0]]]
+
+
+@pytest.mark.parametrize('radians', [True, False])
+def test_rotate_rectangles_matches_rotate_rectangle(radians: bool):
+    rng = np.random.default_rng(0)
+    rects = np.concatenate((
+        rng.integers(0, 500, (200, 2)), rng.integers(1, 200, (200, 2)),
+        rng.uniform(-np.pi, np.pi, (200, 1)) * (1 if radians else 60)),
+        axis=1)
+    corners, bounds = rotate_rectangles(rects, radians)
+
+    for rect, rect_corners, rect_bounds in zip(rects, corners, bounds):
+        x, y, w, h, angle = rect.tolist()
+        points = rotate_rectangle(
+            [(x, y), (x, y + h), (x + w, y + h), (x + w, y)], angle, radians)
+        assert rect_corners.tolist() == [list(point) for point in points]
+        xs, ys = zip(*points)
+        assert rect_bounds.tolist() == [min(xs), min(ys), max(xs), max(ys)]
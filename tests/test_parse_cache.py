@@ -0,0 +1,56 @@
+"""Tests of the binary cache of parsed subsets."""
+
+
+import os
+from pathlib import Path
+
+import pytest
+
+from datasets import SVT_dataset
+from datasets.MSRA_TD500 import MSRA_TD500_annotation, MSRA_TD500_dataset
+from helpers import assert_same_samples
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+@pytest.mark.parametrize('columnar', [True, False])
+def test_cache_from_another_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, columnar: bool
+):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.chdir(DATA_DIR)
+    dset = SVT_dataset('StreetViewText', columnar, cache_dir=cache_dir)
+    parsed = {set_name: [sample.get_image_path()
+                         for sample in dset[set_name]]
+              for set_name in dset.get_subsets_names()}
+
+    other_dir = tmp_path / 'other'
+    other_dir.mkdir()
+    monkeypatch.chdir(other_dir)
+    rel_folder = Path(os.path.relpath(DATA_DIR / 'StreetViewText'))
+    dset = SVT_dataset(rel_folder, columnar, cache_dir=cache_dir)
+    for set_name, img_pths in parsed.items():
+        cached = [sample.get_image_path() for sample in dset[set_name]]
+        assert cached == [rel_folder / pth.relative_to('StreetViewText')
+                          for pth in img_pths]
+        assert all(pth.exists() for pth in cached)
+
+
+@pytest.mark.parametrize('oriented', [False, True])
+def test_cached_msra_annotations_match_uncached(
+    tmp_path: Path, oriented: bool
+):
+    dset_pth = DATA_DIR / 'MSRA_TD500'
+    uncached = MSRA_TD500_dataset(dset_pth, oriented=oriented)
+    expected = uncached['test']
+    assert isinstance(expected[0].get_annotations()[0],
+                      MSRA_TD500_annotation)
+    # The first read fills the cache and the second one loads it
+    for _ in range(2):
+        cached = MSRA_TD500_dataset(
+            dset_pth, cache_dir=tmp_path, oriented=oriented)
+        assert_same_samples(cached['test'], expected)
+        columnar = MSRA_TD500_dataset(
+            dset_pth, columnar=True, cache_dir=tmp_path, oriented=oriented)
+        assert_same_samples(columnar['test'], expected)
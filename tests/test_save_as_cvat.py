@@ -0,0 +1,146 @@
+"""Tests of incremental CVAT exports."""
+
+
+import json
+import os
+from pathlib import Path
+import re
+import shutil
+
+import pytest
+
+from datasets import CVAT_dataset, SVT_dataset
+from utils.data_utils.datasets.base_object_detection_dataset import (
+    SAVE_WORKERS)
+from utils.data_utils.datasets.export_manifest import MANIFEST_NAME
+
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+DATE_RE = re.compile(r'<(created|updated|dumped)>[^<]*</\1>')
+
+
+@pytest.fixture
+def dataset() -> SVT_dataset:
+    return SVT_dataset(DATA_DIR / 'StreetViewText')
+
+
+def exported_images(save_pth: Path):
+    """Get exported images with their source images."""
+    for subset_dir in save_pth.iterdir():
+        if not subset_dir.is_dir():
+            continue
+        for image_pth in (subset_dir / 'images').iterdir():
+            yield image_pth
+
+
+@pytest.mark.parametrize('first_mode, second_mode', [
+    ('hardlink', 'copy'),
+    ('symlink', 'copy'),
+    ('copy', 'hardlink'),
+    ('hardlink', 'symlink'),
+])
+def test_reexport_with_changed_mode(
+    tmp_path: Path,
+    dataset: SVT_dataset,
+    first_mode: str,
+    second_mode: str
+):
+    sources = {sample.get_image_path().name: sample.get_image_path()
+               for subset_name in dataset.get_subsets_names()
+               for sample in dataset[subset_name]}
+    sources_bytes = {name: pth.read_bytes() for name, pth in sources.items()}
+
+    dataset.save_as_cvat(tmp_path, copy_images=True, images_mode=first_mode)
+    dataset.save_as_cvat(tmp_path, copy_images=True, images_mode=second_mode)
+
+    images = list(exported_images(tmp_path))
+    assert len(images) == len(sources)
+    for image_pth in images:
+        src_pth = sources[image_pth.name]
+        assert image_pth.read_bytes() == sources_bytes[image_pth.name]
+        assert image_pth.is_symlink() == (second_mode == 'symlink')
+        if second_mode == 'copy':
+            assert not os.path.samefile(image_pth, src_pth)
+        elif second_mode == 'hardlink':
+            assert os.path.samefile(image_pth, src_pth)
+    # The sources are not touched by copies written over links
+    for name, src_pth in sources.items():
+        assert src_pth.read_bytes() == sources_bytes[name]
+
+    with open(tmp_path / MANIFEST_NAME, encoding='utf-8') as f:
+        manifest = json.load(f)
+    for record in manifest['subsets'].values():
+        assert record['images_mode'] == second_mode
+
+
+def test_reexport_with_same_mode_skips_images(
+    tmp_path: Path, dataset: SVT_dataset, capsys
+):
+    dataset.save_as_cvat(tmp_path, copy_images=True, images_mode='hardlink')
+    capsys.readouterr()
+    dataset.save_as_cvat(tmp_path, verbose=True, copy_images=True,
+                         images_mode='hardlink')
+    n_up_to_date, n_files = (
+        capsys.readouterr().out.split(' files are up to date')[0]
+        .split(' of '))
+    assert n_up_to_date == n_files
+
+
+def load_manifest(save_pth: Path):
+    with open(save_pth / MANIFEST_NAME, encoding='utf-8') as f:
+        return json.load(f)['subsets']
+
+
+@pytest.mark.parametrize('copy_images', [True, False])
+def test_reexport_removes_dropped_samples(
+    tmp_path: Path, dataset: SVT_dataset, copy_images: bool
+):
+    dataset.save_as_cvat(tmp_path, copy_images=True)
+    removed = dataset['test'].pop()
+    removed_name = removed.get_image_path().name
+    dataset.save_as_cvat(tmp_path, copy_images=copy_images)
+
+    images_dir = tmp_path / 'test' / 'images'
+    assert not (images_dir / removed_name).exists()
+    assert len(list(images_dir.iterdir())) == len(dataset['test'])
+    record = load_manifest(tmp_path)['test']
+    assert removed_name not in record['images']
+    assert len(record['images']) == len(dataset['test'])
+    assert removed_name not in (
+        tmp_path / 'test' / 'annotations.xml').read_text(encoding='utf-8')
+
+
+def test_reexport_removes_dropped_subsets(
+    tmp_path: Path, dataset: SVT_dataset
+):
+    export_pth = tmp_path / 'export'
+    copy_pth = tmp_path / 'copy'
+    dataset.save_as_cvat(export_pth, copy_images=True)
+    CVAT_dataset(export_pth).save_as_cvat(copy_pth, copy_images=True)
+    assert (copy_pth / 'test').exists()
+
+    shutil.rmtree(export_pth / 'test')
+    CVAT_dataset(export_pth).save_as_cvat(copy_pth, copy_images=True)
+
+    assert not (copy_pth / 'test').exists()
+    assert (copy_pth / 'train' / 'annotations.xml').exists()
+    assert list(load_manifest(copy_pth)) == ['train']
+
+
+def test_parallel_export_matches_serial(
+    tmp_path: Path, dataset: SVT_dataset
+):
+    assert SAVE_WORKERS >= 1
+    dataset.save_as_cvat(tmp_path / 'serial', copy_images=True,
+                         num_workers=0)
+    dataset.save_as_cvat(tmp_path / 'parallel', copy_images=True)
+    for subset_name in dataset.get_subsets_names():
+        files = []
+        for export_name in ('serial', 'parallel'):
+            subset_dir = tmp_path / export_name / subset_name
+            annots = (subset_dir / 'annotations.xml').read_text(
+                encoding='utf-8')
+            files.append((
+                sorted(pth.name for pth in (subset_dir / 'images').iterdir()),
+                DATE_RE.sub('', annots)))
+        assert files[0] == files[1]
@@ -0,0 +1,55 @@
+"""Tests of `Vocabulary` codes of annotations."""
+
+
+from pathlib import Path
+import pickle
+import subprocess
+import sys
+
+from datasets import BaseTextDetectionAnnotation
+from utils.data_utils.datasets import Vocabulary
+
+
+ROOT_DIR = Path(__file__).parents[1]
+# Loads pickled annotations in a process whose vocabularies
+# already have other strings, so codes of the same strings differ there
+LOAD_SCRIPT = '''
+import pickle
+import sys
+
+from datasets import BaseTextDetectionAnnotation
+
+BaseTextDetectionAnnotation.labels_vocab.encode('other label')
+BaseTextDetectionAnnotation.texts_vocab.encode('other text')
+with open(sys.argv[1], 'rb') as f:
+    annots = pickle.load(f)
+for annot in annots:
+    print(annot.label, annot.text)
+'''
+
+
+def test_encode_decode():
+    vocab = Vocabulary(['a', 'b'])
+    assert vocab.encode('b') == 1
+    assert vocab.encode('c') == 2
+    assert vocab.decode_many([2, 0]) == ['c', 'a']
+    assert list(vocab) == ['a', 'b', 'c']
+    assert 'c' in vocab and 'd' not in vocab
+
+
+def test_codes_survive_pickle_to_fresh_process(tmp_path: Path):
+    annots = [BaseTextDetectionAnnotation(0, 0, 1, 1, 'english', 'word'),
+              BaseTextDetectionAnnotation(1, 1, 2, 2, 'german', 'wort')]
+    pickle_pth = tmp_path / 'annots.pkl'
+    with open(pickle_pth, 'wb') as f:
+        pickle.dump(annots, f)
+
+    result = subprocess.run(
+        [sys.executable, '-c', LOAD_SCRIPT, str(pickle_pth)],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    assert [line.split() for line in result.stdout.splitlines()] == [
+        ['english', 'word'], ['german', 'wort']]
+    with open(pickle_pth, 'rb') as f:
+        loaded = pickle.load(f)
+    assert [(annot.label, annot.text) for annot in loaded] == [
+        ('english', 'word'), ('german', 'wort')]
@@ -1,26 +1,111 @@
 """Object detection dataset in CVAT format."""
 
 
-from typing import List, Dict, Union, Any, Tuple
+from array import array
+from typing import (
+    List, Dict, Iterator, Optional, Sequence, Union, Any, Tuple)
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.xml_utils.xml_functions import iter_xml_elements
+from utils.xml_utils.xml_index import XmlElementsIndex
+
+
+class _IndexedNames(Sequence[str]):
+    """Names of images that are read from their elements on access."""
+
+    def __init__(self, index: XmlElementsIndex) -> None:
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, idx: int) -> str:
+        idx = range(len(self))[idx]
+        return self._index.get_element(idx).get('name')
+
 
 class CvatObjectDetectionDataset:
-    """Object detection dataset in CVAT format."""
+    """Object detection dataset in CVAT format.
+
+    The annotations file is parsed incrementally and boxes of all images
+    are kept in numpy arrays: `bboxes` with shape `(N, 4)`, label codes
+    `labels_codes` that index `labels_table` and `offsets` with shape
+    `(M + 1,)`, so boxes of the image `i` are rows
+    `offsets[i]:offsets[i + 1]`. Dicts of images are made on access.
 
-    def __init__(self, dset_pth: Union[Path, str]) -> None:
+    With `indexed=True` the annotations file is opened through
+    a byte-offset index and each image is parsed on access.
+    Then `names` are read on access too and `labels_table` holds
+    the labels that are declared in `meta`, because boxes are not scanned.
+    For a single pass over the images without loading the dataset
+    use `iter_images`.
+    """
+
+    def __init__(
+        self, dset_pth: Union[Path, str], indexed: bool = False
+    ) -> None:
         if isinstance(dset_pth, str):
             self.dset_pth = Path(dset_pth)
         else:
             self.dset_pth = dset_pth
-        annots = ET.parse(self.dset_pth / 'annotations.xml').getroot()
-        
-        # Get labels
+        annots_pth = self.dset_pth / 'annotations.xml'
+        self._index: Optional[XmlElementsIndex] = None
         self._label_to_color = {}
         self._labels = []
-        labels_annots = annots.findall('meta/job/labels/label')
-        for i, label_annot in enumerate(labels_annots):
+        if indexed:
+            self._index = XmlElementsIndex(annots_pth, 'image')
+            # `meta` precedes images, so parsing stops at the first image
+            elems = iter_xml_elements(annots_pth, ('meta', 'image'))
+            try:
+                elem = next(elems, None)
+                if elem is not None and elem.tag == 'meta':
+                    self._read_labels(elem)
+            finally:
+                elems.close()
+            self.names: Sequence[str] = _IndexedNames(self._index)
+            self.labels_table = list(self._labels)
+            return
+
+        names: List[str] = []
+        shapes = array('q')
+        coords = array('d')
+        labels_codes = array('i')
+        offsets = array('q', [0])
+        self.labels_table: List[str] = []
+        label_to_code: Dict[str, int] = {}
+        for elem in iter_xml_elements(annots_pth, ('meta', 'image')):
+            if elem.tag == 'meta':
+                self._read_labels(elem)
+                continue
+            names.append(elem.get('name'))
+            shapes.extend((int(elem.get('height')), int(elem.get('width'))))
+            for bbox in elem.iterfind('box'):
+                label = bbox.get('label')
+                code = label_to_code.get(label)
+                if code is None:
+                    code = label_to_code[label] = len(self.labels_table)
+                    self.labels_table.append(label)
+                labels_codes.append(code)
+                coords.extend((float(bbox.get('xtl')), float(bbox.get('ytl')),
+                               float(bbox.get('xbr')), float(bbox.get('ybr'))))
+            offsets.append(len(labels_codes))
+
+        self.names = names
+        self.shapes: NDArray = np.frombuffer(
+            shapes, dtype=np.int64).reshape(-1, 2).copy()
+        self.bboxes: NDArray = np.frombuffer(
+            coords, dtype=np.float64).reshape(-1, 4).copy()
+        self.labels_codes: NDArray = np.frombuffer(
+            labels_codes, dtype=np.int32).copy()
+        self.offsets: NDArray = np.frombuffer(offsets, dtype=np.int64).copy()
+
+    def _read_labels(self, meta: ET.Element) -> None:
+        """Get labels and their colors from the `meta` element."""
+        for label_annot in meta.findall('job/labels/label'):
             name = label_annot.find('name').text
             hex_color = label_annot.find('color').text
             color = [int(hex_color[j:j + 2], 16)
@@ -28,36 +113,84 @@ class CvatObjectDetectionDataset:
             self._label_to_color[name] = color
             self._labels.append(name)
 
-        # Get images
-        self.samples: List[Dict[str, Any]] = []
-        imgs_annots = annots.findall('image')
-        for img_annots in imgs_annots:
-            name = img_annots.get('name')
-            shape = (int(img_annots.get('height')),
-                     int(img_annots.get('width')))
-            img_bboxes = img_annots.findall('box')
-            img_labels: List[str] = []
-            img_bboxes_pts: List[Tuple[float, float, float, float]] = []
-            for bbox in img_bboxes:
-                label = bbox.get('label')
-                img_labels.append(label)
-                x1 = float(bbox.get('xtl'))
-                y1 = float(bbox.get('ytl'))
-                x2 = float(bbox.get('xbr'))
-                y2 = float(bbox.get('ybr'))
-                img_bboxes_pts.append((x1, y1, x2, y2))
-            self.samples.append({
-                'name': name,
-                'labels': img_labels,
-                'bboxes': img_bboxes_pts,
-                'shape': shape
-            })
-
     def __len__(self) -> int:
-        return len(self.samples)
+        if self._index is not None:
+            return len(self._index)
+        return len(self.names)
 
     def __getitem__(self, idx: int) -> Dict[str, Any]:
-        return self.samples[idx]
+        if self._index is not None:
+            return self.parse_image(self._index.get_element(idx))
+        idx = range(len(self))[idx]
+        start, end = self.offsets[idx:idx + 2].tolist()
+        height, width = self.shapes[idx].tolist()
+        return {
+            'name': self.names[idx],
+            'labels': [self.labels_table[code] for code
+                       in self.labels_codes[start:end].tolist()],
+            'bboxes': [tuple(bbox) for bbox
+                       in self.bboxes[start:end].tolist()],
+            'shape': (height, width)
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @staticmethod
+    def iter_images(
+        dset_pth: Union[Path, str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over images of a CVAT dataset without keeping them.
+
+        Parameters
+        ----------
+        dset_pth : Union[Path, str]
+            A path to the dataset directory.
+
+        Yields
+        ------
+        Dict[str, Any]
+            Dict with "name", "labels", "bboxes" and "shape" of an image.
+        """
+        annots_pth = Path(dset_pth) / 'annotations.xml'
+        for elem in iter_xml_elements(annots_pth, 'image'):
+            yield CvatObjectDetectionDataset.parse_image(elem)
+
+    @staticmethod
+    def parse_image(img_annots: ET.Element) -> Dict[str, Any]:
+        """Get an image's annotations from its `image` element.
+
+        Parameters
+        ----------
+        img_annots : ET.Element
+            The `image` element.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dict with "name", "labels", "bboxes" and "shape" of the image.
+        """
+        name = img_annots.get('name')
+        shape = (int(img_annots.get('height')),
+                 int(img_annots.get('width')))
+        img_bboxes = img_annots.findall('box')
+        img_labels: List[str] = []
+        img_bboxes_pts: List[Tuple[float, float, float, float]] = []
+        for bbox in img_bboxes:
+            label = bbox.get('label')
+            img_labels.append(label)
+            x1 = float(bbox.get('xtl'))
+            y1 = float(bbox.get('ytl'))
+            x2 = float(bbox.get('xbr'))
+            y2 = float(bbox.get('ybr'))
+            img_bboxes_pts.append((x1, y1, x2, y2))
+        return {
+            'name': name,
+            'labels': img_labels,
+            'bboxes': img_bboxes_pts,
+            'shape': shape
+        }
     
     def get_labels(self) -> List[str]:
         """Get a list of dataset's labels.
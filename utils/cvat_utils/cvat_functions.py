@@ -4,7 +4,7 @@
 from __future__ import annotations
 from xml.dom.minidom import Document
 import datetime
-from typing import List, Union, TYPE_CHECKING
+from typing import List, Sequence, TextIO, Union, TYPE_CHECKING
 from pathlib import Path
 
 if TYPE_CHECKING:
@@ -149,7 +149,7 @@ def create_cvat_object_detection_annotations(
     annots_tag = xml_doc.getElementsByTagName("annotations")[0]
     for i, sample in iterator:
         pth = sample.get_image_path()
-        shape = sample.get_image().shape[:2]
+        shape = sample.get_image_shape()
         annots = sample.get_annotations()
         image = xml_doc.createElement('image')
         image.setAttribute('id', str(i))
@@ -170,35 +170,159 @@ def create_cvat_object_detection_annotations(
         annots_tag.appendChild(image)
 
 
+def _escape_xml(data: str) -> str:
+    """Escape xml text and attribute values as `xml.dom.minidom` does."""
+    return (data.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('"', '&quot;').replace('>', '&gt;'))
+
+
+def _write_text_element(
+    xml_file: TextIO, indent: str, tag: str, text: str
+) -> None:
+    """Write an element with a text node on a single line."""
+    xml_file.write(f'{indent}<{tag}>{_escape_xml(text)}</{tag}>\n')
+
+
+def write_cvat_meta(
+    xml_file: TextIO,
+    set_size: int,
+    labels_names: List[str],
+    subset_name: str
+) -> None:
+    """Write "version" and "meta" tags of cvat annotations to a file.
+
+    It writes the same header as `create_cvat_meta` but directly to
+    a file, without building a document in memory.
+
+    Parameters
+    ----------
+    xml_file : TextIO
+        An opened xml file inside "annotations" tag.
+    set_size : int
+        Number of images in the annotated set.
+    labels_names : List[str]
+        Labels names of annotated objects.
+    subset_name : str
+        A name of the annotated set.
+        For example "train", "val" or something else.
+    """
+    date = datetime.datetime.now(datetime.timezone(datetime.timedelta()))
+    indent = '  '
+    _write_text_element(xml_file, indent * 2, 'version', '1.1')
+    xml_file.write(f'{indent * 2}<meta>\n')
+    xml_file.write(f'{indent * 3}<job>\n')
+
+    job_indent = indent * 4
+    _write_text_element(xml_file, job_indent, 'id', '1')
+    _write_text_element(xml_file, job_indent, 'size', str(set_size))
+    _write_text_element(xml_file, job_indent, 'mode', 'annotation')
+    _write_text_element(xml_file, job_indent, 'overlap', '0')
+    xml_file.write(f'{job_indent}<bugtracker/>\n')
+    _write_text_element(xml_file, job_indent, 'created', str(date))
+    _write_text_element(xml_file, job_indent, 'updated', str(date))
+    _write_text_element(xml_file, job_indent, 'subset', subset_name)
+    _write_text_element(xml_file, job_indent, 'start_frame', '0')
+    _write_text_element(xml_file, job_indent, 'stop_frame', str(set_size))
+    xml_file.write(f'{job_indent}<frame_filter/>\n')
+
+    xml_file.write(f'{job_indent}<segments>\n')
+    xml_file.write(f'{indent * 5}<segment>\n')
+    _write_text_element(xml_file, indent * 6, 'id', '1')
+    _write_text_element(xml_file, indent * 6, 'start', '0')
+    _write_text_element(xml_file, indent * 6, 'stop', str(set_size))
+    _write_text_element(xml_file, indent * 6, 'url',
+                        'http://localhost:8080/api/jobs/1')
+    xml_file.write(f'{indent * 5}</segment>\n')
+    xml_file.write(f'{job_indent}</segments>\n')
+
+    xml_file.write(f'{job_indent}<owner>\n')
+    _write_text_element(xml_file, indent * 5, 'username', 'enot')
+    xml_file.write(f'{indent * 5}<email/>\n')
+    xml_file.write(f'{job_indent}</owner>\n')
+    xml_file.write(f'{job_indent}<assignee/>\n')
+
+    if len(labels_names) == 0:
+        xml_file.write(f'{job_indent}<labels/>\n')
+    else:
+        xml_file.write(f'{job_indent}<labels>\n')
+        for label_name in labels_names:
+            xml_file.write(f'{indent * 5}<label>\n')
+            _write_text_element(xml_file, indent * 6, 'name', label_name)
+            _write_text_element(xml_file, indent * 6, 'color', '#000000')
+            _write_text_element(xml_file, indent * 6, 'type', 'any')
+            xml_file.write(f'{indent * 6}<attributes/>\n')
+            xml_file.write(f'{indent * 5}</label>\n')
+        xml_file.write(f'{job_indent}</labels>\n')
+
+    xml_file.write(f'{indent * 3}</job>\n')
+    _write_text_element(xml_file, indent * 3, 'dumped', str(date))
+    xml_file.write(f'{indent * 2}</meta>\n')
+
+
+def write_cvat_object_detection_annotations(
+    xml_file: TextIO,
+    set_samples: Sequence[BaseObjectDetectionSample]
+) -> None:
+    """Write CVAT object detection annotations to a file.
+
+    It writes the same "image" tags as
+    `create_cvat_object_detection_annotations` but sample by sample,
+    so memory usage does not depend on a number of boxes.
+
+    Parameters
+    ----------
+    xml_file : TextIO
+        An opened xml file inside "annotations" tag.
+    set_samples : Sequence[BaseObjectDetectionSample]
+        A set of samples.
+    """
+    for i, sample in enumerate(set_samples):
+        height, width = sample.get_image_shape()
+        name = _escape_xml(sample.get_image_path().name)
+        boxes = [
+            f'      <box label="{_escape_xml(annot.label)}" occluded="0" '
+            f'source="manual" xtl="{annot.x1}" ytl="{annot.y1}" '
+            f'xbr="{annot.x2}" ybr="{annot.y2}" z_order="0"/>\n'
+            for annot in sample.get_annotations()]
+        image_tag = (f'    <image id="{i}" name="{name}" '
+                     f'width="{width}" height="{height}"')
+        if len(boxes) == 0:
+            xml_file.write(f'{image_tag}/>\n')
+        else:
+            xml_file.write(f'{image_tag}>\n')
+            xml_file.writelines(boxes)
+            xml_file.write('    </image>\n')
+
+
 def create_cvat_object_detection_xml(
     save_pth: Union[str, Path],
-    set_samples: List[BaseObjectDetectionSample],
+    set_samples: Sequence[BaseObjectDetectionSample],
     set_name: str,
     set_labels: List[str]
 ):
     """Save annotations as a CVAT xml document.
 
+    The document is written to the file incrementally. Its content is
+    the same as the `xml.dom.minidom` document built with `create_cvat_meta`
+    and `create_cvat_object_detection_annotations` would produce.
+
     Parameters
     ----------
-    xml_doc : Document
-        The xml document object.
     save_pth : Union[str, Path]
         An xml save path.
+    set_samples : Sequence[BaseObjectDetectionSample]
+        Samples of the saving set.
     set_name : str
         A name of saving set ("train", "val", etc).
     set_labels : List[str]
         a list of all set's labels.
-    verbose : bool, optional
-        Whether to show progress of converting. By default is `False`.
     """
     if isinstance(save_pth, str):
-        save_pth = Path(str)
-    xml_doc = Document()
-    create_cvat_meta(xml_doc, len(set_samples), set_labels, set_name)
-    create_cvat_object_detection_annotations(xml_doc, set_samples)
-    
+        save_pth = Path(save_pth)
     save_pth.parent.mkdir(parents=True, exist_ok=True)
-    xml_doc.writexml(open(save_pth, 'w'), indent="  ", addindent="  ",
-                     newl='\n', encoding='utf-8')
-    xml_doc.unlink()
-
+    with open(save_pth, 'w', encoding='utf-8', buffering=2 ** 20) as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write('  <annotations>\n')
+        write_cvat_meta(f, len(set_samples), set_labels, set_name)
+        write_cvat_object_detection_annotations(f, set_samples)
+        f.write('  </annotations>\n')
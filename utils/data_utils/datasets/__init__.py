@@ -4,3 +4,8 @@ from utils.data_utils.datasets.base_object_detection_dataset import (  # noqa
     BaseObjectDetectionDataset,
     BaseObjectDetectionSample,
     BaseObjectDetectionAnnotation)
+from utils.data_utils.datasets.columnar_annotations import (  # noqa
+    ColumnarSubset,
+    ColumnarAnnotations)
+from utils.data_utils.datasets.vocabulary import Vocabulary  # noqa
+from utils.data_utils.datasets.indexed_subset import IndexedSubset  # noqa
@@ -6,37 +6,94 @@ it to CVAT datasets format.
 """
 
 
+import copy
+import os
 from pathlib import Path
 import sys
-from typing import List, Optional, Dict, Union
-import shutil
+from typing import (
+    Any, Callable, Iterable, Iterator, List, Optional, Dict, Sequence, Tuple,
+    Type, TypeVar, Union)
+import hashlib
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, as_completed)
+from functools import partial
 
+import cv2
 import numpy as np
 from numpy.typing import NDArray
 
 sys.path.append(str(Path(__file__).parents[3]))
-from utils.image_utils.image_functions import read_image, draw_bounding_boxes
+from utils.image_utils.image_functions import (
+    read_image, read_downscaled_image, read_image_shape)
+from utils.image_utils.image_cache import image_cache
+from utils.image_utils.preview_cache import PreviewCache, preview_cache
+from utils.image_utils.bbox_renderer import bbox_renderer
+from utils.numpy_utils.numpy_functions import rectangles_to_quads
 from utils.cvat_utils.cvat_functions import create_cvat_object_detection_xml
+from utils.file_utils.file_functions import (
+    materialize_file, MATERIALIZE_MODES)
+from utils.data_utils.datasets.columnar_annotations import (
+    ColumnarSubset, ColumnarAnnotations)
+from utils.data_utils.datasets.indexed_subset import IndexedSubset
+from utils.data_utils.datasets.vocabulary import Vocabulary
+from utils.data_utils.datasets.export_manifest import (
+    MANIFEST_NAME, file_stamp, sample_digest, subset_digest,
+    load_export_manifest, save_export_manifest)
+from utils.data_utils.datasets.parse_cache import (
+    sources_fingerprint, load_columnar_subset, save_columnar_subset)
+
+
+T = TypeVar('T')
+# Threads that save files of an export by default
+SAVE_WORKERS = min(4, os.cpu_count() or 1)
 
 
 class BaseObjectDetectionAnnotation:
     """The base annotation class for object detection.
 
     It consists of 4 points of bounding box and a class label.
+    The label is kept as a code in the shared `labels_vocab`.
+    An oriented box may also keep its corners in `points` with shape
+    `(4, 2)`, then `x1, y1, x2, y2` are the corners' axis-aligned bounds.
     """
+
+    labels_vocab: Vocabulary = Vocabulary()
+
     def __init__(
         self,
         x1: int,
         y1: int,
         x2: int,
         y2: int,
-        label: str
+        label: str,
+        points: Optional[NDArray] = None
     ) -> None:
         self.x1 = x1
         self.y1 = y1
         self.x2 = x2
         self.y2 = y2
-        self.label = label
+        self.label_code = self.labels_vocab.encode(label)
+        self.points = points
+
+    @property
+    def label(self) -> str:
+        return self.labels_vocab.decode(self.label_code)
+
+    @label.setter
+    def label(self, label: str) -> None:
+        self.label_code = self.labels_vocab.encode(label)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Codes are valid only in the current process,
+        # so the label is pickled as a string
+        state = self.__dict__.copy()
+        state['label'] = self.labels_vocab.decode(state.pop('label_code'))
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state = state.copy()
+        self.label_code = self.labels_vocab.encode(state.pop('label'))
+        self.__dict__.update(state)
 
 
 class BaseObjectDetectionSample:
@@ -49,6 +106,7 @@ class BaseObjectDetectionSample:
     ) -> None:
         self._img_pth = img_pth
         self._img_annots = img_annots
+        self._img_shape: Optional[Tuple[int, int]] = None
 
     def get_image_path(self) -> Path:
         """Get a source image's path.
@@ -60,34 +118,227 @@ class BaseObjectDetectionSample:
         """
         return self._img_pth
 
-    def get_image(self) -> NDArray:
+    def get_image(
+        self,
+        use_cache: bool = True,
+        max_side: Optional[int] = None,
+        shared: bool = False
+    ) -> NDArray:
         """Get source image of this sample.
 
+        Decoded images are kept in the process-wide `image_cache`,
+        so repeated calls for a recently read image do not decode it again.
+        The returned image is a writable copy unless `shared` is set.
+
+        Parameters
+        ----------
+        use_cache : bool, optional
+            Whether to take the image from the cache and put it there.
+            By default is `True`. Downscaled images are not cached.
+        max_side : Optional[int], optional
+            The maximal long edge of the image. A larger image is decoded
+            at a reduced size, see `get_downscaled` to get annotations
+            that match it. By default is `None`, that means the full size.
+        shared : bool, optional
+            Whether to return the cached image itself instead of its copy.
+            It saves a copy for callers that only read the image, but
+            the image is read-only. By default is `False`.
+
         Returns
         -------
         NDArray
             The source image of this sample.
         """
-        if self._img_pth.name[-4:] == '.npy':
-            image = np.load(self._img_pth)
+        if max_side is not None:
+            return self._read_downscaled_image(self._img_pth, max_side)[0]
+        if use_cache:
+            image = image_cache.get(self._img_pth, self._read_image)
+            return image if shared else image.copy()
+        return self._read_image(self._img_pth)
+
+    def get_downscaled(
+        self, max_side: int
+    ) -> Tuple[NDArray, List[BaseObjectDetectionAnnotation]]:
+        """Get the image decoded at a reduced size and scaled annotations.
+
+        Parameters
+        ----------
+        max_side : int
+            The maximal long edge of the image.
+            Smaller images are not upscaled.
+
+        Returns
+        -------
+        Tuple[NDArray, List[BaseObjectDetectionAnnotation]]
+            The image and copies of the annotations in its coordinates.
+        """
+        image, scale = self._read_downscaled_image(self._img_pth, max_side)
+        return image, self.get_scaled_annotations(scale)
+
+    def get_preview(
+        self, min_side: int, cache: Optional[PreviewCache] = None
+    ) -> Tuple[NDArray, List[BaseObjectDetectionAnnotation]]:
+        """Get a downscaled rendition of the image and scaled annotations.
+
+        Renditions are made once and are kept on disk. The smallest one
+        with a long edge of at least `min_side` is taken. If the image is
+        not larger than it, the image itself is read.
+
+        Parameters
+        ----------
+        min_side : int
+            The minimal long edge of the rendition.
+        cache : Optional[PreviewCache], optional
+            A cache of renditions. By default is `None`,
+            that means the shared `preview_cache`.
+
+        Returns
+        -------
+        Tuple[NDArray, List[BaseObjectDetectionAnnotation]]
+            The rendition and copies of the annotations in its coordinates.
+        """
+        if cache is None:
+            cache = preview_cache
+        image, scale = cache.get(self._img_pth, min_side, self._read_image)
+        return image, self.get_scaled_annotations(scale)
+
+    def get_scaled_annotations(
+        self, scale: float
+    ) -> List[BaseObjectDetectionAnnotation]:
+        """Get copies of the annotations for a resized image.
+
+        Parameters
+        ----------
+        scale : float
+            The scale of the image.
+
+        Returns
+        -------
+        List[BaseObjectDetectionAnnotation]
+            The scaled copies of the annotations.
+        """
+        scaled_annots = []
+        for annot in self._img_annots:
+            annot = copy.copy(annot)
+            annot.x1 = round(annot.x1 * scale)
+            annot.y1 = round(annot.y1 * scale)
+            annot.x2 = round(annot.x2 * scale)
+            annot.y2 = round(annot.y2 * scale)
+            if annot.points is not None:
+                annot.points = annot.points * scale
+            scaled_annots.append(annot)
+        return scaled_annots
+
+    def get_image_shape(self) -> Tuple[int, int]:
+        """Get a height and a width of the source image without decoding it.
+
+        Only the image file's header is read when possible.
+        The result is kept in the sample.
+
+        Returns
+        -------
+        Tuple[int, int]
+            The height and the width of the source image.
+        """
+        if self._img_shape is None:
+            if self._img_pth.name[-4:] == '.npy':
+                shape = np.load(self._img_pth, mmap_mode='r').shape[:2]
+            else:
+                shape = read_image_shape(self._img_pth)
+            self._img_shape = (int(shape[0]), int(shape[1]))
+        return self._img_shape
+
+    @staticmethod
+    def _read_image(img_pth: Path) -> NDArray:
+        """Decode an image file or load a `.npy` array."""
+        if img_pth.name[-4:] == '.npy':
+            image = np.load(img_pth)
         else:
-            image = read_image(self._img_pth)
+            image = read_image(img_pth)
         return image
+
+    @staticmethod
+    def _read_downscaled_image(
+        img_pth: Path, max_side: int
+    ) -> Tuple[NDArray, float]:
+        """Decode an image file at a reduced size or shrink a `.npy` array."""
+        if img_pth.name[-4:] != '.npy':
+            return read_downscaled_image(img_pth, max_size=max_side)
+        image = np.load(img_pth)
+        height, width = image.shape[:2]
+        scale = max_side / max(height, width)
+        if scale >= 1.0:
+            return image, 1.0
+        new_size = (max(1, round(width * scale)),
+                    max(1, round(height * scale)))
+        return cv2.resize(image, new_size, interpolation=cv2.INTER_AREA), scale
     
-    def get_image_with_bboxes(self) -> NDArray:
+    def get_image_with_bboxes(
+        self, out: Optional[NDArray] = None
+    ) -> NDArray:
         """Get this sample's image with showed bounding boxes.
 
+        If some annotations are oriented, all boxes are drawn as polygons.
+
+        Parameters
+        ----------
+        out : Optional[NDArray], optional
+            A buffer with the image's shape to draw on. By default is `None`,
+            that means drawing on a new array.
+
         Returns
         -------
         NDArray
             The image with bounding boxes.
         """
-        img = self.get_image()
-        bboxes = list(map(
-            lambda annot: (annot.x1, annot.y1, annot.x2, annot.y2),
-            self._img_annots))
-        labels = list(map(lambda annot: annot.label, self._img_annots))
-        return draw_bounding_boxes(img, bboxes, labels)
+        img = self.get_image(shared=True)
+        if self.has_oriented_boxes():
+            bboxes = self.get_quads()
+        elif isinstance(self._img_annots, ColumnarAnnotations):
+            bboxes = self._img_annots.get_bboxes()
+        else:
+            bboxes = np.array(
+                [(annot.x1, annot.y1, annot.x2, annot.y2)
+                 for annot in self._img_annots], dtype=np.int32)
+        if isinstance(self._img_annots, ColumnarAnnotations):
+            labels = self._img_annots.get_labels()
+        else:
+            labels = [annot.label for annot in self._img_annots]
+        return bbox_renderer.render(img, bboxes, labels, out=out)
+
+    def has_oriented_boxes(self) -> bool:
+        """Check whether some annotations of this sample have corners.
+
+        Returns
+        -------
+        bool
+            Whether there are oriented boxes.
+        """
+        if isinstance(self._img_annots, ColumnarAnnotations):
+            return self._img_annots.has_oriented_boxes()
+        return any(getattr(annot, 'points', None) is not None
+                   for annot in self._img_annots)
+
+    def get_quads(self) -> NDArray:
+        """Get bounding boxes of this sample as quadrilaterals.
+
+        Annotations without corners give corners of their `xyxy` boxes.
+
+        Returns
+        -------
+        NDArray
+            The quadrilaterals with shape `(n_boxes, 4, 2)`.
+        """
+        if isinstance(self._img_annots, ColumnarAnnotations):
+            return self._img_annots.get_quads()
+        quads = rectangles_to_quads(np.array(
+            [(annot.x1, annot.y1, annot.x2, annot.y2)
+             for annot in self._img_annots], dtype=np.int32))
+        for i, annot in enumerate(self._img_annots):
+            points = getattr(annot, 'points', None)
+            if points is not None:
+                quads[i] = points
+        return quads
     
     def get_annotations(self) -> List[BaseObjectDetectionAnnotation]:
         """Get annotations of this sample.
@@ -105,35 +356,247 @@ class BaseObjectDetectionDataset:
 
     It consists of subsets that represented as base samples lists
     and of a all possible labels str list.
+
+    With `columnar=True` subsets are packed into `ColumnarSubset` that keeps
+    bounding boxes in numpy arrays and creates samples and annotations
+    lazily on access.
+
+    With `cache_dir` parsed subsets are saved to a binary cache
+    and are read from it while their source files stay unchanged.
+
+    Subsets are registered as readers and are parsed on the first access
+    to them, so a job that needs only one subset reads only this subset.
+
+    Datasets that parse a file per image can parse the files
+    on `num_workers` threads or, with `use_processes=True`, processes.
+
+    Datasets with rotated or four-point boxes keep the boxes' corners
+    in annotations when `oriented=True`.
     """
-    def __init__(self, dset_folder: Union[str, Path]) -> None:
+
+    annotation_cls: Type[BaseObjectDetectionAnnotation] = (
+        BaseObjectDetectionAnnotation)
+    sample_cls: Type[BaseObjectDetectionSample] = BaseObjectDetectionSample
+
+    def __init__(
+        self,
+        dset_folder: Union[str, Path],
+        columnar: bool = False,
+        cache_dir: Optional[Union[str, Path]] = None,
+        num_workers: int = 0,
+        use_processes: bool = False,
+        oriented: bool = False
+    ) -> None:
         if isinstance(dset_folder, str):
             self.dset_folder = Path(dset_folder)
         else:
             self.dset_folder = dset_folder
-        self._subsets: Dict[List[BaseObjectDetectionSample]] = {}
+        if isinstance(cache_dir, str):
+            cache_dir = Path(cache_dir)
+        self._columnar = columnar
+        self._cache_dir: Optional[Path] = cache_dir
+        self._num_workers = num_workers
+        self._use_processes = use_processes
+        self._oriented = oriented
+        self._subsets: Dict[
+            str, Union[List[BaseObjectDetectionSample], ColumnarSubset]] = {}
+        self._subsets_readers: Dict[
+            str, Tuple[Callable[[], Iterable[BaseObjectDetectionSample]],
+                       Sequence[Path]]] = {}
         self._labels: Optional[List[str]] = None
 
-    def __getitem__(self, set_name: str) -> List[BaseObjectDetectionSample]:
-        if set_name not in self._subsets:
-            raise KeyError(f'Available sets: {list(self._subsets.keys())}.')
+    def _register_subset(
+        self,
+        set_name: str,
+        reader: Callable[[], Iterable[BaseObjectDetectionSample]],
+        sources: Sequence[Path] = ()
+    ) -> None:
+        """Register a subset that will be read on the first access to it.
+
+        Parameters
+        ----------
+        set_name : str
+            A name of the subset.
+        reader : Callable[[], Iterable[BaseObjectDetectionSample]]
+            A function that parses the subset's samples.
+        sources : Sequence[Path], optional
+            Files and directories that the subset is parsed from.
+            By default is empty, that disables caching of the subset.
+        """
+        self._subsets_readers[set_name] = (reader, sources)
+        self._subsets.pop(set_name, None)
+        self._labels = None
+
+    def _read_subset(
+        self, set_name: str
+    ) -> Union[List[BaseObjectDetectionSample], ColumnarSubset]:
+        """Read a registered subset.
+
+        If the dataset is columnar the samples are packed
+        into `ColumnarSubset`. If the dataset has a cache directory
+        and the subset's sources are given, the subset is read from the cache
+        when the sources did not change since it was saved.
+        A reader may return `IndexedSubset`, that is stored as is.
+
+        Parameters
+        ----------
+        set_name : str
+            A name of the subset.
+
+        Returns
+        -------
+        Union[List[BaseObjectDetectionSample], ColumnarSubset]
+            The read subset.
+        """
+        reader, sources = self._subsets_readers[set_name]
+        if self._cache_dir is None or len(sources) == 0:
+            samples = reader()
+            if isinstance(samples, IndexedSubset):
+                # Indexed subsets are random-access already
+                subset = samples
+            elif self._columnar:
+                subset = ColumnarSubset.from_samples(
+                    samples, self.annotation_cls)
+            else:
+                subset = list(samples)
         else:
-            return self._subsets[set_name]
+            subset = self._read_cached_subset(set_name, reader, sources)
+        return subset
+
+    def _read_cached_subset(
+        self,
+        set_name: str,
+        reader: Callable[[], Iterable[BaseObjectDetectionSample]],
+        sources: Sequence[Path]
+    ) -> Union[List[BaseObjectDetectionSample], ColumnarSubset]:
+        """Load a subset from the cache or parse it and update the cache.
+
+        If the dataset is not columnar, samples are unpacked from the cache
+        or, when the cache is updated, the parsed samples are returned.
+
+        Parameters
+        ----------
+        set_name : str
+            A name of the subset.
+        reader : Callable[[], Iterable[BaseObjectDetectionSample]]
+            A function that parses the subset's samples.
+        sources : Sequence[Path]
+            Files and directories that the subset is parsed from.
+
+        Returns
+        -------
+        Union[List[BaseObjectDetectionSample], ColumnarSubset]
+            The read subset.
+        """
+        dset_hash = hashlib.sha1(
+            str(self.dset_folder.resolve()).encode()).hexdigest()[:10]
+        variant = '_oriented' if self._oriented else ''
+        cache_pth = (self._cache_dir /
+                     f'{type(self).__name__}_{dset_hash}{variant}' /
+                     set_name)
+        fingerprint = sources_fingerprint(sources)
+        subset = load_columnar_subset(
+            cache_pth, fingerprint, self.sample_cls, self.annotation_cls,
+            self.dset_folder)
+        if subset is not None:
+            return subset if self._columnar else subset.to_samples()
+
+        samples = reader()
+        if not self._columnar:
+            samples = list(samples)
+        subset = ColumnarSubset.from_samples(samples, self.annotation_cls)
+        save_columnar_subset(cache_pth, subset, fingerprint, self.dset_folder)
+        return subset if self._columnar else samples
+
+    def _map_files(
+        self, func: Callable[..., T], *iterables: Iterable[Any]
+    ) -> List[T]:
+        """Apply a parsing function to files of a subset.
+
+        If the dataset has more than one worker the files are parsed
+        concurrently. Results always keep the order of the files.
+        With processes `func` must be picklable, so it should be a module
+        level function or a static method.
+
+        Parameters
+        ----------
+        func : Callable[..., T]
+            A function that parses one file.
+        *iterables : Iterable[Any]
+            Arguments of the function as for `map`.
+
+        Returns
+        -------
+        List[T]
+            The parsing results in order of the arguments.
+        """
+        if self._num_workers <= 1:
+            return list(map(func, *iterables))
+        iterables = [list(iterable) for iterable in iterables]
+        if self._use_processes:
+            # Send files in chunks to reduce interprocess communication
+            chunksize = max(
+                1, len(iterables[0]) // (self._num_workers * 4))
+            with ProcessPoolExecutor(self._num_workers) as executor:
+                return list(executor.map(func, *iterables,
+                                         chunksize=chunksize))
+        with ThreadPoolExecutor(self._num_workers) as executor:
+            return list(executor.map(func, *iterables))
+
+    def __getitem__(
+        self, set_name: str
+    ) -> Union[List[BaseObjectDetectionSample], ColumnarSubset]:
+        if set_name not in self._subsets:
+            if set_name not in self._subsets_readers:
+                raise KeyError(
+                    f'Available sets: {self.get_subsets_names()}.')
+            self._subsets[set_name] = self._read_subset(set_name)
+        return self._subsets[set_name]
         
+    def iter_subset(
+        self, set_name: str
+    ) -> Iterator[BaseObjectDetectionSample]:
+        """Iterate over samples of a subset without storing the subset.
+
+        If the subset is not read yet, samples come straight from its reader.
+        With streaming readers it lets single-pass jobs go over large subsets
+        with flat memory usage.
+
+        Parameters
+        ----------
+        set_name : str
+            A name of the subset.
+
+        Yields
+        ------
+        BaseObjectDetectionSample
+            The next sample of the subset.
+        """
+        if set_name in self._subsets:
+            yield from self._subsets[set_name]
+        elif set_name in self._subsets_readers:
+            reader, _ = self._subsets_readers[set_name]
+            yield from reader()
+        else:
+            raise KeyError(f'Available sets: {self.get_subsets_names()}.')
+
     def get_subsets_names(self) -> List[str]:
         """Get names of all subsets.
 
+        Subsets are not read by this call.
+
         Returns
         -------
         List[str]
             A list containing the names of the subsets.
         """
-        return list(self._subsets.keys())
+        return list(self._subsets_readers.keys())
         
     def get_labels_names(self) -> List[str]:
         """Get all labels names from this dataset.
 
         First call of this function may take some time.
+        The found labels are cached until a new subset is registered.
 
         Returns
         -------
@@ -142,19 +605,37 @@ class BaseObjectDetectionDataset:
         """
         if self._labels is not None:
             return self._labels
-        # Iterate over whole dataset and collect all different labels
-        labels = set()
-        for subset in self._subsets.values():
+        # Collect codes of all used labels and look them up in vocabulary
+        codes = set()
+        for set_name in self.get_subsets_names():
+            subset = self[set_name]
+            if isinstance(subset, ColumnarSubset):
+                codes.update(subset.get_labels_codes())
+                continue
             for sample in subset:
-                for annot in sample.get_annotations():
-                    labels.add(annot.label)
-        return list(labels)
+                codes.update(annot.label_code
+                             for annot in sample.get_annotations())
+        self._labels = self.annotation_cls.labels_vocab.decode_many(
+            sorted(codes))
+        return self._labels
         
     def save_as_cvat(
-        self, save_pth: Path, verbose: bool = False, copy_images: bool = False
+        self,
+        save_pth: Path,
+        verbose: bool = False,
+        copy_images: bool = False,
+        images_mode: str = 'copy',
+        num_workers: int = SAVE_WORKERS,
+        incremental: bool = True
     ):
         """Save the dataset in CVAT format to a specified directory.
 
+        Annotations files of subsets and images are saved on a thread pool.
+        The export is recorded in a manifest file in the save directory,
+        and a repeated export saves only the files that have changed since.
+        It also removes files of the subsets and the images that are not
+        in the dataset anymore.
+
         Parameters
         ----------
         save_pth : Path
@@ -164,21 +645,116 @@ class BaseObjectDetectionDataset:
         copy_images : bool, optional
             Whether to copy images from original dataset to new CVAT.
             By default is `False`.
+        images_mode : str, optional
+            How to put images to the new CVAT dataset: `"copy"`,
+            `"hardlink"`, `"reflink"` or `"symlink"`. Links make saving
+            almost free when the directories are on the same file system.
+            By default is `"copy"`.
+        num_workers : int, optional
+            A number of threads to save files with. `0` means saving
+            in the current thread. By default is `SAVE_WORKERS`,
+            that is up to 4.
+        incremental : bool, optional
+            Whether to skip files that are up to date according to
+            the manifest of the previous export and to remove files that
+            are not in the dataset anymore. By default is `True`.
         """
         if isinstance(save_pth, str):
             save_pth = Path(save_pth)
+        if images_mode not in MATERIALIZE_MODES:
+            raise ValueError(f'Unknown images mode "{images_mode}", '
+                             f'expected one of {MATERIALIZE_MODES}.')
         labels = self.get_labels_names()
-        for subset_name, subset in self._subsets.items():
+        manifest_pth = save_pth / MANIFEST_NAME
+        old_manifest = (load_export_manifest(manifest_pth)
+                        if incremental else {})
+        manifest: Dict[str, Dict[str, Any]] = {}
+
+        # Every job saves one file
+        jobs: List[Callable[[], None]] = []
+        n_files = 0
+        for subset_name in self.get_subsets_names():
+            subset = self[subset_name]
             subset_dir = save_pth / subset_name
             
             images_pth = subset_dir / 'images'
             annot_pth = subset_dir / 'annotations.xml'
             images_pth.mkdir(parents=True, exist_ok=True)
 
-            create_cvat_object_detection_xml(annot_pth, subset, subset_name,
-                                             labels, verbose)
-            if copy_images:
-                for sample in subset:
-                    src_pth = sample.get_image_path()
-                    dst_pth = images_pth / src_pth.name
-                    shutil.copy2(src_pth, dst_pth)
+            old_record = old_manifest.get(subset_name, {})
+            old_images = old_record.get('images', {})
+            # Images of another mode are made again and replace the old ones
+            mode_changed = old_record.get('images_mode') != images_mode
+            images = {}
+            samples_digests = []
+            for sample in subset:
+                src_pth = sample.get_image_path()
+                stamp = file_stamp(src_pth)
+                samples_digests.append(sample_digest(sample, stamp))
+                dst_pth = images_pth / src_pth.name
+                if not copy_images:
+                    # Images of a previous export are kept as they are
+                    if dst_pth.name in old_images:
+                        images[dst_pth.name] = old_images[dst_pth.name]
+                    continue
+                images[dst_pth.name] = {
+                    'source': str(src_pth.resolve()),
+                    'stamp': stamp,
+                    'mode': images_mode
+                }
+                n_files += 1
+                if (mode_changed or
+                        old_images.get(dst_pth.name) != images[dst_pth.name] or
+                        not (dst_pth.exists() or dst_pth.is_symlink())):
+                    jobs.append(partial(materialize_file, src_pth, dst_pth,
+                                        images_mode))
+            # Remove images of the samples that are not in the subset anymore
+            for name in old_images.keys() - images.keys():
+                (images_pth / name).unlink(missing_ok=True)
+
+            annots_digest = subset_digest(subset_name, labels, samples_digests)
+            n_files += 1
+            if (old_record.get('annotations') != annots_digest or
+                    not annot_pth.exists()):
+                jobs.append(partial(create_cvat_object_detection_xml,
+                                    annot_pth, subset, subset_name, labels))
+            manifest[subset_name] = {
+                'annotations': annots_digest,
+                'samples': samples_digests,
+                'images_mode': (images_mode if copy_images
+                                else old_record.get('images_mode')),
+                'images': images
+            }
+
+        # Remove files of the subsets that are not in the dataset anymore
+        for subset_name in old_manifest.keys() - manifest.keys():
+            subset_dir = save_pth / subset_name
+            for name in old_manifest[subset_name].get('images', {}):
+                (subset_dir / 'images' / name).unlink(missing_ok=True)
+            (subset_dir / 'annotations.xml').unlink(missing_ok=True)
+            for empty_dir in (subset_dir / 'images', subset_dir):
+                if empty_dir.is_dir() and not any(empty_dir.iterdir()):
+                    empty_dir.rmdir()
+
+        if verbose:
+            print(f'{n_files - len(jobs)} of {n_files} files are up to date')
+        if num_workers > 0:
+            with ThreadPoolExecutor(num_workers) as executor:
+                futures = [executor.submit(job) for job in jobs]
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    if verbose:
+                        self._print_progress(done, len(jobs))
+        else:
+            for done, job in enumerate(jobs, 1):
+                job()
+                if verbose:
+                    self._print_progress(done, len(jobs))
+        save_pth.mkdir(parents=True, exist_ok=True)
+        save_export_manifest(manifest_pth, manifest)
+
+    @staticmethod
+    def _print_progress(done: int, total: int) -> None:
+        """Print a number of saved files in place."""
+        end = '\n' if done == total else ''
+        print(f'\rSaved {done}/{total} files', end=end, flush=True)
@@ -0,0 +1,340 @@
+"""Columnar storage for object detection subsets.
+
+Instead of keeping a python object for every bounding box, a columnar subset
+keeps all boxes of the subset in a few contiguous numpy arrays: `(N, 4)`
+coordinates, label and text code columns, per-sample offsets and,
+for oriented boxes, `(N, 4, 2)` corners.
+Labels and texts are stored as codes of the annotation class vocabularies.
+Other scalar attributes of a dataset's annotations, e.g. `difficult`
+of MSRA TD500, are kept in extra columns.
+Samples and annotations are built lazily on access, so the code that works
+with ordinary samples lists does not notice the difference.
+"""
+
+
+from __future__ import annotations
+from array import array
+from pathlib import Path
+from typing import (
+    Dict, Iterable, Iterator, List, Optional, Type, Union, TYPE_CHECKING)
+
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.data_utils.datasets.vocabulary import Vocabulary
+from utils.numpy_utils.numpy_functions import rectangles_to_quads
+
+if TYPE_CHECKING:
+    from utils.data_utils.datasets import (
+        BaseObjectDetectionAnnotation, BaseObjectDetectionSample)
+
+
+# Attributes of annotations that are kept in the main columns
+_BASE_FIELDS = frozenset(
+    ('x1', 'y1', 'x2', 'y2', 'label_code', 'text_code', 'points'))
+
+
+class ColumnarAnnotations:
+    """A lazy list-like view of one sample's annotations in a subset.
+
+    Annotation objects are created on access and are not kept.
+    Assigning an annotation to an index writes it back to the subset columns.
+    """
+
+    def __init__(self, subset: ColumnarSubset, sample_idx: int) -> None:
+        self._subset = subset
+        self._sample_idx = sample_idx
+
+    def _bounds(self) -> range:
+        offsets = self._subset.offsets
+        return range(int(offsets[self._sample_idx]),
+                     int(offsets[self._sample_idx + 1]))
+
+    def __len__(self) -> int:
+        return len(self._bounds())
+
+    def __getitem__(
+        self, idx: Union[int, slice]
+    ) -> Union[BaseObjectDetectionAnnotation,
+               List[BaseObjectDetectionAnnotation]]:
+        rows = self._bounds()[idx]
+        if isinstance(idx, slice):
+            return [self._subset.get_annotation(row) for row in rows]
+        return self._subset.get_annotation(rows)
+
+    def __setitem__(
+        self, idx: int, annot: BaseObjectDetectionAnnotation
+    ) -> None:
+        self._subset.set_annotation(self._bounds()[idx], annot)
+
+    def __iter__(self) -> Iterator[BaseObjectDetectionAnnotation]:
+        for row in self._bounds():
+            yield self._subset.get_annotation(row)
+
+    def get_bboxes(self) -> NDArray:
+        """Get the sample's bounding boxes without creating annotations.
+
+        Returns
+        -------
+        NDArray
+            A view of the subset coordinates with shape `(n_boxes, 4)`
+            in `xyxy` format.
+        """
+        rows = self._bounds()
+        return self._subset.bboxes[rows.start:rows.stop]
+
+    def get_labels(self) -> List[str]:
+        """Get the sample's labels without creating annotations.
+
+        Returns
+        -------
+        List[str]
+            The labels of the sample's bounding boxes.
+        """
+        rows = self._bounds()
+        return self._subset.labels_vocab.decode_many(
+            self._subset.labels[rows.start:rows.stop].tolist())
+
+    def has_oriented_boxes(self) -> bool:
+        """Check whether the subset keeps corners of boxes.
+
+        Returns
+        -------
+        bool
+            Whether there are oriented boxes.
+        """
+        return self._subset.quads is not None
+
+    def get_quads(self) -> NDArray:
+        """Get the sample's boxes as quadrilaterals.
+
+        Returns
+        -------
+        NDArray
+            The quadrilaterals with shape `(n_boxes, 4, 2)`.
+        """
+        rows = self._bounds()
+        if self._subset.quads is None:
+            return rectangles_to_quads(self.get_bboxes())
+        return self._subset.quads[rows.start:rows.stop]
+
+
+class ColumnarSubset:
+    """A subset of samples stored as contiguous numpy columns.
+
+    Annotations of the sample `i` occupy rows
+    `offsets[i]:offsets[i + 1]` of `bboxes`, `labels` and `texts` arrays.
+    Labels and texts are stored as codes of `labels_vocab` and `texts_vocab`
+    of the annotation class. A text code `-1` means that an annotation
+    has no text. If some annotations have corners of oriented boxes,
+    `quads` keeps corners of all boxes, otherwise it is `None`.
+    `extras` maps names of other attributes of annotations to columns
+    of their values.
+
+    Annotations are created as instances of `annotation_cls` through
+    its `__setstate__`, so subclasses with their own constructors
+    are restored too.
+    """
+
+    def __init__(
+        self,
+        img_pths: List[Path],
+        bboxes: NDArray,
+        labels: NDArray,
+        texts: NDArray,
+        offsets: NDArray,
+        sample_cls: Type[BaseObjectDetectionSample],
+        annotation_cls: Type[BaseObjectDetectionAnnotation],
+        quads: Optional[NDArray] = None,
+        extras: Optional[Dict[str, NDArray]] = None
+    ) -> None:
+        self.img_pths = img_pths
+        self.bboxes = bboxes
+        self.labels = labels
+        self.texts = texts
+        self.offsets = offsets
+        self.quads = quads
+        self.extras: Dict[str, NDArray] = {} if extras is None else extras
+        self.labels_vocab: Vocabulary = annotation_cls.labels_vocab
+        self.texts_vocab: Optional[Vocabulary] = getattr(
+            annotation_cls, 'texts_vocab', None)
+        self._sample_cls = sample_cls
+        self._annotation_cls = annotation_cls
+
+    @classmethod
+    def from_samples(
+        cls,
+        samples: Iterable[BaseObjectDetectionSample],
+        annotation_cls: Type[BaseObjectDetectionAnnotation]
+    ) -> ColumnarSubset:
+        """Pack samples into columnar storage.
+
+        Samples are consumed one by one, so a generator can be passed
+        to avoid keeping all annotation objects in memory.
+        All annotations must have the same attributes.
+
+        Parameters
+        ----------
+        samples : Iterable[BaseObjectDetectionSample]
+            The samples to pack.
+        annotation_cls : Type[BaseObjectDetectionAnnotation]
+            An annotation class that is created on access to annotations.
+
+        Returns
+        -------
+        ColumnarSubset
+            The packed subset.
+
+        Raises
+        ------
+        ValueError
+            Annotations have different attributes.
+        """
+        from utils.data_utils.datasets import BaseObjectDetectionSample
+
+        img_pths: List[Path] = []
+        coords = array('i')
+        labels = array('i')
+        texts = array('i')
+        offsets = array('q', [0])
+        oriented_points: Dict[int, NDArray] = {}
+        extras: Optional[Dict[str, list]] = None
+        sample_cls = BaseObjectDetectionSample
+        for sample in samples:
+            sample_cls = type(sample)
+            img_pths.append(sample.get_image_path())
+            for annot in sample.get_annotations():
+                bbox = (int(annot.x1), int(annot.y1),
+                        int(annot.x2), int(annot.y2))
+                coords.extend(bbox)
+                points = getattr(annot, 'points', None)
+                if points is not None:
+                    oriented_points[len(labels)] = points
+                labels.append(annot.label_code)
+                texts.append(getattr(annot, 'text_code', -1))
+                fields = {name: value for name, value in vars(annot).items()
+                          if name not in _BASE_FIELDS}
+                if extras is None:
+                    extras = {name: [] for name in fields}
+                elif fields.keys() != extras.keys():
+                    raise ValueError(
+                        'Annotations of the subset have different attributes.')
+                for name, value in fields.items():
+                    extras[name].append(value)
+            offsets.append(len(labels))
+
+        bboxes = np.frombuffer(coords, dtype=np.int32).reshape(-1, 4).copy()
+        quads = None
+        if len(oriented_points) != 0:
+            quads = rectangles_to_quads(bboxes)
+            for row, points in oriented_points.items():
+                quads[row] = points
+        return cls(
+            img_pths,
+            bboxes,
+            np.frombuffer(labels, dtype=np.int32).copy(),
+            np.frombuffer(texts, dtype=np.int32).copy(),
+            np.frombuffer(offsets, dtype=np.int64).copy(),
+            sample_cls,
+            annotation_cls,
+            quads,
+            {name: np.array(values) for name, values
+             in (extras or {}).items()})
+
+    def __len__(self) -> int:
+        return len(self.img_pths)
+
+    def __getitem__(self, idx: int) -> BaseObjectDetectionSample:
+        idx = range(len(self))[idx]
+        return self._sample_cls(
+            self.img_pths[idx], ColumnarAnnotations(self, idx))
+
+    def __iter__(self) -> Iterator[BaseObjectDetectionSample]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_samples(self) -> List[BaseObjectDetectionSample]:
+        """Unpack the subset into samples with ordinary annotations lists.
+
+        Returns
+        -------
+        List[BaseObjectDetectionSample]
+            The samples of the subset.
+        """
+        return [self._sample_cls(sample.get_image_path(),
+                                 list(sample.get_annotations()))
+                for sample in self]
+
+    def get_annotation(self, row: int) -> BaseObjectDetectionAnnotation:
+        """Create an annotation object from a row of the columns.
+
+        Parameters
+        ----------
+        row : int
+            A row index in the subset columns.
+
+        Returns
+        -------
+        BaseObjectDetectionAnnotation
+            The created annotation.
+        """
+        x1, y1, x2, y2 = self.bboxes[row].tolist()
+        state = {
+            'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2,
+            'label': self.labels_vocab.decode(self.labels[row]),
+            'points': None if self.quads is None else self.quads[row].copy()
+        }
+        if self.texts_vocab is not None:
+            text_code = self.texts[row]
+            state['text'] = ('' if text_code == -1
+                             else self.texts_vocab.decode(text_code))
+        for name, column in self.extras.items():
+            state[name] = column[row].item()
+        annot = self._annotation_cls.__new__(self._annotation_cls)
+        annot.__setstate__(state)
+        return annot
+
+    def set_annotation(
+        self, row: int, annot: BaseObjectDetectionAnnotation
+    ) -> None:
+        """Write an annotation to a row of the columns.
+
+        Parameters
+        ----------
+        row : int
+            A row index in the subset columns.
+        annot : BaseObjectDetectionAnnotation
+            The annotation to write.
+        """
+        self.bboxes[row] = (annot.x1, annot.y1, annot.x2, annot.y2)
+        if self.quads is not None:
+            points = getattr(annot, 'points', None)
+            self.quads[row] = (rectangles_to_quads(self.bboxes[row])[0]
+                               if points is None else points)
+        self.labels[row] = self.labels_vocab.encode(annot.label)
+        text: Optional[str] = getattr(annot, 'text', None)
+        self.texts[row] = (
+            -1 if text is None or self.texts_vocab is None
+            else self.texts_vocab.encode(text))
+        for name, column in self.extras.items():
+            column[row] = getattr(annot, name)
+
+    def get_labels_codes(self) -> List[int]:
+        """Get codes of labels that are used in this subset.
+
+        Returns
+        -------
+        List[int]
+            The sorted labels codes.
+        """
+        return np.unique(self.labels).tolist()
+
+    def get_labels_names(self) -> List[str]:
+        """Get labels that are used in this subset.
+
+        Returns
+        -------
+        List[str]
+            The labels names.
+        """
+        return self.labels_vocab.decode_many(self.get_labels_codes())
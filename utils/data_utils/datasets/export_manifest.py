@@ -0,0 +1,139 @@
+"""A manifest of an exported CVAT dataset.
+
+The manifest is saved next to the exported subsets and records what every
+file was made from: a digest of each subset's annotations and the path,
+size and modification time of each exported image. A repeated export
+compares the dataset with the manifest and saves only the changed files.
+"""
+
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from utils.data_utils.datasets import BaseObjectDetectionSample
+
+
+MANIFEST_NAME = 'export_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def file_stamp(pth: Path) -> List[int]:
+    """Get a size and a modification time of a file.
+
+    Parameters
+    ----------
+    pth : Path
+        A path to the file.
+
+    Returns
+    -------
+    List[int]
+        The size and the modification time in nanoseconds.
+    """
+    stat = os.stat(pth)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def sample_digest(
+    sample: BaseObjectDetectionSample, image_stamp: Sequence[int]
+) -> str:
+    """Get a digest of everything a sample writes to an annotations file.
+
+    The image's stamp is included because the image size
+    is written to the annotations file too.
+
+    Parameters
+    ----------
+    sample : BaseObjectDetectionSample
+        The sample.
+    image_stamp : Sequence[int]
+        The size and the modification time of the sample's image.
+
+    Returns
+    -------
+    str
+        The hex digest of the sample.
+    """
+    digest = hashlib.sha1()
+    size, mtime = image_stamp
+    digest.update(
+        f'{sample.get_image_path().name}|{size}|{mtime}\n'.encode())
+    for annot in sample.get_annotations():
+        digest.update(f'{annot.label}|{annot.x1}|{annot.y1}|'
+                      f'{annot.x2}|{annot.y2}\n'.encode())
+    return digest.hexdigest()
+
+
+def subset_digest(
+    subset_name: str, labels: List[str], samples_digests: List[str]
+) -> str:
+    """Get a digest of a subset's annotations file.
+
+    Parameters
+    ----------
+    subset_name : str
+        A name of the subset.
+    labels : List[str]
+        Labels of the whole dataset that are written to the file's meta.
+    samples_digests : List[str]
+        Digests of the subset's samples in order.
+
+    Returns
+    -------
+    str
+        The hex digest of the subset.
+    """
+    digest = hashlib.sha1(json.dumps([subset_name, labels]).encode())
+    for sample_hash in samples_digests:
+        digest.update(sample_hash.encode())
+    return digest.hexdigest()
+
+
+def load_export_manifest(manifest_pth: Path) -> Dict[str, Dict[str, Any]]:
+    """Load subsets' records of a manifest.
+
+    Parameters
+    ----------
+    manifest_pth : Path
+        A path to the manifest file.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        The records of subsets by their names. It is empty when there is no
+        manifest or it has another version.
+    """
+    if not manifest_pth.exists():
+        return {}
+    with open(manifest_pth, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest['subsets']
+
+
+def save_export_manifest(
+    manifest_pth: Path, subsets: Dict[str, Dict[str, Any]]
+) -> None:
+    """Save subsets' records to a manifest.
+
+    The manifest is written to a temporary file and then moved,
+    so an interrupted export never leaves a broken manifest.
+
+    Parameters
+    ----------
+    manifest_pth : Path
+        A path to the manifest file.
+    subsets : Dict[str, Dict[str, Any]]
+        The records of subsets by their names.
+    """
+    tmp_pth = manifest_pth.with_name(f'{manifest_pth.name}.tmp{os.getpid()}')
+    with open(tmp_pth, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'subsets': subsets}, f,
+                  ensure_ascii=False)
+    os.replace(tmp_pth, manifest_pth)
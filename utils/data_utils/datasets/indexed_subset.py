@@ -0,0 +1,44 @@
+"""A subset which samples are parsed on access from an indexed xml file."""
+
+
+from __future__ import annotations
+from typing import Callable, Dict, Iterator, TYPE_CHECKING
+import xml.etree.ElementTree as ET
+
+from utils.xml_utils.xml_index import XmlElementsIndex
+
+if TYPE_CHECKING:
+    from utils.data_utils.datasets import BaseObjectDetectionSample
+
+
+class IndexedSubset:
+    """A subset that parses its samples from an xml file on access.
+
+    Opening the subset costs only loading the file's `XmlElementsIndex`.
+    Getting a sample reads and parses only the sample's element.
+    Parsed samples are kept, so changes made to them are not lost.
+    """
+
+    def __init__(
+        self,
+        index: XmlElementsIndex,
+        parse_sample: Callable[[ET.Element], BaseObjectDetectionSample]
+    ) -> None:
+        self._index = index
+        self._parse_sample = parse_sample
+        self._samples: Dict[int, BaseObjectDetectionSample] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, idx: int) -> BaseObjectDetectionSample:
+        idx = range(len(self))[idx]
+        sample = self._samples.get(idx)
+        if sample is None:
+            sample = self._parse_sample(self._index.get_element(idx))
+            self._samples[idx] = sample
+        return sample
+
+    def __iter__(self) -> Iterator[BaseObjectDetectionSample]:
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,196 @@
+"""Persistent binary cache of parsed dataset subsets.
+
+A parsed subset is saved as a directory with `.npy` columns of
+`ColumnarSubset`, including its extra columns of annotations' attributes,
+and a `meta.json` file with image paths and string tables.
+Image paths are kept relative to the dataset's directory and are joined
+with it on loading, so the cache does not depend on the working directory.
+The cache is valid while the subset's source files keep their paths, sizes
+and modification times. The numeric columns are memory-mapped on loading,
+so reopening a large subset does not read it into memory at once.
+"""
+
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Iterable, List, Optional, Tuple, Type, TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.data_utils.datasets.columnar_annotations import ColumnarSubset
+from utils.data_utils.datasets.vocabulary import Vocabulary
+
+if TYPE_CHECKING:
+    from utils.data_utils.datasets import (
+        BaseObjectDetectionAnnotation, BaseObjectDetectionSample)
+
+
+CACHE_VERSION = 4
+
+
+def sources_fingerprint(sources: Iterable[Path]) -> str:
+    """Get a fingerprint of files based on their paths, sizes and mtimes.
+
+    Parameters
+    ----------
+    sources : Iterable[Path]
+        Paths to the source files or directories.
+
+    Returns
+    -------
+    str
+        The hex digest of the sources' fingerprint.
+    """
+    digest = hashlib.sha1(str(CACHE_VERSION).encode())
+    for src_pth in sources:
+        stat = os.stat(src_pth)
+        digest.update(
+            f'{Path(src_pth).resolve()}|{stat.st_size}|{stat.st_mtime_ns}\n'
+            .encode())
+    return digest.hexdigest()
+
+
+def _compact_codes(
+    codes: NDArray, vocab: Optional[Vocabulary]
+) -> Tuple[NDArray, List[Optional[str]]]:
+    """Replace process-wide vocabulary codes with codes of a local table.
+
+    The code `-1` (no value) is kept in the table as `None`.
+    """
+    used, local_codes = np.unique(codes, return_inverse=True)
+    table = [None if code == -1 else vocab.decode(code)
+             for code in used.tolist()]
+    return local_codes.astype(np.int32).reshape(-1), table
+
+
+def _expand_codes(
+    local_codes: NDArray,
+    table: List[Optional[str]],
+    vocab: Optional[Vocabulary]
+) -> NDArray:
+    """Map codes of a local table back to process-wide vocabulary codes."""
+    remap = np.array([-1 if value is None or vocab is None
+                      else vocab.encode(value) for value in table],
+                     dtype=np.int32)
+    if np.array_equal(remap, np.arange(len(remap))):
+        # Codes are the same, so a memory-mapped column can be kept
+        return local_codes
+    return remap[local_codes]
+
+
+def _relative_path(pth: Path, root: Path) -> str:
+    """Get a path relative to the root or an absolute one outside it."""
+    try:
+        return str(Path(pth).relative_to(root))
+    except ValueError:
+        return str(Path(pth).absolute())
+
+
+def save_columnar_subset(
+    cache_pth: Path, subset: ColumnarSubset, fingerprint: str, root: Path
+) -> None:
+    """Save a columnar subset to a cache directory.
+
+    The directory is written next to the destination and then moved,
+    so an interrupted save never leaves a half-written cache.
+
+    Parameters
+    ----------
+    cache_pth : Path
+        A path to the cache directory of the subset.
+    subset : ColumnarSubset
+        The subset to save.
+    fingerprint : str
+        The fingerprint of the subset's sources.
+    root : Path
+        The dataset's directory that image paths are saved relative to.
+    """
+    labels, labels_table = _compact_codes(subset.labels, subset.labels_vocab)
+    texts, texts_table = _compact_codes(subset.texts, subset.texts_vocab)
+    meta = {
+        'version': CACHE_VERSION,
+        'fingerprint': fingerprint,
+        'img_pths': [_relative_path(pth, root) for pth in subset.img_pths],
+        'labels': labels_table,
+        'texts': texts_table,
+        'extras': list(subset.extras)
+    }
+
+    tmp_pth = cache_pth.with_name(f'{cache_pth.name}.tmp{os.getpid()}')
+    if tmp_pth.exists():
+        shutil.rmtree(tmp_pth)
+    tmp_pth.mkdir(parents=True)
+    np.save(tmp_pth / 'bboxes.npy', subset.bboxes)
+    np.save(tmp_pth / 'labels.npy', labels)
+    np.save(tmp_pth / 'texts.npy', texts)
+    np.save(tmp_pth / 'offsets.npy', subset.offsets)
+    if subset.quads is not None:
+        np.save(tmp_pth / 'quads.npy', subset.quads)
+    for name, column in subset.extras.items():
+        np.save(tmp_pth / f'extra_{name}.npy', column)
+    with open(tmp_pth / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    if cache_pth.exists():
+        shutil.rmtree(cache_pth)
+    os.replace(tmp_pth, cache_pth)
+
+
+def load_columnar_subset(
+    cache_pth: Path,
+    fingerprint: str,
+    sample_cls: Type[BaseObjectDetectionSample],
+    annotation_cls: Type[BaseObjectDetectionAnnotation],
+    root: Path
+) -> Optional[ColumnarSubset]:
+    """Load a columnar subset from a cache directory if the cache is valid.
+
+    Parameters
+    ----------
+    cache_pth : Path
+        A path to the cache directory of the subset.
+    fingerprint : str
+        The current fingerprint of the subset's sources.
+    sample_cls : Type[BaseObjectDetectionSample]
+        A sample class of the subset.
+    annotation_cls : Type[BaseObjectDetectionAnnotation]
+        An annotation class of the subset.
+    root : Path
+        The dataset's directory that image paths are joined with.
+
+    Returns
+    -------
+    Optional[ColumnarSubset]
+        The loaded subset or `None` when there is no valid cache.
+    """
+    meta_pth = cache_pth / 'meta.json'
+    if not meta_pth.exists():
+        return None
+    with open(meta_pth, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if (meta.get('version') != CACHE_VERSION or
+            meta.get('fingerprint') != fingerprint):
+        return None
+
+    # Copy-on-write mapping lets edits change the arrays but not the cache
+    bboxes = np.load(cache_pth / 'bboxes.npy', mmap_mode='c')
+    offsets = np.load(cache_pth / 'offsets.npy', mmap_mode='c')
+    labels = np.load(cache_pth / 'labels.npy', mmap_mode='c')
+    texts = np.load(cache_pth / 'texts.npy', mmap_mode='c')
+    quads = None
+    if (cache_pth / 'quads.npy').exists():
+        quads = np.load(cache_pth / 'quads.npy', mmap_mode='c')
+    extras = {name: np.load(cache_pth / f'extra_{name}.npy', mmap_mode='c')
+              for name in meta['extras']}
+    labels = _expand_codes(labels, meta['labels'], annotation_cls.labels_vocab)
+    texts = _expand_codes(texts, meta['texts'],
+                          getattr(annotation_cls, 'texts_vocab', None))
+    return ColumnarSubset(
+        [root / pth for pth in meta['img_pths']],
+        bboxes, labels, texts, offsets, sample_cls, annotation_cls, quads,
+        extras)
@@ -0,0 +1,88 @@
+"""Interning tables for strings that repeat across annotations.
+
+Labels and words repeat over and over in a dataset, so annotations keep
+small integer codes and the strings themselves are stored once
+in a shared `Vocabulary`.
+"""
+
+
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List
+
+
+class Vocabulary:
+    """A table that maps strings to small integer codes and back.
+
+    Codes are assigned in order of the first appearance of strings
+    and never change.
+    """
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self._values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._lock = Lock()
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._codes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def encode(self, value: str) -> int:
+        """Get a code of a string, adding the string if it is new.
+
+        Parameters
+        ----------
+        value : str
+            The string to encode.
+
+        Returns
+        -------
+        int
+            The code of the string.
+        """
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self._values)
+                    self._values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def decode(self, code: int) -> str:
+        """Get a string by its code.
+
+        Parameters
+        ----------
+        code : int
+            The code of the string.
+
+        Returns
+        -------
+        str
+            The decoded string.
+        """
+        return self._values[code]
+
+    def decode_many(self, codes: Iterable[int]) -> List[str]:
+        """Get strings by their codes.
+
+        Parameters
+        ----------
+        codes : Iterable[int]
+            The codes of the strings.
+
+        Returns
+        -------
+        List[str]
+            The decoded strings.
+        """
+        values = self._values
+        return [values[code] for code in codes]
@@ -0,0 +1,88 @@
+"""A module that contain functions for working with files."""
+
+
+import errno
+import os
+from pathlib import Path
+import shutil
+from typing import Union
+
+
+# Linux ioctl that shares extents of one file with another
+FICLONE = 0x40049409
+
+MATERIALIZE_MODES = ('copy', 'hardlink', 'reflink', 'symlink')
+
+
+def materialize_file(
+    src_pth: Union[Path, str], dst_pth: Union[Path, str], mode: str = 'copy'
+) -> None:
+    """Make a file available at a new path.
+
+    Hard links and reflinks fall back to copying when the file system
+    does not support them or the paths are on different devices.
+    An existing destination file is replaced.
+
+    Parameters
+    ----------
+    src_pth : Union[Path, str]
+        A path to the source file.
+    dst_pth : Union[Path, str]
+        A path where the file should appear.
+    mode : str, optional
+        How to make the file: `"copy"`, `"hardlink"`, `"reflink"`
+        (a copy-on-write clone) or `"symlink"`. By default is `"copy"`.
+
+    Raises
+    ------
+    ValueError
+        Unknown mode.
+    """
+    src_pth = Path(src_pth)
+    dst_pth = Path(dst_pth)
+    if mode not in MATERIALIZE_MODES:
+        raise ValueError(
+            f'Unknown mode "{mode}", expected one of {MATERIALIZE_MODES}.')
+    if dst_pth.is_symlink() or dst_pth.exists():
+        if (mode == 'hardlink' and not dst_pth.is_symlink() and
+                os.path.samefile(src_pth, dst_pth)):
+            return
+        # A link is removed, so a copy is not written through it
+        # into the source file
+        dst_pth.unlink()
+
+    if mode == 'copy':
+        shutil.copy2(src_pth, dst_pth)
+    elif mode == 'symlink':
+        os.symlink(src_pth.resolve(), dst_pth)
+    elif mode == 'hardlink':
+        try:
+            os.link(src_pth, dst_pth)
+        except OSError:
+            shutil.copy2(src_pth, dst_pth)
+    elif not _reflink(src_pth, dst_pth):
+        shutil.copy2(src_pth, dst_pth)
+
+
+def _reflink(src_pth: Path, dst_pth: Path) -> bool:
+    """Clone a file with shared extents, return whether it succeeded."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src_pth, 'rb') as src, open(dst_pth, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError as err:
+            if err.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV,
+                             errno.EINVAL, errno.EBADF, errno.ENOSYS):
+                cloned = False
+            else:
+                raise
+        else:
+            cloned = True
+    if cloned:
+        shutil.copystat(src_pth, dst_pth)
+    else:
+        dst_pth.unlink()
+    return cloned
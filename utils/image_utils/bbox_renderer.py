@@ -0,0 +1,140 @@
+"""A fast renderer of bounding boxes and their labels."""
+
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.numpy_utils.numpy_functions import rectangles_to_quads
+
+
+class BboxRenderer:
+    """A renderer that draws all bounding boxes in batches.
+
+    Edges of all boxes are drawn with a single `cv2.polylines` call
+    and texts of labels are made once per label. The result is the same
+    as `draw_bounding_boxes` draws, except that all edges are drawn
+    before all texts.
+    """
+
+    def __init__(
+        self,
+        line_width: int = 1,
+        color: Tuple[int, int, int] = (255, 255, 255),
+        font_scale: float = 0.3
+    ) -> None:
+        """Create a renderer.
+
+        Parameters
+        ----------
+        line_width : int, optional
+            A width of the bounding boxes' lines. By default is `1`.
+        color : Tuple[int, int, int], optional
+            A color of the bounding boxes and texts in RGB.
+            By default is `(255, 255, 255)`.
+        font_scale : float, optional
+            A scale of the labels' font. By default is `0.3`.
+        """
+        self.line_width = line_width
+        self.color = color
+        self.font_scale = font_scale
+
+    def render(
+        self,
+        image: NDArray,
+        bboxes: Union[Sequence[Sequence[float]], NDArray],
+        class_labels: Optional[List[Union[str, int, float]]] = None,
+        confidences: Optional[List[float]] = None,
+        exclude_classes: Optional[List[Union[str, int, float]]] = None,
+        out: Optional[NDArray] = None
+    ) -> NDArray:
+        """Draw bounding boxes and corresponding labels on an image.
+
+        Parameters
+        ----------
+        image : NDArray
+            The given image with shape `(h, w, c)` or `(h, w)`.
+        bboxes : Union[Sequence[Sequence[float]], NDArray]
+            The bounding boxes with shape `(n_boxes, 4)` in `xyxy` format
+            or quadrilaterals with shape `(n_boxes, 4, 2)`.
+        class_labels : Optional[List[Union[str, int, float]]], optional
+            Bounding boxes' labels. By default is `None`.
+        confidences : Optional[List[float]], optional
+            Bounding boxes' confidences. By default is `None`.
+        exclude_classes : Optional[List[Union[str, int, float]]], optional
+            Classes which bounding boxes won't be showed.
+            By default is `None`.
+        out : Optional[NDArray], optional
+            A buffer with the image's shape and type to draw on.
+            The image is copied to it unless it is the image itself,
+            then the boxes are drawn in place. By default is `None`,
+            that means drawing on a new copy of the image.
+
+        Returns
+        -------
+        NDArray
+            The image with drawn bounding boxes.
+        """
+        if out is None:
+            out = image.copy()
+        elif out is not image:
+            np.copyto(out, image)
+
+        bboxes = np.asarray(bboxes)
+        if bboxes.ndim == 3:
+            quads = bboxes.astype(np.int32)
+        else:
+            # Float coordinates are truncated as `draw_bounding_boxes` does
+            quads = rectangles_to_quads(
+                bboxes.reshape(-1, 4).astype(np.int32))
+        if class_labels is not None and exclude_classes:
+            keep = [label not in exclude_classes for label in class_labels]
+            quads = quads[np.array(keep, dtype=bool)]
+            class_labels = [label for label, kept
+                            in zip(class_labels, keep) if kept]
+            if confidences is not None:
+                confidences = [conf for conf, kept
+                               in zip(confidences, keep) if kept]
+        if len(quads) == 0:
+            return out
+
+        cv2.polylines(out, quads, True, color=self.color,
+                      thickness=self.line_width)
+
+        texts = self._make_texts(len(quads), class_labels, confidences)
+        if texts is None:
+            return out
+        # Texts are put over left-up corners of quadrilaterals' bounds
+        origins = quads.min(axis=1)
+        origins[:, 1] -= 2
+        for origin, text in zip(origins.tolist(), texts):
+            cv2.putText(out, text, origin, cv2.FONT_HERSHEY_SIMPLEX,
+                        self.font_scale, self.color, 1)
+        return out
+
+    @staticmethod
+    def _make_texts(
+        n_boxes: int,
+        class_labels: Optional[List[Union[str, int, float]]],
+        confidences: Optional[List[float]]
+    ) -> Optional[List[str]]:
+        """Make texts of boxes, `None` if there are no texts."""
+        if class_labels is None and confidences is None:
+            return None
+        if class_labels is None:
+            labels_texts = [''] * n_boxes
+        else:
+            # Texts are made once per label
+            label_to_text: Dict[Union[str, int, float], str] = {
+                label: f'cls: {label} ' for label in set(class_labels)}
+            labels_texts = [label_to_text[label] for label in class_labels]
+        if confidences is None:
+            return labels_texts
+        return [text + 'conf: {:.2f}'.format(conf)
+                for text, conf in zip(labels_texts, confidences)]
+
+
+# The renderer that is shared by all samples
+bbox_renderer = BboxRenderer()
@@ -0,0 +1,152 @@
+"""A process-wide cache of decoded images."""
+
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from numpy.typing import NDArray
+
+
+@dataclass
+class ImageCacheStats:
+    """Counters of an image cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    images: int = 0
+    bytes: int = 0
+
+
+class ImageCache:
+    """A bounded LRU cache of decoded images.
+
+    Images are keyed by a file path together with the file's size and
+    modification time, so a changed file is decoded again. The least
+    recently used images are evicted when the total size of the images
+    exceeds `max_bytes`. Cached images are read-only because they are
+    shared between all callers.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 2 ** 20) -> None:
+        self._max_bytes = max_bytes
+        self._images: OrderedDict[Tuple[str, int, int], NDArray] = (
+            OrderedDict())
+        self._keys: Dict[str, Tuple[str, int, int]] = {}
+        self._stats = ImageCacheStats()
+        self._lock = Lock()
+
+    @staticmethod
+    def _make_key(path: Union[Path, str]) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return str(path), stat.st_size, stat.st_mtime_ns
+
+    def get(
+        self, path: Union[Path, str], read: Callable[[Path], NDArray]
+    ) -> NDArray:
+        """Get a decoded image, decoding it if it is not cached.
+
+        Parameters
+        ----------
+        path : Union[Path, str]
+            A path to the image file.
+        read : Callable[[Path], NDArray]
+            A function that decodes the image file.
+
+        Returns
+        -------
+        NDArray
+            The read-only decoded image.
+        """
+        path = Path(path)
+        key = self._make_key(path)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self._stats.hits += 1
+                return image
+            self._stats.misses += 1
+
+        image = read(path)
+        image.flags.writeable = False
+        with self._lock:
+            self._put(key, image)
+        return image
+
+    def _put(self, key: Tuple[str, int, int], image: NDArray) -> None:
+        """Add an image and evict old ones. Must be called under the lock."""
+        # Drop a stale version of the same file
+        old_key = self._keys.get(key[0])
+        if old_key is not None and old_key != key:
+            self._remove(old_key)
+        if image.nbytes > self._max_bytes or key in self._images:
+            return
+        self._images[key] = image
+        self._keys[key[0]] = key
+        self._stats.images += 1
+        self._stats.bytes += image.nbytes
+        while self._stats.bytes > self._max_bytes:
+            self._remove(next(iter(self._images)))
+            self._stats.evictions += 1
+
+    def _remove(self, key: Tuple[str, int, int]) -> None:
+        """Remove an image. Must be called under the lock."""
+        image = self._images.pop(key)
+        if self._keys.get(key[0]) == key:
+            del self._keys[key[0]]
+        self._stats.images -= 1
+        self._stats.bytes -= image.nbytes
+
+    def invalidate(self, path: Optional[Union[Path, str]] = None) -> None:
+        """Remove an image of a file or all images from the cache.
+
+        Parameters
+        ----------
+        path : Optional[Union[Path, str]], optional
+            A path to the image file. By default is `None`,
+            that clears the whole cache.
+        """
+        with self._lock:
+            if path is None:
+                self._images.clear()
+                self._keys.clear()
+                self._stats.images = 0
+                self._stats.bytes = 0
+                return
+            key = self._keys.get(str(Path(path)))
+            if key is not None:
+                self._remove(key)
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Set a new memory budget, evicting images if needed.
+
+        Parameters
+        ----------
+        max_bytes : int
+            The new budget in bytes.
+        """
+        with self._lock:
+            self._max_bytes = max_bytes
+            while self._stats.bytes > self._max_bytes:
+                self._remove(next(iter(self._images)))
+                self._stats.evictions += 1
+
+    def get_stats(self) -> ImageCacheStats:
+        """Get a copy of the cache's counters.
+
+        Returns
+        -------
+        ImageCacheStats
+            Hits, misses, evictions and the current size of the cache.
+        """
+        with self._lock:
+            return ImageCacheStats(**vars(self._stats))
+
+
+# The cache that is shared by all samples
+image_cache = ImageCache()
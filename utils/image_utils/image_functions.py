@@ -2,8 +2,10 @@
 
 
 from pathlib import Path
-from typing import Tuple, Union, List
+import struct
+from typing import BinaryIO, Optional, Tuple, Union, List
 
+import numpy as np
 from numpy.typing import NDArray
 import cv2
 
@@ -13,15 +15,42 @@ FloatBbox = Tuple[float, float, float, float]
 Bbox = Union[IntBbox, FloatBbox]
 
 
-def read_image(path: Union[Path, str], grayscale: bool = False) -> NDArray:
+# Flags of OpenCV decoding at 1/1, 1/2, 1/4 and 1/8 of a full size
+_REDUCED_COLOR_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8}
+_REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8}
+
+
+def read_image(
+    path: Union[Path, str],
+    grayscale: bool = False,
+    bgr: bool = False,
+    max_size: Optional[int] = None
+) -> NDArray:
     """Read image to numpy array.
 
+    Color images are converted to RGB in place, so the decoded buffer
+    is the only one that is allocated.
+
     Parameters
     ----------
     path : Union[Path, str]
         Path to image file
     grayscale : bool, optional
         Whether read image in grayscale, by default False
+    bgr : bool, optional
+        Whether to keep OpenCV's BGR channels order, by default False
+    max_size : Optional[int], optional
+        The maximal long edge of the read image. A larger image is
+        downscaled as `read_downscaled_image` does. By default is `None`,
+        that means the full size.
 
     Returns
     -------
@@ -35,18 +64,205 @@ def read_image(path: Union[Path, str], grayscale: bool = False) -> NDArray:
     ValueError
         Image reading is not correct.
     """
+    if max_size is not None:
+        return read_downscaled_image(
+            path, max_size=max_size, grayscale=grayscale, bgr=bgr)[0]
+    return _decode_image(path, 1, grayscale, bgr)
+
+
+def read_downscaled_image(
+    path: Union[Path, str],
+    max_size: Optional[int] = None,
+    scale: Optional[float] = None,
+    grayscale: bool = False,
+    bgr: bool = False
+) -> Tuple[NDArray, float]:
+    """Read an image at a reduced size.
+
+    JPEG images are decoded right at 1/2, 1/4 or 1/8 of the full size
+    when it is not smaller than the required size, that is several times
+    faster and takes less memory than decoding the full image.
+    The rest of the scale is done by `cv2.resize` with area interpolation.
+
+    Parameters
+    ----------
+    path : Union[Path, str]
+        Path to image file.
+    max_size : Optional[int], optional
+        The maximal long edge of the read image. By default is `None`.
+    scale : Optional[float], optional
+        The maximal scale of the read image. By default is `None`.
+        If both `max_size` and `scale` are given, the smaller size is taken.
+        Images are never upscaled.
+    grayscale : bool, optional
+        Whether read image in grayscale, by default False
+    bgr : bool, optional
+        Whether to keep OpenCV's BGR channels order, by default False
+
+    Returns
+    -------
+    Tuple[NDArray, float]
+        The read image and its scale relative to the full size.
+
+    Raises
+    ------
+    FileNotFoundError
+        Did not find image.
+    ValueError
+        Image reading is not correct.
+    """
+    height, width = read_image_shape(path)
+    target_scale = 1.0
+    if max_size is not None:
+        target_scale = min(target_scale, max_size / max(height, width))
+    if scale is not None:
+        target_scale = min(target_scale, scale)
+
+    reduction = 1
+    for factor in (2, 4, 8):
+        if 1 / factor >= target_scale:
+            reduction = factor
+    img = _decode_image(path, reduction, grayscale, bgr)
+
+    new_size = (max(1, round(width * target_scale)),
+                max(1, round(height * target_scale)))
+    if (img.shape[1], img.shape[0]) == new_size:
+        return img, target_scale
+    if img.shape[1] < new_size[0] or img.shape[0] < new_size[1]:
+        # A reduced decode is rounded up, so it is taken as it is
+        return img, img.shape[1] / width
+    img = cv2.resize(img, new_size, interpolation=cv2.INTER_AREA)
+    return img, target_scale
+
+
+def _decode_image(
+    path: Union[Path, str], reduction: int, grayscale: bool, bgr: bool
+) -> NDArray:
+    """Decode an image reduced in `reduction` times."""
     if isinstance(path, str):
         path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f'Did not find image {path}.')
-    flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
-    img = cv2.imread(str(path), flag)
+    flags = _REDUCED_GRAYSCALE_FLAGS if grayscale else _REDUCED_COLOR_FLAGS
+    img = cv2.imread(str(path), flags[reduction])
     if img is None:
         raise ValueError('Image reading is not correct.')
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    if not grayscale and not bgr:
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
     return img
 
 
+def read_image_shape(path: Union[Path, str]) -> Tuple[int, int]:
+    """Get an image's height and width without decoding it.
+
+    Only the header of JPEG and PNG files is read. Images of other formats
+    and files with unusual headers are decoded. JPEG EXIF orientation is
+    taken into account as `read_image` does.
+
+    Parameters
+    ----------
+    path : Union[Path, str]
+        Path to image file.
+
+    Returns
+    -------
+    Tuple[int, int]
+        The height and the width of the image.
+
+    Raises
+    ------
+    FileNotFoundError
+        Did not find image.
+    """
+    if isinstance(path, str):
+        path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f'Did not find image {path}.')
+    with open(path, 'rb') as f:
+        signature = f.read(8)
+        f.seek(0)
+        if signature[:2] == b'\xff\xd8':
+            shape = _read_jpeg_shape(f)
+        elif signature == b'\x89PNG\r\n\x1a\n':
+            shape = _read_png_shape(f)
+        else:
+            shape = None
+    if shape is None:
+        shape = read_image(path).shape[:2]
+    return shape
+
+
+def _read_png_shape(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    """Read an image shape from a PNG IHDR chunk."""
+    header = f.read(24)
+    if len(header) < 24 or header[12:16] != b'IHDR':
+        return None
+    width, height = struct.unpack('>II', header[16:24])
+    return height, width
+
+
+def _read_jpeg_shape(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    """Read an image shape from a JPEG SOF segment."""
+    f.read(2)
+    orientation = 1
+    while True:
+        byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if byte == b'':
+            return None
+        marker = byte[0]
+        # Markers without a segment
+        if marker == 0x01 or 0xd0 <= marker <= 0xd9:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0] - 2
+        # Start of frame markers except DHT, JPG and DAC
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            segment = f.read(5)
+            if len(segment) < 5:
+                return None
+            height, width = struct.unpack('>HH', segment[1:5])
+            # Orientations from 5 to 8 transpose the image
+            if orientation >= 5:
+                return width, height
+            return height, width
+        if marker == 0xda:
+            return None
+        if marker == 0xe1:
+            orientation = _read_exif_orientation(f.read(length))
+        else:
+            f.seek(length, 1)
+
+
+def _read_exif_orientation(app1: bytes) -> int:
+    """Read an orientation tag from an EXIF segment, `1` if it is absent."""
+    if app1[:6] != b'Exif\x00\x00':
+        return 1
+    tiff = app1[6:]
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return 1
+    try:
+        ifd_offset = struct.unpack(endian + 'I', tiff[4:8])[0]
+        n_entries = struct.unpack(
+            endian + 'H', tiff[ifd_offset:ifd_offset + 2])[0]
+        for i in range(n_entries):
+            entry_offset = ifd_offset + 2 + i * 12
+            entry = tiff[entry_offset:entry_offset + 12]
+            tag = struct.unpack(endian + 'H', entry[:2])[0]
+            if tag == 0x0112:
+                return struct.unpack(endian + 'H', entry[8:10])[0]
+    except struct.error:
+        pass
+    return 1
+
+
 def resize_image(image: NDArray, new_size: Tuple[int, int]) -> NDArray:
     """Resize image to given size.
 
@@ -104,8 +320,10 @@ def draw_bounding_boxes(
     ----------
     image : NDArray
         The given image with shape `(h, w, c)`.
-    bboxes : List[Bbox]
-        The bounding boxes with shape `(n_boxes, 4)` in `xyxy` format.
+    bboxes : Union[List[Bbox], NDArray]
+        The bounding boxes with shape `(n_boxes, 4)` in `xyxy` format
+        or quadrilaterals with shape `(n_boxes, 4, 2)`.
+        Quadrilaterals are drawn with one `cv2.polylines` call.
     class_labels : List, optional
         Bounding boxes' labels. By default is None.
     exclude_classes : List[str, int, float]
@@ -127,6 +345,20 @@ def draw_bounding_boxes(
     if exclude_classes is None:
         exclude_classes = []
 
+    if isinstance(bboxes, np.ndarray) and bboxes.ndim == 3:
+        quads = bboxes
+        if class_labels is not None and len(exclude_classes) != 0:
+            keep = [label not in exclude_classes for label in class_labels]
+            quads = quads[keep]
+        cv2.polylines(image, list(quads.astype(np.int32)), True,
+                      color=color, thickness=line_width)
+        # Texts are put over left-up corners of quadrilaterals' bounds
+        bboxes = np.concatenate(
+            (bboxes.min(axis=1), bboxes.max(axis=1)), axis=1)
+        draw_rectangles = False
+    else:
+        draw_rectangles = True
+
     for i, bbox in enumerate(bboxes):
         # Check if exclude
         if class_labels is not None and class_labels[i] in exclude_classes:
@@ -135,8 +367,9 @@ def draw_bounding_boxes(
         # Draw bbox
         bbox = list(map(int, bbox))  # convert float bbox to int if needed
         x1, y1, x2, y2 = bbox
-        cv2.rectangle(image, (x1, y1), (x2, y2),
-                      color=color, thickness=line_width)
+        if draw_rectangles:
+            cv2.rectangle(image, (x1, y1), (x2, y2),
+                          color=color, thickness=line_width)
         
         # Put text if needed
         if class_labels is not None:
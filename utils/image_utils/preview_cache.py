@@ -0,0 +1,164 @@
+"""A persistent on-disk cache of downscaled image previews."""
+
+
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+import cv2
+from numpy.typing import NDArray
+
+from utils.image_utils.image_functions import (
+    read_image, read_downscaled_image, read_image_shape)
+
+
+# Long edges of previews in pixels
+PREVIEW_SIZES = (256, 512, 1024, 2048)
+# The directory of the cache that is shared by all samples
+DEFAULT_PREVIEW_DIR = Path.home() / '.cache' / 'text_detection_previews'
+
+
+class PreviewCache:
+    """A cache of downscaled renditions of images saved as JPEG files.
+
+    All renditions of an image are made from one decode of the image
+    when any of them is requested for the first time. Renditions are keyed
+    by the image's path, size and modification time, so a changed image
+    gets new renditions. Only renditions that are smaller than the image
+    are made.
+
+    Files are written atomically, so several threads or processes
+    may use one cache directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[Path, str],
+        sizes: Sequence[int] = PREVIEW_SIZES,
+        quality: int = 90
+    ) -> None:
+        """Create a cache.
+
+        Parameters
+        ----------
+        cache_dir : Union[Path, str]
+            A directory to keep renditions in. It is created on the first
+            write.
+        sizes : Sequence[int], optional
+            Long edges of the renditions. By default is `PREVIEW_SIZES`.
+        quality : int, optional
+            JPEG quality of the renditions. By default is `90`.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.sizes = tuple(sorted(sizes))
+        self.quality = quality
+
+    def get(
+        self,
+        img_pth: Union[Path, str],
+        min_side: int,
+        read: Callable[[Path], NDArray] = read_image
+    ) -> Tuple[NDArray, float]:
+        """Get the smallest rendition with a long edge of at least `min_side`.
+
+        If the image is not larger than such rendition, the image itself
+        is read.
+
+        Parameters
+        ----------
+        img_pth : Union[Path, str]
+            A path to the image file.
+        min_side : int
+            The minimal long edge of the rendition.
+        read : Callable[[Path], NDArray], optional
+            A function that decodes the image file.
+            By default is `read_image`.
+
+        Returns
+        -------
+        Tuple[NDArray, float]
+            The RGB rendition and its scale relative to the image.
+        """
+        img_pth = Path(img_pth)
+        if img_pth.name[-4:] == '.npy':
+            image = read(img_pth)
+            long_side = max(image.shape[:2])
+        else:
+            image = None
+            long_side = max(read_image_shape(img_pth))
+
+        size = next((size for size in self.sizes
+                     if size >= min_side and size < long_side), None)
+        if size is None:
+            return (read(img_pth) if image is None else image), 1.0
+        scale = size / long_side
+
+        preview_pth = self._get_previews_paths(img_pth)[size]
+        if not preview_pth.exists():
+            self._make_previews(img_pth, image)
+        return read_image(preview_pth), scale
+
+    def _get_previews_paths(self, img_pth: Path) -> Dict[int, Path]:
+        """Get paths of all renditions of an image."""
+        stat = os.stat(img_pth)
+        key = hashlib.sha1(
+            f'{img_pth.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}'
+            .encode()).hexdigest()
+        return {size: self.cache_dir / key[:2] / f'{key}_{size}.jpg'
+                for size in self.sizes}
+
+    def _make_previews(
+        self, img_pth: Path, image: Optional[NDArray] = None
+    ) -> None:
+        """Make all renditions of an image that are smaller than it.
+
+        Image files are decoded right at a size of the largest rendition
+        when possible. Every rendition is downscaled from the next larger
+        one.
+        """
+        if image is None:
+            height, width = read_image_shape(img_pth)
+            long_side = max(height, width)
+            largest_size = max((size for size in self.sizes
+                                if size < long_side), default=long_side)
+            image = read_downscaled_image(img_pth, max_size=largest_size)[0]
+        else:
+            height, width = image.shape[:2]
+            long_side = max(height, width)
+        previews_paths = self._get_previews_paths(img_pth)
+        for size in reversed(self.sizes):
+            if size >= long_side:
+                continue
+            scale = size / long_side
+            new_size = (max(1, round(width * scale)),
+                        max(1, round(height * scale)))
+            image = cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+            self._save_preview(image, previews_paths[size])
+
+    def _save_preview(self, image: NDArray, preview_pth: Path) -> None:
+        """Write a rendition through a temporary file."""
+        preview_pth.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_pth = tempfile.mkstemp(
+            suffix='.jpg', dir=preview_pth.parent)
+        os.close(fd)
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        try:
+            if not cv2.imwrite(tmp_pth, image,
+                               [cv2.IMWRITE_JPEG_QUALITY, self.quality]):
+                raise RuntimeError('Could not save image.')
+            os.replace(tmp_pth, preview_pth)
+        except BaseException:
+            os.unlink(tmp_pth)
+            raise
+
+    def clear(self) -> None:
+        """Remove all renditions."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+# The cache that is shared by all samples
+preview_cache = PreviewCache(DEFAULT_PREVIEW_DIR)
@@ -4,6 +4,7 @@
 from typing import List, Tuple
 
 import numpy as np
+from numpy.typing import NDArray
 
 
 def rotate_rectangle(
@@ -36,3 +37,248 @@ def rotate_rectangle(
             int(c_y + np.sin(angle) * (px - c_x) + np.cos(angle) * (py - c_y)))
         for px, py in points]
     return points
+
+
+def rotate_rectangles(
+    rects: NDArray, radians: bool = True
+) -> Tuple[NDArray, NDArray]:
+    """Rotate a batch of rectangles around their centers.
+
+    It is a vectorized version of `rotate_rectangle` that gives the same
+    integer points for rectangles given as `x, y, w, h, angle`.
+
+    Parameters
+    ----------
+    rects : NDArray
+        Rectangles with shape `(N, 5)`. Each row is `x, y, w, h, angle`
+        where `x, y` is a left-up corner before the rotation.
+    radians : bool, optional
+        Whether angles given in radians. Otherwise in degrees. By default
+        equals `True` (radians).
+
+    Returns
+    -------
+    Tuple[NDArray, NDArray]
+        Rotated corners with shape `(N, 4, 2)` in order left-up, left-down,
+        right-down, right-up and their axis-aligned bounds with shape
+        `(N, 4)` in `xyxy` format. Both are int64.
+    """
+    rects = np.asarray(rects, dtype=np.float64).reshape(-1, 5)
+    x, y, w, h, angle = rects.T
+    if not radians:
+        angle = np.deg2rad(angle)
+    # Corners before rotation in order lu, ld, rd, ru
+    xs = np.stack((x, x, x + w, x + w), axis=1)
+    ys = np.stack((y, y + h, y + h, y), axis=1)
+    c_x = xs.mean(axis=1, keepdims=True)
+    c_y = ys.mean(axis=1, keepdims=True)
+    cos = np.cos(angle)[:, None]
+    sin = np.sin(angle)[:, None]
+
+    corners = np.empty((len(rects), 4, 2), dtype=np.int64)
+    # Casting truncates like `int` in `rotate_rectangle`
+    corners[..., 0] = c_x + cos * (xs - c_x) - sin * (ys - c_y)
+    corners[..., 1] = c_y + sin * (xs - c_x) + cos * (ys - c_y)
+    bounds = np.concatenate(
+        (corners.min(axis=1), corners.max(axis=1)), axis=1)
+    return corners, bounds
+
+
+def rectangles_to_quads(bboxes: NDArray) -> NDArray:
+    """Convert axis-aligned bounding boxes to quadrilaterals.
+
+    Parameters
+    ----------
+    bboxes : NDArray
+        Bounding boxes with shape `(N, 4)` in `xyxy` format.
+
+    Returns
+    -------
+    NDArray
+        Quadrilaterals with shape `(N, 4, 2)` with corners in order
+        left-up, left-down, right-down, right-up.
+    """
+    bboxes = np.asarray(bboxes).reshape(-1, 4)
+    x1, y1, x2, y2 = bboxes.T
+    return np.stack((np.stack((x1, y1), axis=1),
+                     np.stack((x1, y2), axis=1),
+                     np.stack((x2, y2), axis=1),
+                     np.stack((x2, y1), axis=1)), axis=1)
+
+
+def quads_bounds(quads: NDArray) -> NDArray:
+    """Get axis-aligned bounds of quadrilaterals.
+
+    Parameters
+    ----------
+    quads : NDArray
+        Quadrilaterals with shape `(N, 4, 2)`.
+
+    Returns
+    -------
+    NDArray
+        Bounds with shape `(N, 4)` in `xyxy` format.
+    """
+    quads = np.asarray(quads).reshape(-1, 4, 2)
+    return np.concatenate((quads.min(axis=1), quads.max(axis=1)), axis=1)
+
+
+def quads_area(quads: NDArray) -> NDArray:
+    """Get areas of quadrilaterals by the shoelace formula.
+
+    Parameters
+    ----------
+    quads : NDArray
+        Simple (not self-intersecting) quadrilaterals with shape `(N, 4, 2)`.
+
+    Returns
+    -------
+    NDArray
+        Areas with shape `(N,)`.
+    """
+    return np.abs(_quads_signed_area(quads))
+
+
+def clip_quads(quads: NDArray, width: int, height: int) -> NDArray:
+    """Clip corners of quadrilaterals to image borders.
+
+    Parameters
+    ----------
+    quads : NDArray
+        Quadrilaterals with shape `(N, 4, 2)`.
+    width : int
+        An image width.
+    height : int
+        An image height.
+
+    Returns
+    -------
+    NDArray
+        The clipped quadrilaterals with shape `(N, 4, 2)`.
+    """
+    quads = np.asarray(quads).reshape(-1, 4, 2)
+    return np.clip(quads, 0, [width - 1, height - 1]).astype(quads.dtype)
+
+
+def quads_iou(quads1: NDArray, quads2: NDArray) -> NDArray:
+    """Get pairwise IoU of two sets of convex quadrilaterals.
+
+    Intersections of all pairs are found at once by clipping
+    the first quadrilaterals with edges of the second ones
+    (Sutherland-Hodgman algorithm).
+
+    Parameters
+    ----------
+    quads1 : NDArray
+        Convex quadrilaterals with shape `(N, 4, 2)`.
+    quads2 : NDArray
+        Convex quadrilaterals with shape `(M, 4, 2)`.
+
+    Returns
+    -------
+    NDArray
+        IoU matrix with shape `(N, M)`.
+    """
+    quads1 = _orient_quads(quads1)
+    quads2 = _orient_quads(quads2)
+    n, m = len(quads1), len(quads2)
+    clip = np.tile(quads2, (n, 1, 1))
+
+    # An intersection of two convex quadrilaterals has at most 8 vertices
+    polygons = np.zeros((n * m, 8, 2), dtype=np.float64)
+    polygons[:, :4] = np.repeat(quads1, m, axis=0)
+    counts = np.full(n * m, 4)
+    for i in range(4):
+        polygons, counts = _clip_polygons(
+            polygons, counts, clip[:, i], clip[:, (i + 1) % 4])
+
+    intersection = _polygons_area(polygons, counts).reshape(n, m)
+    union = (quads_area(quads1)[:, None] + quads_area(quads2)[None, :] -
+             intersection)
+    return np.divide(intersection, union,
+                     out=np.zeros_like(intersection), where=union > 0)
+
+
+def _quads_signed_area(quads: NDArray) -> NDArray:
+    """Get signed areas of quadrilaterals with shape `(N, 4, 2)`."""
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    x = quads[..., 0]
+    y = quads[..., 1]
+    x_next = np.roll(x, -1, axis=1)
+    y_next = np.roll(y, -1, axis=1)
+    return 0.5 * np.sum(x * y_next - x_next * y, axis=1)
+
+
+def _orient_quads(quads: NDArray) -> NDArray:
+    """Reorder corners so that all quadrilaterals have positive area."""
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    negative = _quads_signed_area(quads) < 0
+    return np.where(negative[:, None, None], quads[:, ::-1], quads)
+
+
+def _next_vertices(polygons: NDArray, counts: NDArray) -> NDArray:
+    """Get the next vertex for every vertex of padded polygons."""
+    idxs = np.arange(polygons.shape[1])
+    next_idxs = (idxs[None, :] + 1) % np.maximum(counts, 1)[:, None]
+    return np.take_along_axis(polygons, next_idxs[..., None], axis=1)
+
+
+def _polygons_area(polygons: NDArray, counts: NDArray) -> NDArray:
+    """Get areas of padded polygons with `counts` valid vertices."""
+    valid = np.arange(polygons.shape[1])[None, :] < counts[:, None]
+    next_pts = _next_vertices(polygons, counts)
+    cross = (polygons[..., 0] * next_pts[..., 1] -
+             next_pts[..., 0] * polygons[..., 1])
+    return 0.5 * np.abs(np.where(valid, cross, 0.0).sum(axis=1))
+
+
+def _clip_polygons(
+    polygons: NDArray, counts: NDArray, edge_start: NDArray, edge_end: NDArray
+) -> Tuple[NDArray, NDArray]:
+    """Clip padded convex polygons by half-planes to the left of edges.
+
+    Parameters
+    ----------
+    polygons : NDArray
+        Padded polygons with shape `(B, K, 2)`.
+    counts : NDArray
+        Numbers of valid vertices with shape `(B,)`.
+    edge_start : NDArray
+        Start points of the clipping edges with shape `(B, 2)`.
+    edge_end : NDArray
+        End points of the clipping edges with shape `(B, 2)`.
+
+    Returns
+    -------
+    Tuple[NDArray, NDArray]
+        The clipped padded polygons and their numbers of vertices.
+    """
+    n_polygons, max_vertices, _ = polygons.shape
+    valid = np.arange(max_vertices)[None, :] < counts[:, None]
+    next_pts = _next_vertices(polygons, counts)
+    edge = (edge_end - edge_start)[:, None, :]
+    start = edge_start[:, None, :]
+
+    def side(pts: NDArray) -> NDArray:
+        return (edge[..., 0] * (pts[..., 1] - start[..., 1]) -
+                edge[..., 1] * (pts[..., 0] - start[..., 0]))
+
+    side_cur = side(polygons)
+    side_next = side(next_pts)
+    inside_cur = side_cur >= 0
+    inside_next = side_next >= 0
+    denom = side_cur - side_next
+    t = np.divide(side_cur, denom,
+                  out=np.zeros_like(side_cur), where=denom != 0)
+    crossing = polygons + t[..., None] * (next_pts - polygons)
+
+    # Every polygon edge emits an intersection point if it crosses
+    # the clipping line and its end point if the end point is inside
+    candidates = np.stack((crossing, next_pts), axis=2).reshape(
+        n_polygons, 2 * max_vertices, 2)
+    emitted = np.stack((valid & (inside_cur != inside_next),
+                        valid & inside_next), axis=2).reshape(
+        n_polygons, 2 * max_vertices)
+    order = np.argsort(~emitted, axis=1, kind='stable')[:, :max_vertices]
+    clipped = np.take_along_axis(candidates, order[..., None], axis=1)
+    return clipped, np.minimum(emitted.sum(axis=1), max_vertices)
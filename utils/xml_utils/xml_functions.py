@@ -0,0 +1,39 @@
+"""A module that contain functions for working with xml files."""
+
+
+from pathlib import Path
+from typing import Collection, Iterator, Union
+import xml.etree.ElementTree as ET
+
+
+def iter_xml_elements(
+    xml_pth: Union[Path, str], tag: Union[str, Collection[str]]
+) -> Iterator[ET.Element]:
+    """Iterate over complete elements with given tags of an xml file.
+
+    The file is parsed incrementally. When the consumer goes to the next
+    element, the previous one is cleared and detached from the root,
+    so memory usage does not grow with the file size.
+
+    Parameters
+    ----------
+    xml_pth : Union[Path, str]
+        A path to the xml file.
+    tag : Union[str, Collection[str]]
+        A tag or several tags of the elements to iterate over.
+        The elements must not be nested into each other.
+
+    Yields
+    ------
+    ET.Element
+        The next complete element with one of the given tags.
+    """
+    tags = {tag} if isinstance(tag, str) else set(tag)
+    context = ET.iterparse(str(xml_pth), events=('start', 'end'))
+    _, root = next(context)
+    for event, elem in context:
+        if event == 'end' and elem.tag in tags:
+            yield elem
+            elem.clear()
+            # Drop references to the already processed elements
+            root.clear()
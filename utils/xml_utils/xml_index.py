@@ -0,0 +1,125 @@
+"""Random access to elements of large xml files.
+
+`XmlElementsIndex` finds byte ranges of all elements with a given tag
+and keeps them in a sidecar file next to the xml file. Later any element
+can be parsed alone by reading only its bytes.
+"""
+
+
+import mmap
+import os
+from pathlib import Path
+import re
+from typing import Optional, Union
+import xml.etree.ElementTree as ET
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class XmlElementsIndex:
+    """Byte ranges of elements with a given tag in an xml file.
+
+    The index is saved to `<xml name>.<tag>.idx.npz` next to the xml file
+    (or to a given path) and is rebuilt when the size or the modification
+    time of the xml file changes. If the index can not be saved,
+    it is kept only in memory.
+
+    Elements with the tag must not be nested into each other.
+    """
+
+    def __init__(
+        self,
+        xml_pth: Union[Path, str],
+        tag: str,
+        index_pth: Optional[Union[Path, str]] = None
+    ) -> None:
+        self.xml_pth = Path(xml_pth)
+        self.tag = tag
+        if index_pth is None:
+            index_pth = self.xml_pth.with_name(
+                f'{self.xml_pth.name}.{tag}.idx.npz')
+        self.index_pth = Path(index_pth)
+
+        stat = os.stat(self.xml_pth)
+        self._stamp = np.array([stat.st_size, stat.st_mtime_ns],
+                               dtype=np.int64)
+        if not self._load():
+            self._build()
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _load(self) -> bool:
+        """Load the saved index if it is up to date with the xml file."""
+        if not self.index_pth.exists():
+            return False
+        with np.load(self.index_pth) as index:
+            if not np.array_equal(index['stamp'], self._stamp):
+                return False
+            self.offsets: NDArray = index['offsets']
+            self._declaration = index['declaration'].tobytes()
+        return True
+
+    def _build(self) -> None:
+        """Scan the xml file and find byte ranges of the elements."""
+        tag = re.escape(self.tag.encode())
+        element_re = re.compile(
+            rb'<%s(?:\s[^>]*?)?(?:/>|>.*?</%s\s*>)' % (tag, tag), re.DOTALL)
+        with open(self.xml_pth, 'rb') as f:
+            if self._stamp[0] == 0:
+                data = b''
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            declaration = re.match(rb'\s*(<\?xml[^>]*\?>)', data)
+            self._declaration = (declaration.group(1)
+                                 if declaration is not None else b'')
+            self.offsets = np.array(
+                [match.span() for match in element_re.finditer(data)],
+                dtype=np.int64).reshape(-1, 2)
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def _save(self) -> None:
+        """Save the index as a sidecar file, skip it if it is not possible."""
+        try:
+            np.savez(self.index_pth, offsets=self.offsets, stamp=self._stamp,
+                     declaration=np.frombuffer(self._declaration,
+                                               dtype=np.uint8))
+        except OSError:
+            pass
+
+    def get_bytes(self, idx: int) -> bytes:
+        """Read raw bytes of an element.
+
+        Parameters
+        ----------
+        idx : int
+            An index of the element.
+
+        Returns
+        -------
+        bytes
+            The element's bytes.
+        """
+        start, end = self.offsets[idx].tolist()
+        with open(self.xml_pth, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def get_element(self, idx: int) -> ET.Element:
+        """Parse an element without parsing the rest of the file.
+
+        Parameters
+        ----------
+        idx : int
+            An index of the element.
+
+        Returns
+        -------
+        ET.Element
+            The parsed element.
+        """
+        # The declaration keeps the file's encoding for the fragment
+        return ET.fromstring(self._declaration + self.get_bytes(idx))
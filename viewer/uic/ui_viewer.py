@@ -16,7 +16,7 @@ from PySide6.QtGui import (QAction, QBrush, QColor, QConicalGradient,
     QIcon, QImage, QKeySequence, QLinearGradient,
     QPainter, QPalette, QPixmap, QRadialGradient,
     QTransform)
-from PySide6.QtWidgets import (QApplication, QComboBox, QHBoxLayout, QLabel,
+from PySide6.QtWidgets import (QApplication, QComboBox, QGraphicsView, QHBoxLayout,
     QLineEdit, QMainWindow, QMenu, QMenuBar,
     QPushButton, QSizePolicy, QSpacerItem, QStatusBar,
     QVBoxLayout, QWidget)
@@ -32,11 +32,9 @@ class Ui_MainWindow(object):
         self.action_open_dset.setObjectName(u"action_open_dset")
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
-        self.picture_box = QLabel(self.centralwidget)
+        self.picture_box = QGraphicsView(self.centralwidget)
         self.picture_box.setObjectName(u"picture_box")
         self.picture_box.setGeometry(QRect(10, 10, 531, 351))
-        self.picture_box.setPixmap(QPixmap(u"utils/data_utils/data_viewer/resources/default_img.jpg"))
-        self.picture_box.setScaledContents(True)
         self.previous_btn = QPushButton(self.centralwidget)
         self.previous_btn.setObjectName(u"previous_btn")
         self.previous_btn.setEnabled(False)
@@ -106,7 +104,6 @@ class Ui_MainWindow(object):
         MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"MainWindow", None))
         self.DsetOpener.setText(QCoreApplication.translate("MainWindow", u"Open dataset", None))
         self.action_open_dset.setText(QCoreApplication.translate("MainWindow", u"Open dataset", None))
-        self.picture_box.setText("")
         self.previous_btn.setText(QCoreApplication.translate("MainWindow", u"Previous", None))
         self.next_btn.setText(QCoreApplication.translate("MainWindow", u"Next", None))
         self.idx_textbox.setText("")
@@ -2,5 +2,15 @@
 
 from viewer.viewer_modules.viewer_dataset import ( # noqa
     ViewerDataset)
+from viewer.viewer_modules.qt_image import ( # noqa
+    ndarray_to_qimage)
+from viewer.viewer_modules.tiled_image_item import ( # noqa
+    TiledImageItem)
+from viewer.viewer_modules.sample_scene import ( # noqa
+    SampleScene)
+from viewer.viewer_modules.annotations_model import ( # noqa
+    AnnotationsModel)
+from viewer.viewer_modules.thumbnails_model import ( # noqa
+    ThumbnailsModel)
 from viewer.viewer_modules.viewer_window import ( # noqa
     ViewerWindow)
@@ -0,0 +1,138 @@
+"""A table model over annotations of a sample."""
+
+import copy
+from typing import Any, List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from datasets import BaseTextDetectionAnnotation, BaseTextDetectionSample
+
+
+class AnnotationsModel(QAbstractTableModel):
+    """A table model that serves rows right from a sample's annotations.
+
+    Nothing is copied into the model, so showing another sample is one
+    model reset. Edits are written back to the sample's annotations.
+    """
+
+    columns = ('x1', 'y1', 'x2', 'y2', 'language', 'word')
+    # Attributes of an annotation that are shown in the columns
+    _attributes = ('x1', 'y1', 'x2', 'y2', 'label', 'text')
+    _coordinates_columns = 4
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._sample: Optional[BaseTextDetectionSample] = None
+        self._annots: List[BaseTextDetectionAnnotation] = []
+
+    def set_sample(self, sample: Optional[BaseTextDetectionSample]):
+        """Show annotations of another sample.
+
+        Parameters
+        ----------
+        sample : Optional[BaseTextDetectionSample]
+            The sample. `None` shows an empty table.
+        """
+        self.beginResetModel()
+        self._sample = sample
+        self._annots = [] if sample is None else sample.get_annotations()
+        self.endResetModel()
+
+    def get_annotation(self, row: int) -> BaseTextDetectionAnnotation:
+        """Get an annotation of a row.
+
+        Parameters
+        ----------
+        row : int
+            The row's index.
+
+        Returns
+        -------
+        BaseTextDetectionAnnotation
+            The annotation.
+        """
+        return self._annots[row]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._annots)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.DisplayRole
+    ) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return str(section)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        annot = self._annots[index.row()]
+        return str(getattr(annot, self._attributes[index.column()]))
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def setData(
+        self, index: QModelIndex, value: Any, role: int = Qt.EditRole
+    ) -> bool:
+        """Change a field of an annotation.
+
+        The annotation is replaced with an edited copy, so columnar
+        annotations are written back to their subset. A box with changed
+        coordinates loses its corners and becomes axis-aligned.
+        """
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        column = index.column()
+        if column < self._coordinates_columns:
+            try:
+                value = int(value)
+            except ValueError:
+                return False
+        annot = copy.copy(self._annots[index.row()])
+        setattr(annot, self._attributes[column], value)
+        if column < self._coordinates_columns:
+            annot.points = None
+        self._annots[index.row()] = annot
+        self.dataChanged.emit(
+            self.index(index.row(), 0),
+            self.index(index.row(), len(self.columns) - 1))
+        return True
+
+    def insertRows(
+        self, row: int, count: int, parent: QModelIndex = QModelIndex()
+    ) -> bool:
+        """Insert default annotations into the sample."""
+        if not isinstance(self._annots, list) or parent.isValid():
+            return False
+        self.beginInsertRows(parent, row, row + count - 1)
+        for i in range(count):
+            self._annots.insert(row + i, BaseTextDetectionAnnotation(
+                0, 0, 1, 1, 'english', 'text'))
+        self.endInsertRows()
+        return True
+
+    def removeRows(
+        self, row: int, count: int, parent: QModelIndex = QModelIndex()
+    ) -> bool:
+        """Remove annotations from the sample."""
+        if not isinstance(self._annots, list) or parent.isValid():
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._annots[row:row + count]
+        self.endRemoveRows()
+        return True
@@ -0,0 +1,59 @@
+"""Conversion of numpy images to Qt images without copying."""
+
+import numpy as np
+from numpy.typing import NDArray
+from PySide6.QtGui import QImage
+
+
+def ndarray_to_qimage(image: NDArray, bgr: bool = False) -> QImage:
+    """Wrap a numpy image into a `QImage` that shares its buffer.
+
+    The array is copied only if its pixels are not packed in rows,
+    otherwise the image refers to the array's memory with its row stride.
+    The array is kept as an attribute of the image, so the buffer lives
+    as long as the image does.
+
+    Parameters
+    ----------
+    image : NDArray
+        An `uint8` image with shape `(h, w, 3)` or `(h, w)`.
+    bgr : bool, optional
+        Whether the channels are in BGR order as OpenCV reads them.
+        By default is `False` that means RGB order.
+
+    Returns
+    -------
+    QImage
+        The image over the array's buffer.
+
+    Raises
+    ------
+    ValueError
+        The array is not an `uint8` grayscale or 3-channel image.
+    """
+    if image.dtype != np.uint8:
+        raise ValueError(f'Expected an uint8 image, got {image.dtype}.')
+    if image.ndim == 2:
+        pixel_strides = (1,)
+        q_format = QImage.Format_Grayscale8
+    elif image.ndim == 3 and image.shape[2] == 3:
+        pixel_strides = (3, 1)
+        q_format = QImage.Format_BGR888 if bgr else QImage.Format_RGB888
+    else:
+        raise ValueError(
+            f'Expected an image with 1 or 3 channels, got {image.shape}.')
+    # Rows may be padded, but pixels in a row have to be packed
+    if image.strides[1:] != pixel_strides or image.strides[0] < 0:
+        image = np.ascontiguousarray(image)
+
+    height, width = image.shape[:2]
+    buffer = image
+    if not image.flags.c_contiguous:
+        # Padded rows are passed as one span of bytes from the first
+        # pixel to the last one
+        span = (height - 1) * image.strides[0] + width * pixel_strides[0]
+        buffer = np.lib.stride_tricks.as_strided(
+            image, shape=(span,), strides=(1,), writeable=False)
+    q_image = QImage(buffer.data, width, height, image.strides[0], q_format)
+    q_image.ndarray = image
+    return q_image
@@ -0,0 +1,171 @@
+"""A graphics scene that shows a sample's image and bounding boxes."""
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from numpy.typing import NDArray
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QBrush, QColor, QFont, QPen, QPolygonF, QTransform
+from PySide6.QtWidgets import (
+    QGraphicsItem, QGraphicsPolygonItem, QGraphicsScene,
+    QGraphicsSimpleTextItem)
+
+from datasets import BaseTextDetectionAnnotation
+from viewer.viewer_modules.tiled_image_item import TiledImageItem
+
+
+class SampleScene(QGraphicsScene):
+    """A scene where an image and bounding boxes are separate layers.
+
+    The image is drawn by tiles of a pyramid and every bounding box is
+    a polygon item with a label item, so changing a box updates only its
+    items and does not touch the image. Everything is in the source
+    image's coordinates, so the view may zoom and pan freely.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._image_item = TiledImageItem()
+        self.addItem(self._image_item)
+        self._boxes: List[
+            Tuple[QGraphicsPolygonItem, QGraphicsSimpleTextItem]] = []
+
+        color = QColor(255, 255, 255)
+        # A cosmetic pen keeps lines one pixel wide at any zoom
+        self._pen = QPen(color, 0)
+        self._pen.setCosmetic(True)
+        self._text_brush = QBrush(color)
+        self._font = QFont()
+        self._font.setPointSize(7)
+
+    def set_image(
+        self,
+        image: Optional[NDArray],
+        img_shape: Optional[Tuple[int, int]] = None
+    ):
+        """Set a new image under the bounding boxes.
+
+        A downscaled image is stretched to the source image's size,
+        so the boxes stay in the source image's coordinates.
+
+        Parameters
+        ----------
+        image : Optional[NDArray]
+            The image or its preview. `None` clears the image.
+        img_shape : Optional[Tuple[int, int]], optional
+            The height and the width of the source image. By default is
+            `None`, that means the image is the source image.
+        """
+        self._image_item.set_image(image, img_shape)
+        self.setSceneRect(self._image_item.boundingRect())
+
+    def set_full_image(self, image: NDArray):
+        """Replace a shown preview with the full image.
+
+        Parameters
+        ----------
+        image : NDArray
+            The full-size image.
+        """
+        self._image_item.set_full_image(image)
+
+    def set_full_image_callback(self, callback: Optional[Callable[[], None]]):
+        """Set a function that is called when a preview is zoomed too much.
+
+        The function should pass the full image to `set_full_image`.
+        It is called during painting, so it should not load the image
+        at once.
+
+        Parameters
+        ----------
+        callback : Optional[Callable[[], None]]
+            The function.
+        """
+        self._image_item.full_image_requested = callback
+
+    def set_annotations(
+        self, annots: Sequence[BaseTextDetectionAnnotation]
+    ):
+        """Replace all bounding boxes.
+
+        Parameters
+        ----------
+        annots : Sequence[BaseTextDetectionAnnotation]
+            Annotations of the new boxes.
+        """
+        while self._boxes:
+            self.remove_box(len(self._boxes) - 1)
+        for annot in annots:
+            self.add_box(annot)
+
+    def add_box(
+        self, annot: BaseTextDetectionAnnotation, idx: Optional[int] = None
+    ):
+        """Add a bounding box.
+
+        Parameters
+        ----------
+        annot : BaseTextDetectionAnnotation
+            The box's annotation.
+        idx : Optional[int], optional
+            An index to insert the box at. By default is `None`,
+            that means after the existing boxes.
+        """
+        if idx is None:
+            idx = len(self._boxes)
+        polygon_item = QGraphicsPolygonItem()
+        polygon_item.setPen(self._pen)
+        text_item = QGraphicsSimpleTextItem()
+        text_item.setBrush(self._text_brush)
+        text_item.setFont(self._font)
+        # Labels keep their size when the view is scaled
+        text_item.setFlag(QGraphicsItem.ItemIgnoresTransformations)
+        self.addItem(polygon_item)
+        self.addItem(text_item)
+        self._boxes.insert(idx, (polygon_item, text_item))
+        self.update_box(idx, annot)
+
+    def update_box(self, idx: int, annot: BaseTextDetectionAnnotation):
+        """Move a bounding box and change its label.
+
+        Parameters
+        ----------
+        idx : int
+            An index of the box.
+        annot : BaseTextDetectionAnnotation
+            The box's new annotation.
+        """
+        polygon_item, text_item = self._boxes[idx]
+        points = getattr(annot, 'points', None)
+        if points is None:
+            points = ((annot.x1, annot.y1), (annot.x1, annot.y2),
+                      (annot.x2, annot.y2), (annot.x2, annot.y1))
+        polygon = QPolygonF([QPointF(float(x), float(y)) for x, y in points])
+        polygon_item.setPolygon(polygon)
+
+        text_item.setText(f'cls: {annot.label} ')
+        # Labels are put over left-up corners of boxes' bounds
+        bounds = polygon.boundingRect()
+        text_item.setPos(bounds.left(), bounds.top())
+        text_item.setTransform(QTransform.fromTranslate(
+            0, -text_item.boundingRect().height()))
+
+    def remove_box(self, idx: int):
+        """Remove a bounding box.
+
+        Parameters
+        ----------
+        idx : int
+            An index of the box.
+        """
+        for item in self._boxes.pop(idx):
+            self.removeItem(item)
+
+    def box_count(self) -> int:
+        """Get a number of bounding boxes.
+
+        Returns
+        -------
+        int
+            The number of boxes.
+        """
+        return len(self._boxes)
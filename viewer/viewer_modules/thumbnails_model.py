@@ -0,0 +1,210 @@
+"""A list model of samples' thumbnails that are loaded in background."""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional, Sequence, Set
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QColor, QImage, QPixmap
+
+from datasets import BaseTextDetectionSample
+from utils.image_utils.bbox_renderer import bbox_renderer
+from viewer.viewer_modules.qt_image import ndarray_to_qimage
+
+
+def make_thumbnail(sample: BaseTextDetectionSample, size: int) -> NDArray:
+    """Make a sample's thumbnail with drawn bounding boxes.
+
+    The thumbnail is made from the smallest preview that is large enough,
+    so the source image is decoded only if it has no previews yet.
+
+    Parameters
+    ----------
+    sample : BaseTextDetectionSample
+        The sample.
+    size : int
+        The long edge of the thumbnail.
+
+    Returns
+    -------
+    NDArray
+        The RGB thumbnail.
+    """
+    image, annots = sample.get_preview(size)
+    height, width = image.shape[:2]
+    scale = min(1.0, size / max(height, width))
+    if scale < 1.0:
+        new_size = (max(1, round(width * scale)),
+                    max(1, round(height * scale)))
+        image = cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+    else:
+        image = image.copy()
+    quads = np.array(
+        [annot.points if annot.points is not None else
+         ((annot.x1, annot.y1), (annot.x1, annot.y2),
+          (annot.x2, annot.y2), (annot.x2, annot.y1))
+         for annot in annots], dtype=np.float64).reshape(-1, 4, 2)
+    # Labels are not readable on thumbnails, so only edges are drawn
+    return bbox_renderer.render(image, quads * scale, out=image)
+
+
+class ThumbnailsModel(QAbstractListModel):
+    """A list model of a subset's samples shown as thumbnails.
+
+    A view asks only for its visible items, so only their thumbnails are
+    made. They are made on background threads and a placeholder is shown
+    meanwhile. When the view scrolls faster than thumbnails are made,
+    the oldest requests that are not started yet are cancelled.
+    Ready thumbnails are kept within a memory budget and the least
+    recently shown ones are dropped first.
+    """
+
+    # A subset generation, a row and a made thumbnail
+    _thumbnail_made = Signal(int, int, QImage)
+
+    def __init__(
+        self,
+        *args,
+        thumbnail_size: int = 160,
+        max_bytes: int = 64 * 2 ** 20,
+        num_workers: int = 2,
+        max_pending: int = 64,
+        **kwargs
+    ) -> None:
+        """Create a model without samples.
+
+        Parameters
+        ----------
+        thumbnail_size : int, optional
+            The long edge of thumbnails. By default is `160`.
+        max_bytes : int, optional
+            The memory budget of ready thumbnails.
+            By default is 64 MiB.
+        num_workers : int, optional
+            A number of background threads. By default is `2`.
+        max_pending : int, optional
+            How many thumbnails may wait for making.
+            By default is `64`.
+        """
+        super().__init__(*args, **kwargs)
+        self.thumbnail_size = thumbnail_size
+        self._max_bytes = max_bytes
+        self._max_pending = max_pending
+        self._executor = ThreadPoolExecutor(num_workers)
+        self._subset: Sequence[BaseTextDetectionSample] = []
+        # Requests of a replaced subset are ignored
+        self._generation = 0
+        self._pending: OrderedDict[int, Future] = OrderedDict()
+        self._thumbnails: OrderedDict[int, QPixmap] = OrderedDict()
+        self._thumbnails_bytes = 0
+        self._failed: Set[int] = set()
+
+        self._placeholder = QPixmap(thumbnail_size, thumbnail_size)
+        self._placeholder.fill(QColor(64, 64, 64))
+        self._thumbnail_made.connect(self._add_thumbnail)
+
+    def set_subset(
+        self, subset: Optional[Sequence[BaseTextDetectionSample]]
+    ):
+        """Show samples of another subset.
+
+        Parameters
+        ----------
+        subset : Optional[Sequence[BaseTextDetectionSample]]
+            The subset's samples. `None` shows no samples.
+        """
+        self.beginResetModel()
+        self._generation += 1
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._thumbnails.clear()
+        self._thumbnails_bytes = 0
+        self._failed.clear()
+        self._subset = [] if subset is None else subset
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._subset)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return str(row)
+        if role == Qt.ToolTipRole:
+            return self._subset[row].get_image_path().name
+        if role == Qt.DecorationRole:
+            thumbnail = self._thumbnails.get(row)
+            if thumbnail is not None:
+                self._thumbnails.move_to_end(row)
+                return thumbnail
+            if row not in self._failed:
+                self._request_thumbnail(row)
+            return self._placeholder
+        return None
+
+    def _request_thumbnail(self, row: int):
+        """Make a thumbnail in background unless it is being made."""
+        future = self._pending.get(row)
+        if future is not None:
+            self._pending.move_to_end(row)
+            return
+        future = self._executor.submit(
+            make_thumbnail, self._subset[row], self.thumbnail_size)
+        self._pending[row] = future
+        future.add_done_callback(
+            lambda done, generation=self._generation, row=row:
+            self._thumbnail_done(done, generation, row))
+        # Rows that were scrolled away long ago are not waited for
+        for old_row in list(self._pending)[:-self._max_pending]:
+            if self._pending[old_row].cancel():
+                del self._pending[old_row]
+
+    def _thumbnail_done(self, future: Future, generation: int, row: int):
+        """Pass a made thumbnail to the model's thread.
+
+        It is called on a background thread.
+        """
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            thumbnail = QImage()
+        else:
+            # The image gets its own buffer to outlive the array
+            thumbnail = ndarray_to_qimage(future.result()).convertToFormat(
+                QImage.Format_RGB32)
+        self._thumbnail_made.emit(generation, row, thumbnail)
+
+    def _add_thumbnail(self, generation: int, row: int, thumbnail: QImage):
+        """Keep a made thumbnail and update its item."""
+        if generation != self._generation:
+            return
+        self._pending.pop(row, None)
+        if thumbnail.isNull():
+            self._failed.add(row)
+            return
+        pixmap = QPixmap.fromImage(thumbnail)
+        self._thumbnails[row] = pixmap
+        self._thumbnails_bytes += self._pixmap_bytes(pixmap)
+        while self._thumbnails_bytes > self._max_bytes:
+            _, old_pixmap = self._thumbnails.popitem(last=False)
+            self._thumbnails_bytes -= self._pixmap_bytes(old_pixmap)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    @staticmethod
+    def _pixmap_bytes(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def close(self):
+        """Cancel background thumbnails and stop their threads."""
+        self._generation += 1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
@@ -0,0 +1,198 @@
+"""A graphics item that draws a large image by tiles of a pyramid."""
+
+from collections import OrderedDict
+import math
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+from numpy.typing import NDArray
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QPainter, QPixmap
+from PySide6.QtWidgets import (
+    QGraphicsItem, QStyleOptionGraphicsItem, QWidget)
+
+from viewer.viewer_modules.qt_image import ndarray_to_qimage
+
+
+class TiledImageItem(QGraphicsItem):
+    """An image item that uploads only visible tiles of a suitable level.
+
+    The image is kept as a pyramid of numpy levels, each half the size
+    of the previous one. On painting, the coarsest level that is not
+    coarser than the screen is taken and only tiles that intersect
+    the exposed area are turned into pixmaps. Pixmaps of tiles are kept
+    within a memory budget, so memory and repaint cost depend on
+    the viewport's size rather than on the image's size.
+
+    The item is in the source image's coordinates. The image may be
+    a downscaled preview, then a full image is asked for with
+    `full_image_requested` callback once the view is zoomed beyond
+    the preview's resolution.
+    """
+
+    def __init__(
+        self,
+        *args,
+        tile_size: int = 256,
+        max_bytes: int = 64 * 2 ** 20,
+        **kwargs
+    ) -> None:
+        """Create an empty item.
+
+        Parameters
+        ----------
+        tile_size : int, optional
+            The side of tiles in pixels. By default is `256`.
+        max_bytes : int, optional
+            The memory budget of tiles' pixmaps. By default is 64 MiB.
+        """
+        super().__init__(*args, **kwargs)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.tile_size = tile_size
+        self._max_bytes = max_bytes
+        self._rect = QRectF()
+        # Levels from the finest with their horizontal and vertical scales
+        self._levels: List[Tuple[NDArray, float, float]] = []
+        self._is_full = True
+        self._full_requested = False
+        self._tiles: OrderedDict[Tuple[int, int, int], QPixmap] = (
+            OrderedDict())
+        self._tiles_bytes = 0
+        self.full_image_requested: Optional[Callable[[], None]] = None
+
+    def set_image(
+        self,
+        image: Optional[NDArray],
+        img_shape: Optional[Tuple[int, int]] = None
+    ):
+        """Set a new image.
+
+        Parameters
+        ----------
+        image : Optional[NDArray]
+            The image or its downscaled preview. `None` clears the item.
+        img_shape : Optional[Tuple[int, int]], optional
+            The height and the width of the source image. By default is
+            `None`, that means the image is the source image.
+        """
+        self.prepareGeometryChange()
+        self._tiles.clear()
+        self._tiles_bytes = 0
+        self._levels = []
+        self._full_requested = False
+        if image is None:
+            self._rect = QRectF()
+            self._is_full = True
+            return
+        if img_shape is None:
+            img_shape = image.shape[:2]
+        self._rect = QRectF(0, 0, img_shape[1], img_shape[0])
+        self._is_full = image.shape[:2] == tuple(img_shape)
+        self._build_levels(image)
+
+    def set_full_image(self, image: NDArray):
+        """Replace a preview with the full image keeping the geometry.
+
+        Parameters
+        ----------
+        image : NDArray
+            The full-size image.
+        """
+        self._tiles.clear()
+        self._tiles_bytes = 0
+        self._is_full = True
+        self._build_levels(image)
+        self.update()
+
+    def _build_levels(self, image: NDArray):
+        """Halve the image until it fits in one tile."""
+        height, width = self._rect.height(), self._rect.width()
+        self._levels = [
+            (image, image.shape[1] / width, image.shape[0] / height)]
+        while max(image.shape[:2]) > self.tile_size:
+            new_size = (max(1, image.shape[1] // 2),
+                        max(1, image.shape[0] // 2))
+            image = cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+            self._levels.append(
+                (image, image.shape[1] / width, image.shape[0] / height))
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionGraphicsItem,
+        widget: Optional[QWidget] = None
+    ):
+        if not self._levels:
+            return
+        transform = painter.worldTransform()
+        # Device pixels per a source image pixel
+        density = math.hypot(transform.m11(), transform.m12())
+        if widget is not None:
+            density *= widget.devicePixelRatio()
+
+        level_idx = 0
+        for idx in range(len(self._levels) - 1, -1, -1):
+            if self._levels[idx][1] >= density:
+                level_idx = idx
+                break
+        level, scale_x, scale_y = self._levels[level_idx]
+        if (level_idx == 0 and scale_x < density and not self._is_full and
+                not self._full_requested and
+                self.full_image_requested is not None):
+            self._full_requested = True
+            self.full_image_requested()
+
+        exposed = option.exposedRect.intersected(self._rect)
+        if exposed.isEmpty():
+            return
+        tile = self.tile_size
+        level_h, level_w = level.shape[:2]
+        first_x = max(0, int(exposed.left() * scale_x) // tile)
+        first_y = max(0, int(exposed.top() * scale_y) // tile)
+        last_x = min(math.ceil(exposed.right() * scale_x), level_w) - 1
+        last_y = min(math.ceil(exposed.bottom() * scale_y), level_h) - 1
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for tile_y in range(first_y, last_y // tile + 1):
+            for tile_x in range(first_x, last_x // tile + 1):
+                pixmap = self._get_tile(level_idx, tile_x, tile_y)
+                target = QRectF(
+                    tile_x * tile / scale_x, tile_y * tile / scale_y,
+                    pixmap.width() / scale_x, pixmap.height() / scale_y)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+
+    def _get_tile(self, level_idx: int, tile_x: int, tile_y: int) -> QPixmap:
+        """Get a tile's pixmap, uploading it if it is not kept."""
+        key = (level_idx, tile_x, tile_y)
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+        level = self._levels[level_idx][0]
+        tile = self.tile_size
+        tile_image = level[tile_y * tile:(tile_y + 1) * tile,
+                           tile_x * tile:(tile_x + 1) * tile]
+        # The tile is a strided view, so uploading is its only copy
+        pixmap = QPixmap.fromImage(ndarray_to_qimage(tile_image))
+        self._tiles[key] = pixmap
+        self._tiles_bytes += self._pixmap_bytes(pixmap)
+        while self._tiles_bytes > self._max_bytes and len(self._tiles) > 1:
+            _, old_pixmap = self._tiles.popitem(last=False)
+            self._tiles_bytes -= self._pixmap_bytes(old_pixmap)
+        return pixmap
+
+    @staticmethod
+    def _pixmap_bytes(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def get_tiles_stats(self) -> Tuple[int, int]:
+        """Get a number of kept tiles and their size in bytes.
+
+        Returns
+        -------
+        Tuple[int, int]
+            The number of tiles and their size.
+        """
+        return len(self._tiles), self._tiles_bytes
@@ -1,6 +1,10 @@
 """API class for connecting `BaseDataset` classes family and viewer gui."""
 
-from typing import List, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Dict, Optional, Sequence, Tuple
+
+from numpy.typing import NDArray
 
 from datasets import (
     BaseTextDetectionDataset, BaseTextDetectionSample)
@@ -9,16 +13,33 @@ from datasets import (
 class ViewerDataset:
 
     class Subset:
+        """A subset with a current sample index.
+
+        The subset's samples are got from a dataset on the first access.
+        """
         def __init__(
-            self, subset: List[BaseTextDetectionSample], start_idx: int = 0
+            self,
+            subset_reader: Callable[[], Sequence[BaseTextDetectionSample]],
+            start_idx: int = 0
         ) -> None:
-            self._subset = subset
+            self._subset_reader = subset_reader
+            self._loaded_subset: Optional[
+                Sequence[BaseTextDetectionSample]] = None
             self._current_idx = start_idx
 
+        @property
+        def _subset(self) -> Sequence[BaseTextDetectionSample]:
+            if self._loaded_subset is None:
+                self._loaded_subset = self._subset_reader()
+            return self._loaded_subset
+
         def __getitem__(self, idx: int):
             return self._subset[idx]
+
+        def __len__(self) -> int:
+            return len(self._subset)
         
-        def next_sample(self) -> BaseTextDetectionSample:
+        def next_sample(self) -> Optional[BaseTextDetectionSample]:
             """Get a next sample and increment a current index.
 
             If the incremented index is out of bounds it will be returned
@@ -26,13 +47,15 @@ class ViewerDataset:
 
             Returns
             -------
-            BaseTextDetectionSample
-                The got sample.
+            Optional[BaseTextDetectionSample]
+                The got sample or `None` if the subset is empty.
             """
+            if len(self._subset) == 0:
+                return None
             self._current_idx = (self._current_idx + 1) % len(self._subset)
             return self._subset[self._current_idx]
         
-        def previous_sample(self) -> BaseTextDetectionSample:
+        def previous_sample(self) -> Optional[BaseTextDetectionSample]:
             """Get a next sample and decrement a current index.
 
             If the decremented index is out of bounds it will be returned
@@ -40,9 +63,11 @@ class ViewerDataset:
 
             Returns
             -------
-            BaseTextDetectionSample
-                The got sample.
+            Optional[BaseTextDetectionSample]
+                The got sample or `None` if the subset is empty.
             """
+            if len(self._subset) == 0:
+                return None
             idx = self._current_idx - 1
             self._current_idx = idx if idx >= 0 else len(self._subset) - 1
             return self._subset[self._current_idx]
@@ -57,14 +82,16 @@ class ViewerDataset:
             """
             self._current_idx = idx
 
-        def get_current_sample(self) -> BaseTextDetectionSample:
+        def get_current_sample(self) -> Optional[BaseTextDetectionSample]:
             """Get a current sample.
 
             Returns
             -------
-            BaseTextDetectionSample
-                The current sample.
+            Optional[BaseTextDetectionSample]
+                The current sample or `None` if the subset is empty.
             """
+            if len(self._subset) == 0:
+                return None
             return self._subset[self._current_idx]
         
         def get_current_index(self) -> int:
@@ -77,15 +104,39 @@ class ViewerDataset:
             """
             return self._current_idx
 
-    def __init__(self, dataset: BaseTextDetectionDataset) -> None:
-        
+    def __init__(
+        self,
+        dataset: BaseTextDetectionDataset,
+        prefetch: int = 2,
+        num_workers: int = 2
+    ) -> None:
+        """Wrap a dataset for the viewer.
+
+        Parameters
+        ----------
+        dataset : BaseTextDetectionDataset
+            The dataset to view.
+        prefetch : int, optional
+            How many samples ahead of and behind the current one are decoded
+            in background. By default is `2`. `0` disables prefetching.
+        num_workers : int, optional
+            A number of background decoding threads. By default is `2`.
+        """
+        # Subsets are read from the dataset only when they are shown
         self._subsets: Dict[str, self.Subset] = {
-            subset_name: self.Subset(dataset[subset_name])
+            subset_name: self.Subset(
+                partial(dataset.__getitem__, subset_name))
             for subset_name in dataset.get_subsets_names()
-            if len(dataset[subset_name]) != 0
         }
         self._current_subset = list(self._subsets.keys())[0]
 
+        self._prefetch = prefetch
+        self._executor = (ThreadPoolExecutor(num_workers)
+                          if prefetch > 0 else None)
+        # Decoded images keyed by a subset name, a sample index
+        # and a requested preview size
+        self._images: Dict[Tuple[str, int, Optional[int]], Future] = {}
+
     def __getitem__(self, subset_name: str):
         return self._subsets[subset_name]
 
@@ -129,7 +180,7 @@ class ViewerDataset:
         """
         self._current_subset = subset_name
 
-    def next_sample(self) -> BaseTextDetectionSample:
+    def next_sample(self) -> Optional[BaseTextDetectionSample]:
         """Get a next sample of a current subset and increment its index.
 
         If the incremented index is out of bounds it will be returned
@@ -137,12 +188,13 @@ class ViewerDataset:
 
         Returns
         -------
-        BaseTextDetectionSample
-            The next sample of the current subset.
+        Optional[BaseTextDetectionSample]
+            The next sample of the current subset
+            or `None` if the subset is empty.
         """
         return self._subsets[self._current_subset].next_sample()
     
-    def previous_sample(self) -> BaseTextDetectionSample:
+    def previous_sample(self) -> Optional[BaseTextDetectionSample]:
         """Get a previous sample of a current subset and decrement its index.
 
         If the decremented index is out of bounds it will be returned
@@ -150,18 +202,20 @@ class ViewerDataset:
 
         Returns
         -------
-        BaseTextDetectionSample
-            The previous sample of the current subset.
+        Optional[BaseTextDetectionSample]
+            The previous sample of the current subset
+            or `None` if the subset is empty.
         """
         return self._subsets[self._current_subset].previous_sample()
     
-    def get_current_sample(self) -> BaseTextDetectionSample:
+    def get_current_sample(self) -> Optional[BaseTextDetectionSample]:
         """Get a current sample of a current subset.
 
         Returns
         -------
-        BaseTextDetectionSample
-            The current sample of the current subset.
+        Optional[BaseTextDetectionSample]
+            The current sample of the current subset
+            or `None` if the subset is empty.
         """
         return self.get_current_subset().get_current_sample()
     
@@ -174,3 +228,82 @@ class ViewerDataset:
             The current index of current subset.
         """
         return self.get_current_subset().get_current_index()
+
+    def get_current_image(
+        self, min_side: Optional[int] = None
+    ) -> Optional[NDArray]:
+        """Get the current sample's decoded image.
+
+        The image is taken from the prefetched ones if it is ready or is
+        being decoded, otherwise it is decoded at once. Then images of
+        the neighbouring samples are scheduled for background decoding.
+
+        Parameters
+        ----------
+        min_side : Optional[int], optional
+            The minimal long edge of a downscaled preview that is enough
+            to show. By default is `None`, that means the full image.
+
+        Returns
+        -------
+        Optional[NDArray]
+            The image or `None` if the current subset is empty.
+        """
+        sample = self.get_current_sample()
+        if sample is None:
+            return None
+        key = (self._current_subset, self.get_current_index(), min_side)
+        image_future = self._images.get(key)
+        if image_future is not None:
+            image = image_future.result()
+        else:
+            image = self._load_image(sample, min_side)
+            if self._executor is not None:
+                image_future = Future()
+                image_future.set_result(image)
+                self._images[key] = image_future
+        self._schedule_prefetch(min_side)
+        return image
+
+    @staticmethod
+    def _load_image(
+        sample: BaseTextDetectionSample, min_side: Optional[int]
+    ) -> NDArray:
+        """Decode a sample's image or its preview."""
+        if min_side is None:
+            return sample.get_image(shared=True)
+        return sample.get_preview(min_side)[0]
+
+    def _schedule_prefetch(self, min_side: Optional[int] = None):
+        """Decode images around the current sample and drop other images.
+
+        Images that are out of the window or have another preview size
+        are cancelled if they have not been started yet, so jumps, subset
+        switches and resizes do not leave stale work in the queue.
+        """
+        if self._executor is None:
+            return
+        subset = self.get_current_subset()
+        subset_len = len(subset)
+        current_idx = subset.get_current_index()
+        # The nearest samples go first
+        window: List[Tuple[str, int, Optional[int]]] = []
+        for shift in range(self._prefetch + 1):
+            for idx in (current_idx + shift, current_idx - shift):
+                key = (self._current_subset, idx % subset_len, min_side)
+                if key not in window:
+                    window.append(key)
+
+        for key in list(self._images):
+            if key not in window:
+                self._images.pop(key).cancel()
+        for key in window:
+            if key not in self._images:
+                self._images[key] = self._executor.submit(
+                    self._load_image, subset[key[1]], min_side)
+
+    def close(self):
+        """Cancel background decoding and stop its threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._images.clear()
@@ -1,25 +1,44 @@
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional, Tuple
 
 from PySide6.QtWidgets import (
-    QMainWindow, QTableWidget, QTableWidgetItem, QFileDialog)
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QKeyEvent, QImage, QPixmap
+    QMainWindow, QTableView, QFileDialog, QMessageBox, QDockWidget,
+    QListView, QGraphicsView)
+from PySide6.QtCore import Qt, QModelIndex, QSize, QObject, QEvent, QTimer
+from PySide6.QtGui import QKeyEvent, QWheelEvent
 from numpy.typing import NDArray
 
 sys.path.append(str(Path(__file__).parents[4]))
 from viewer.uic.ui_viewer import Ui_MainWindow
-from datasets import (
-    datasets, BaseTextDetectionAnnotation, BaseTextDetectionSample)
-from viewer.viewer_modules import ViewerDataset
+from datasets import datasets, BaseTextDetectionSample, CVAT_dataset
+from viewer.viewer_modules import (
+    ViewerDataset, SampleScene, AnnotationsModel, ThumbnailsModel)
+
+
+# Parsed datasets are cached here to open them faster next time
+PARSE_CACHE_DIR = Path.home() / '.cache' / 'text_detection_viewer'
+# Zoom step of one mouse wheel notch
+ZOOM_STEP = 1.25
+# The largest zoom in screen pixels per an image pixel
+MAX_ZOOM = 32.0
 
 
 class ViewerWindow(QMainWindow, Ui_MainWindow):
     def __init__(self) -> None:
         super().__init__()
         self.setupUi(self)
+        # Bounding boxes are drawn by the scene over the image
+        self.scene = SampleScene(self)
+        self.scene.set_full_image_callback(self.request_full_image)
+        self.picture_box.setScene(self.scene)
+        # The image is zoomed with the wheel and panned by dragging
+        self.picture_box.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.picture_box.setTransformationAnchor(
+            QGraphicsView.AnchorUnderMouse)
+        self.picture_box.viewport().installEventFilter(self)
         self.create_table()
+        self.create_thumbnails()
         self.setup_events()
         self.dset: ViewerDataset = None
 
@@ -31,39 +50,48 @@ class ViewerWindow(QMainWindow, Ui_MainWindow):
         self.subset_combobox.currentTextChanged.connect(self.subset_changed)
 
     def create_table(self):
+        self.annots_model = AnnotationsModel(self)
         self.annots_table = ViewerTable(self)
-        self.annots_table.setColumnCount(6)
-        self.annots_table.setHorizontalHeaderLabels(
-            ['x1', 'y1', 'x2', 'y2', 'language', 'word'])
+        self.annots_table.setModel(self.annots_model)
         self.annots_table.resizeColumnsToContents()
-        self.annots_table.itemChanged.connect(self.table_changed)
+        # The scene follows the model, so only edited boxes are redrawn
+        self.annots_model.modelReset.connect(self.annotations_reset)
+        self.annots_model.dataChanged.connect(self.annotations_changed)
+        self.annots_model.rowsInserted.connect(self.annotations_inserted)
+        self.annots_model.rowsRemoved.connect(self.annotations_removed)
         self.table_layout.addWidget(self.annots_table)
 
-    def add_new_row(
-        self, annotation: Optional[BaseTextDetectionAnnotation] = None
-    ):
-        if annotation:
-            x1 = str(annotation.x1)
-            y1 = str(annotation.y1)
-            x2 = str(annotation.x2)
-            y2 = str(annotation.y2)
-            language = annotation.label
-            text = annotation.text
-        else:
-            x1 = '0'
-            y1 = '0'
-            x2 = '1'
-            y2 = '1'
-            language = 'english'
-            text = 'text'
-        row_count = self.annots_table.rowCount()
-        self.annots_table.insertRow(row_count)
-        self.annots_table.setItem(row_count, 0, QTableWidgetItem(x1))
-        self.annots_table.setItem(row_count, 1, QTableWidgetItem(y1))
-        self.annots_table.setItem(row_count, 2, QTableWidgetItem(x2))
-        self.annots_table.setItem(row_count, 3, QTableWidgetItem(y2))
-        self.annots_table.setItem(row_count, 4, QTableWidgetItem(language))
-        self.annots_table.setItem(row_count, 5, QTableWidgetItem(text))
+    def create_thumbnails(self):
+        self.thumbnails_model = ThumbnailsModel(self)
+        size = self.thumbnails_model.thumbnail_size
+        self.thumbnails_view = QListView(self)
+        self.thumbnails_view.setViewMode(QListView.IconMode)
+        self.thumbnails_view.setMovement(QListView.Static)
+        self.thumbnails_view.setResizeMode(QListView.Adjust)
+        # Equal items are laid out without asking for every item's size
+        self.thumbnails_view.setUniformItemSizes(True)
+        self.thumbnails_view.setLayoutMode(QListView.Batched)
+        self.thumbnails_view.setIconSize(QSize(size, size))
+        self.thumbnails_view.setGridSize(QSize(size + 16, size + 32))
+        self.thumbnails_view.setModel(self.thumbnails_model)
+        self.thumbnails_view.clicked.connect(self.thumbnail_clicked)
+
+        # The grid is a floating window that may be docked
+        self.thumbnails_dock = QDockWidget('Samples', self)
+        self.thumbnails_dock.setWidget(self.thumbnails_view)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.thumbnails_dock)
+        self.thumbnails_dock.setFloating(True)
+        self.thumbnails_dock.resize(4 * size + 100, 3 * size + 100)
+        self.thumbnails_dock.hide()
+        self.menu_view = self.menubar.addMenu('View')
+        self.menu_view.addAction(self.thumbnails_dock.toggleViewAction())
+
+    def thumbnail_clicked(self, index: QModelIndex):
+        self.dset.get_current_subset().set_index(index.row())
+        self.load_sample()
+
+    def add_new_row(self):
+        self.annots_model.insertRow(self.annots_model.rowCount())
 
     def enable_controls(self):
         self.next_btn.setEnabled(True)
@@ -72,24 +100,25 @@ class ViewerWindow(QMainWindow, Ui_MainWindow):
         self.idx_textbox.setEnabled(True)
         self.add_btn.setEnabled(True)
 
-    def table_changed(self):
-        # If event is fired when row is added
-        if self.annots_table.row_adding:
-            return
-        row_idx = self.annots_table.currentRow()
-        x1 = int(self.annots_table.item(row_idx, 0).text())
-        y1 = int(self.annots_table.item(row_idx, 1).text())
-        x2 = int(self.annots_table.item(row_idx, 2).text())
-        y2 = int(self.annots_table.item(row_idx, 3).text())
-        language = self.annots_table.item(row_idx, 4).text()
-        word = self.annots_table.item(row_idx, 5).text()
-
-        # Replace changed annotation
-        current_sample = self.dset.get_current_sample()
-        current_sample.get_annotations()[row_idx] = (
-            BaseTextDetectionAnnotation(x1, y1, x2, y2, language, word))
-        # And show updated sample
-        self.load_sample(current_sample)
+    def annotations_reset(self):
+        model = self.annots_model
+        self.scene.set_annotations(
+            [model.get_annotation(row) for row in range(model.rowCount())])
+
+    def annotations_changed(self, top_left: QModelIndex,
+                            bottom_right: QModelIndex):
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.scene.update_box(row, self.annots_model.get_annotation(row))
+
+    def annotations_inserted(self, parent: QModelIndex, first: int,
+                             last: int):
+        for row in range(first, last + 1):
+            self.scene.add_box(self.annots_model.get_annotation(row), row)
+
+    def annotations_removed(self, parent: QModelIndex, first: int,
+                            last: int):
+        for row in range(last, first - 1, -1):
+            self.scene.remove_box(row)
 
     def subset_changed(self, new_subset: str):
         """Set combo box change handler.
@@ -103,20 +132,58 @@ class ViewerWindow(QMainWindow, Ui_MainWindow):
         if new_subset == '':
             return
         self.dset.set_current_subset(new_subset)
+        self.thumbnails_model.set_subset(self.dset.get_current_subset())
         new_sample = self.dset.get_current_sample()
         self.load_sample(new_sample)
 
-    def show_image(self, img: NDArray):
-        height, width, channel = img.shape
-        bytesPerLine = channel * width
-        q_img = QImage(
-            img.data, width, height, bytesPerLine, QImage.Format_RGB888)
-        self.picture_box.setPixmap(QPixmap(q_img))
+    def show_image(
+        self, img: NDArray, img_shape: Optional[Tuple[int, int]] = None
+    ):
+        # Only visible tiles of the image are uploaded to pixmaps
+        self.scene.set_image(img, img_shape)
+        self.picture_box.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
 
-    def show_annotations(self, annots: List[BaseTextDetectionAnnotation]):
-        self.annots_table.setRowCount(0)
-        for annot in annots:
-            self.add_new_row(annot)
+    def request_full_image(self):
+        # It is called while the scene is painted,
+        # so the image is read after painting
+        dset = self.dset
+        position = (dset.get_current_subset_name(), dset.get_current_index())
+        QTimer.singleShot(0, lambda: self.load_full_image(dset, position))
+
+    def load_full_image(self, dset: ViewerDataset, position: Tuple[str, int]):
+        # The user may have moved to another sample meanwhile. Columnar
+        # subsets make a new sample object on every access, so the sample
+        # is recognized by its subset and index
+        if (dset is not self.dset or position != (
+                dset.get_current_subset_name(), dset.get_current_index())):
+            return
+        sample = dset.get_current_sample()
+        self.scene.set_full_image(sample.get_image(shared=True))
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if (watched is self.picture_box.viewport() and
+                event.type() == QEvent.Wheel):
+            self.zoom_picture(event)
+            return True
+        return super().eventFilter(watched, event)
+
+    def zoom_picture(self, event: QWheelEvent):
+        scene_rect = self.scene.sceneRect()
+        if scene_rect.isEmpty():
+            return
+        factor = ZOOM_STEP ** (event.angleDelta().y() / 120)
+        current = self.picture_box.transform().m11()
+        viewport = self.picture_box.viewport().rect()
+        # Zoom out no further than the whole image fits
+        min_zoom = min(viewport.width() / scene_rect.width(),
+                       viewport.height() / scene_rect.height())
+        new_zoom = min(max(current * factor, min_zoom), MAX_ZOOM)
+        self.picture_box.scale(new_zoom / current, new_zoom / current)
+
+    def show_annotations(
+        self, sample: Optional[BaseTextDetectionSample] = None
+    ):
+        self.annots_model.set_sample(sample)
 
     def load_dataset(self):
         dset_pth = QFileDialog.getExistingDirectory(
@@ -125,7 +192,21 @@ class ViewerWindow(QMainWindow, Ui_MainWindow):
             return
         else:
             dset_pth = Path(dset_pth)
-        self.dset = ViewerDataset(datasets[dset_pth.name](dset_pth))
+        # CVAT exports are recognized by their annotations files
+        # and source datasets by their directory names
+        if CVAT_dataset.is_dataset_dir(dset_pth):
+            dset_cls = CVAT_dataset
+        elif dset_pth.name in datasets:
+            dset_cls = datasets[dset_pth.name]
+        else:
+            QMessageBox.warning(
+                self, 'Unknown dataset',
+                f'Can not recognize a dataset in "{dset_pth}".')
+            return
+        if self.dset is not None:
+            self.dset.close()
+        self.dset = ViewerDataset(
+            dset_cls(dset_pth, cache_dir=PARSE_CACHE_DIR))
         self.subset_combobox.clear()
         for subset in self.dset.available_subsets():
             self.subset_combobox.addItem(subset)
@@ -135,11 +216,25 @@ class ViewerWindow(QMainWindow, Ui_MainWindow):
     def load_sample(self, sample: Optional[BaseTextDetectionSample] = None):
         if sample is None:
             sample = self.dset.get_current_sample()
-        img_to_show = sample.get_image_with_bboxes()
-        annots = sample.get_annotations()
-        self.show_image(img_to_show)
-        self.show_annotations(annots)
-        self.idx_textbox.setText(str(self.dset.get_current_index()))
+        if sample is None:
+            # The current subset is empty
+            self.scene.set_image(None)
+            self.show_annotations(None)
+            self.idx_textbox.setText('')
+            return
+        # A preview that fills the picture box is enough to show
+        viewport = self.picture_box.viewport()
+        min_side = round(max(viewport.width(), viewport.height()) *
+                         viewport.devicePixelRatio())
+        # Neighbouring images are decoded in background meanwhile
+        img_to_show = self.dset.get_current_image(min_side)
+        self.show_image(img_to_show, sample.get_image_shape())
+        self.show_annotations(sample)
+        current_idx = self.dset.get_current_index()
+        self.idx_textbox.setText(str(current_idx))
+        thumbnail_index = self.thumbnails_model.index(current_idx)
+        self.thumbnails_view.setCurrentIndex(thumbnail_index)
+        self.thumbnails_view.scrollTo(thumbnail_index)
 
     def next_btn_click(self):
         sample = self.dset.next_sample()
@@ -150,25 +245,13 @@ class ViewerWindow(QMainWindow, Ui_MainWindow):
         self.load_sample(sample)
 
 
-class ViewerTable(QTableWidget):
-
-    def __init__(self, *args, **kwargs):
-        self.row_adding: bool = False
-        super().__init__(*args, **kwargs)
+class ViewerTable(QTableView):
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
         if event.key() == Qt.Key_Delete:
-            row = self.currentRow()
+            row = self.currentIndex().row()
             if row == -1:
                 return
-            self.removeRow(row)
+            self.model().removeRow(row)
         else:
             return super().keyPressEvent(event)
-        
-    def setItem(self, row: int, column: int, item: QTableWidgetItem) -> None:
-        # setItem is used only when new row is adding
-        # So row_adding flag is needed to disarm itemChanged event
-        # if it is fired up during new row adding
-        self.row_adding = True
-        super().setItem(row, column, item)
-        self.row_adding = False